@@ -1,33 +1,85 @@
 # app/agents/analyst.py
 import json
+from typing import Optional
 from app.core.llm.interface import ILLMClient
 from app.domain.models.state import SessionState
-from app.domain.models.artifacts import StoryArtifact
-from app.core.services.context import system_context 
+from app.domain.models.artifacts import StoryArtifact, StoryPatch, UserStory
+from app.core.services.context import system_context
+from app.core.services.fingerprint import digest
+from app.core.services.incremental import IncrementalPlan, plan_incremental
+from app.core.llm.prompts.assembly import PromptTemplate
+from app.core.llm.usage import llm_agent
+from app.core.llm.partial_json import ProgressCallback, item_progress
 
-PROMPT_TEMPLATE = """
+PROMPT_TEMPLATE = PromptTemplate(
+    name="user_story",
+    static="""
 You are an Agile Business Analyst.
 Generate or update the User Stories based on the provided Context and the Current Draft, if available.
+The Project Context and Current Draft are provided in the next message.
 
+INSTRUCTIONS:
+1. **Preserve Manual Edits**: If a story in the CURRENT DRAFT matches a requirement, KEEP its 'priority', 'estimate', and 'acceptance_criteria' unless the new context explicitly contradicts it.
+   - Example: If the draft says "Estimate: 10 SP" and the context doesn't mention time, KEEP "10 SP".
+2. **Add Missing**: Generate new stories for any new Actors or Steps found in the Context that are missing from the Draft.
+3. **Remove Obsolete**: Remove stories that no longer make sense given the current Context.
+4. **Format**: Return the complete list of stories.
+""",
+    # Volatile blocks last, so the instructions above stay a cacheable prefix
+    dynamic="""
 {context_block}
 
 === CURRENT DRAFT (PREVIOUS VERSION) ===
 {current_artifact_json}
 ========================================
+""",
+)
+
+PATCH_PROMPT_TEMPLATE = PromptTemplate(
+    name="user_story_patch",
+    static="""
+You are an Agile Business Analyst.
+The User Stories were already written. Some Actors or Process Steps changed since then.
+Update ONLY what the changes touch. The Project Context, the LEDGER CHANGES, the AFFECTED stories and an index of the UNCHANGED stories are provided in the next message.
 
 INSTRUCTIONS:
-1. **Preserve Manual Edits**: If a story in the CURRENT DRAFT matches a requirement, KEEP its 'priority', 'estimate', and 'acceptance_criteria' unless the new context explicitly contradicts it.
-   - Example: If the draft says "Estimate: 10 SP" and the context doesn't mention time, KEEP "10 SP".
-2. **Add Missing**: Generate new stories for any new Actors or Steps found in the Context that are missing from the Draft.
-3. **Remove Obsolete**: Remove stories that no longer make sense given the current Context.
-4. **Format**: Return the complete list of stories.
-"""
+1. **Affected**: For each AFFECTED story, return its full updated version with the SAME id, or list its id in 'removed_ids' if it no longer applies (e.g. its actor was removed).
+2. **New**: Generate stories for added Actors / Process Steps that no UNCHANGED or AFFECTED story covers. Use new, unique ids.
+3. **Do Not Repeat**: Never return UNCHANGED stories. They are kept as they are, unless you list their id in 'removed_ids' (e.g. they belong to a removed actor).
+4. **Preserve Manual Edits**: Keep the 'priority', 'estimate', and 'acceptance_criteria' of AFFECTED stories unless the changes contradict them.
+""",
+    dynamic="""
+{context_block}
+
+=== LEDGER CHANGES (SINCE THE DRAFT) ===
+{delta_block}
+
+=== AFFECTED STORIES ===
+{affected_json}
+
+=== UNCHANGED STORIES (id | actor | title) ===
+{index_block}
+========================================
+""",
+)
 
 class AnalystAgent:
     def __init__(self, llm_client: ILLMClient):
         self.llm = llm_client
 
-    async def generate_stories(self, state: SessionState) -> StoryArtifact:
+    def input_key(self, state: SessionState) -> str:
+        """Hash of everything this generator reads besides the draft (see artifact_fingerprint)."""
+        return digest(
+            PROMPT_TEMPLATE.version, PATCH_PROMPT_TEMPLATE.version,
+            self.llm.default_model, system_context.build(state)
+        )
+
+    async def generate_stories(
+        self,
+        state: SessionState,
+        on_progress: Optional[ProgressCallback] = None,
+        regenerate: bool = False
+    ) -> StoryArtifact:
         # 1. Build Dynamic Context (The Ledger)
         context_str = system_context.build(state)
 
@@ -39,20 +91,49 @@ class AnalystAgent:
             internal_id = f"user_story-v{current_version}"
             raw_data = state.artifacts.get(internal_id)
             if raw_data:
+                # Incremental Path: only new / affected stories (an explicit regenerate rewrites them all)
+                plan = None if regenerate else plan_incremental(
+                    state, "user_story", internal_id, raw_data.get("stories", []), actor_field="as_a"
+                )
+                if plan:
+                    return await self._patch(context_str, plan)
                 # Convert to compact JSON string for the prompt
                 current_json = json.dumps(raw_data, indent=2)
 
-        messages = [
-            {"role": "system", "content": PROMPT_TEMPLATE.format(
-                context_block=context_str,
-                current_artifact_json=current_json
-            )}
-        ]
-
-        # 3. Call LLM with Merge Instructions
-        result = await self.llm.get_structured_completion(
-            messages=messages,
-            response_model=StoryArtifact,
+        messages = PROMPT_TEMPLATE.messages(
+            context_block=context_str,
+            current_artifact_json=current_json
         )
+
+        # 3. Call LLM with Merge Instructions (streamed: each finished story is reported)
+        with llm_agent(PROMPT_TEMPLATE.name):
+            if on_progress:
+                result = await self.llm.stream_structured_completion(
+                    messages=messages,
+                    response_model=StoryArtifact,
+                    on_text=item_progress("stories", UserStory, on_progress),
+                )
+            else:
+                result = await self.llm.get_structured_completion(
+                    messages=messages,
+                    response_model=StoryArtifact,
+                )
         
-        return result
\ No newline at end of file
+        return result
+
+    async def _patch(self, context_str: str, plan: IncrementalPlan) -> StoryArtifact:
+        messages = PATCH_PROMPT_TEMPLATE.messages(
+            context_block=context_str,
+            delta_block=plan.delta.render(),
+            affected_json=json.dumps(plan.affected, indent=2) if plan.affected else "None.",
+            index_block=plan.index(lambda s: f"{s.get('as_a')} | {s.get('title') or s.get('i_want_to')}"),
+        )
+
+        with llm_agent(PATCH_PROMPT_TEMPLATE.name):
+            patch = await self.llm.get_structured_completion(
+                messages=messages,
+                response_model=StoryPatch,
+            )
+
+        merged = plan.merge([s.model_dump() for s in patch.stories], patch.removed_ids)
+        return StoryArtifact.model_validate({"stories": merged})
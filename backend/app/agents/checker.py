@@ -1,5 +1,6 @@
 # app/agents/checker.py
 from app.core.llm.interface import ILLMClient
+from app.core.llm.usage import llm_agent
 from app.domain.models.state import SessionState
 from app.domain.models.validation import ComplianceReport
 from app.core.interfaces.policy_store import IPolicyStore
@@ -42,16 +43,14 @@ class CheckerAgent:
         {', '.join([f"{s.step_id}. {s.actor} -> {s.description}" for s in state.process_steps])}
         """
 
-        system_prompt = f"""
+        # Static instructions first (cacheable prefix); retrieved policies + snapshot vary per call
+        system_prompt = """
         You are a Senior Compliance Officer & QA Auditor for a Bank.
         Your job is to review the current business requirements and flag risks.
 
-        REFERENCE POLICIES (Strictly Enforce These):
-        {policy_context_str}
-
         INSTRUCTIONS:
         1. Analyze the Actors, Goal, and Process Steps.
-        2. Identify violations of the Reference Policies listed above.
+        2. Identify violations of the Reference Policies provided with the snapshot (Strictly Enforce These).
         3. Identify logical inconsistencies (e.g., steps that lead nowhere).
         4. Identify vague requirements (e.g., "Manager does stuff").
         5. Return a structured report. If everything looks good, return an empty list of issues and high score.
@@ -59,12 +58,13 @@ class CheckerAgent:
 
         messages = [
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"Here is the current requirements snapshot:\n{context}"}
+            {"role": "user", "content": f"REFERENCE POLICIES:\n{policy_context_str}\n\nHere is the current requirements snapshot:\n{context}"}
         ]
 
-        result = await self.llm.get_structured_completion(
-            messages=messages,
-            response_model=ComplianceReport,
-        )
+        with llm_agent("checker"):
+            result = await self.llm.get_structured_completion(
+                messages=messages,
+                response_model=ComplianceReport,
+            )
         
         return result
\ No newline at end of file
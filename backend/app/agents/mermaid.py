@@ -3,26 +3,29 @@ from app.core.llm.interface import ILLMClient
 from app.domain.models.state import SessionState
 from app.domain.models.artifacts import MermaidArtifact
 from app.core.services.context import system_context
-from app.agents.prompts.mermaid import MERMAID_PROMPT_TEMPLATE
+from app.core.services.fingerprint import digest
+from app.agents.prompts.mermaid import MERMAID_PROMPT
+from app.core.llm.usage import llm_agent
 
 class MermaidAgent:
     def __init__(self, llm_client: ILLMClient):
         self.llm = llm_client
 
+    def input_key(self, state: SessionState) -> str:
+        """Hash of everything this generator reads besides the draft (see artifact_fingerprint)."""
+        return digest(MERMAID_PROMPT.version, self.llm.default_model, system_context.build(state))
+
     async def generate(self, state: SessionState) -> MermaidArtifact:
         # 1. Build Dynamic Context
         context_str = system_context.build(state)
 
-        messages = [
-            {"role": "system", "content": MERMAID_PROMPT_TEMPLATE.format(
-                context_block=context_str
-            )}
-        ]
+        messages = MERMAID_PROMPT.messages(context_block=context_str)
 
         # 2. Call LLM
-        result = await self.llm.get_structured_completion(
-            messages=messages,
-            response_model=MermaidArtifact,
-        )
+        with llm_agent(MERMAID_PROMPT.name):
+            result = await self.llm.get_structured_completion(
+                messages=messages,
+                response_model=MermaidArtifact,
+            )
         
         return result
\ No newline at end of file
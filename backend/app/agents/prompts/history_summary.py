@@ -0,0 +1,25 @@
+from app.core.llm.prompts.assembly import PromptTemplate
+
+HISTORY_SUMMARY_PROMPT = PromptTemplate(
+    name="history_summary",
+    static="""
+You maintain the running summary of a requirements-gathering conversation between a user and a Business Analyst agent.
+The summary replaces the older part of the chat transcript, so the agent must be able to continue the conversation from it.
+
+RULES:
+1. Merge the NEW TRANSCRIPT into the PREVIOUS SUMMARY. Return the full updated summary, not a diff.
+2. Keep: decisions the user confirmed or rejected, open questions, promises the agent made, artifacts that were generated or edited, and the user's preferences about tone or format.
+3. Drop: greetings, repeated facts, and raw tool payloads. Ledger contents (scope, actors, goals, steps, data, NFRs) are provided to the agent separately, so only note WHEN and WHY they changed.
+4. Write concise bullet points in chronological order. Stay under the WORD LIMIT.
+5. Output the summary only. No preamble.
+""",
+    dynamic="""
+WORD LIMIT: {max_words}
+
+PREVIOUS SUMMARY:
+{previous_summary}
+
+NEW TRANSCRIPT:
+{transcript}
+""",
+)
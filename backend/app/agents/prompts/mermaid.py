@@ -1,10 +1,15 @@
-MERMAID_PROMPT_TEMPLATE = """
+# app/agents/prompts/mermaid.py
+from app.core.llm.prompts.assembly import PromptTemplate
+
+MERMAID_PROMPT = PromptTemplate(
+    name="mermaid",
+    # Static instructions first: byte-stable across calls (provider prefix cache)
+    static="""
 You are a Senior System Architect specializing in process visualization.
+The Project Context is provided in the next message.
 
 Begin with a concise checklist (3–7 bullets) outlining the conceptual steps you will follow to analyze the provided Context and generate the most appropriate MermaidJS diagram.
 
-{context_block}
-
 DIAGRAM TYPE SELECTION:
 Select the diagram type that best matches the visualization needs:
 
@@ -37,4 +42,9 @@ EXAMPLE DECISION LOGIC:
 - Mentions of "timeline", "schedule", "milestones" likely gantt or timeline
 
 Return the complete, valid Mermaid diagram code.
-"""
\ No newline at end of file
+""",
+    # Volatile blocks last (ledger changes every update)
+    dynamic="""
+{context_block}
+""",
+)
@@ -1,14 +1,13 @@
 # app/agents/prompts/use_case.py
+from app.core.llm.prompts.assembly import PromptTemplate
 
-USE_CASE_PROMPT = """
+USE_CASE_PROMPT = PromptTemplate(
+    name="use_case",
+    # Static instructions first: byte-stable across calls (provider prefix cache)
+    static="""
 You are a Senior Systems Analyst.
 Generate formal Use Cases based on the Context and Current Draft.
-
-{context_block}
-
-=== CURRENT DRAFT (PREVIOUS VERSION) ===
-{current_artifact_json}
-========================================
+The Project Context and Current Draft are provided in the next message.
 
 INSTRUCTIONS:
 1. **Scope**: Create detailed Use Cases for the identified Process Steps.
@@ -20,4 +19,44 @@ INSTRUCTIONS:
 5. **Formatting**: Ensure step_number increments sequentially (1, 2, 3...).
 
 Return valid JSON matching the UseCaseArtifact schema.
-"""
\ No newline at end of file
+""",
+    # Volatile blocks last (ledger + previous draft)
+    dynamic="""
+{context_block}
+
+=== CURRENT DRAFT (PREVIOUS VERSION) ===
+{current_artifact_json}
+========================================
+""",
+)
+
+USE_CASE_PATCH_PROMPT = PromptTemplate(
+    name="use_case_patch",
+    static="""
+You are a Senior Systems Analyst.
+The Use Cases were already written. Some Actors or Process Steps changed since then.
+Update ONLY what the changes touch. The Project Context, the LEDGER CHANGES, the AFFECTED use cases and an index of the UNCHANGED use cases are provided in the next message.
+
+INSTRUCTIONS:
+1. **Affected**: For each AFFECTED use case, return its full updated version with the SAME id, or list its id in 'removed_ids' if it no longer applies (e.g. its actor was removed).
+2. **New**: Create Use Cases for added Actors / Process Steps that no UNCHANGED or AFFECTED use case covers. Use new, unique ids.
+3. **Do Not Repeat**: Never return UNCHANGED use cases. They are kept as they are, unless you list their id in 'removed_ids' (e.g. they belong to a removed actor).
+4. **Preserve Edits**: Keep manual details (e.g. specific alternative flows) of AFFECTED use cases unless the changes contradict them.
+5. **Formatting**: Each Use Case has a Primary Actor, Preconditions, Postconditions and a Main Flow; step_number increments sequentially (1, 2, 3...).
+
+Return valid JSON matching the UseCasePatch schema.
+""",
+    dynamic="""
+{context_block}
+
+=== LEDGER CHANGES (SINCE THE DRAFT) ===
+{delta_block}
+
+=== AFFECTED USE CASES ===
+{affected_json}
+
+=== UNCHANGED USE CASES (id | actor | title) ===
+{index_block}
+========================================
+""",
+)
@@ -1,12 +1,13 @@
-WORKBOOK_PROMPT = """
+# app/agents/prompts/workbook.py
+from app.core.llm.prompts.assembly import PromptTemplate
+
+WORKBOOK_PROMPT = PromptTemplate(
+    name="workbook",
+    # Static instructions first: byte-stable across calls (provider prefix cache)
+    static="""
 You are a Senior Business Analyst.
 Update the Analyst Workbook based on the Project Context and the Current Draft.
-
-{context_block}
-
-=== CURRENT DRAFT (PREVIOUS VERSION) ===
-{current_artifact_json}
-========================================
+The Project Context and Current Draft are provided in the next message.
 
 INSTRUCTIONS:
 1. **Categorize**: Group into 'Business Goals', 'Scope & Actors', 'Process Flows', 'KPIs', **'Data Schema'**, and **'System Constraints'**.
@@ -15,4 +16,13 @@ INSTRUCTIONS:
 4. **Merge**: Add new information from the Context into the appropriate categories.
 
 Return the fully merged JSON structure.
-"""
\ No newline at end of file
+""",
+    # Volatile blocks last (ledger + previous draft)
+    dynamic="""
+{context_block}
+
+=== CURRENT DRAFT (PREVIOUS VERSION) ===
+{current_artifact_json}
+========================================
+""",
+)
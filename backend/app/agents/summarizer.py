@@ -0,0 +1,82 @@
+# app/agents/summarizer.py
+import json
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import AgentConfig
+from app.core.llm.interface import ILLMClient
+from app.core.llm.usage import llm_agent
+from app.agents.prompts.history_summary import HISTORY_SUMMARY_PROMPT
+
+# Tool outputs that only echo ledger data (which the agent already receives in its system context)
+LEDGER_TOOLS = {"update_requirements"}
+TOOL_OUTPUT_PREVIEW = 240
+
+class HistorySummarizerAgent:
+    """
+    Folds old chat turns into a rolling summary (see HistoryWindow).
+    """
+
+    def __init__(self, llm_client: ILLMClient):
+        self.llm = llm_client
+
+    async def summarize(self, previous_summary: Optional[str], messages: List[Dict[str, Any]]) -> str:
+        # 1. Render a compact transcript (bulky tool payloads are reduced to one line)
+        transcript = render_transcript(messages)
+
+        # 2. Call LLM
+        messages = HISTORY_SUMMARY_PROMPT.messages(
+            previous_summary=previous_summary or "(none)",
+            transcript=transcript,
+            max_words=str(AgentConfig.HISTORY_SUMMARY_MAX_WORDS),
+        )
+        with llm_agent(HISTORY_SUMMARY_PROMPT.name):
+            summary = await self.llm.get_text_completion(
+                messages=messages,
+                model=AgentConfig.SUPER_FAST_MODEL,
+            )
+        return (summary or "").strip()
+
+def render_transcript(messages: List[Dict[str, Any]]) -> str:
+    """
+    One line per message. Assistant tool calls are listed by name; tool results
+    are reduced to their status (ledger tools) or a short preview.
+    """
+    tool_names: Dict[str, str] = {}
+    lines = []
+
+    for message in messages:
+        role = message.get("role")
+        content = message.get("content") or ""
+
+        if role == "assistant":
+            calls = message.get("tool_calls") or []
+            for call in calls:
+                tool_names[call.get("id")] = call.get("function", {}).get("name", "tool")
+            if content:
+                lines.append(f"ASSISTANT: {content}")
+            if calls:
+                lines.append(f"ASSISTANT called: {', '.join(tool_names[c.get('id')] for c in calls)}")
+
+        elif role == "tool":
+            name = tool_names.get(message.get("tool_call_id"), "tool")
+            lines.append(f"TOOL {name}: {_tool_digest(name, content)}")
+
+        elif role == "user":
+            lines.append(f"USER: {content}")
+
+    return "\n".join(lines)
+
+def _tool_digest(name: str, content: str) -> str:
+    try:
+        result = json.loads(content)
+    except (TypeError, ValueError):
+        result = None
+
+    if name in LEDGER_TOOLS and isinstance(result, dict):
+        gaps = result.get("completeness_gaps") or []
+        issues = result.get("compliance_issues") or []
+        return f"ledger {result.get('status', 'ok')}, {len(gaps)} gap(s), {len(issues)} compliance issue(s)"
+
+    if len(content) > TOOL_OUTPUT_PREVIEW:
+        return content[:TOOL_OUTPUT_PREVIEW] + f"... [{len(content) - TOOL_OUTPUT_PREVIEW} chars elided]"
+    return content
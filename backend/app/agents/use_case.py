@@ -1,16 +1,33 @@
 # app/agents/use_case.py
 import json
+from typing import Optional
 from app.core.llm.interface import ILLMClient
 from app.domain.models.state import SessionState
-from app.domain.models.artifacts import UseCaseArtifact
+from app.domain.models.artifacts import UseCase, UseCaseArtifact, UseCasePatch
 from app.core.services.context import system_context
-from app.agents.prompts.use_case import USE_CASE_PROMPT
+from app.core.services.fingerprint import digest
+from app.core.services.incremental import IncrementalPlan, plan_incremental
+from app.agents.prompts.use_case import USE_CASE_PROMPT, USE_CASE_PATCH_PROMPT
+from app.core.llm.usage import llm_agent
+from app.core.llm.partial_json import ProgressCallback, item_progress
 
 class UseCaseAgent:
     def __init__(self, llm_client: ILLMClient):
         self.llm = llm_client
 
-    async def generate(self, state: SessionState) -> UseCaseArtifact:
+    def input_key(self, state: SessionState) -> str:
+        """Hash of everything this generator reads besides the draft (see artifact_fingerprint)."""
+        return digest(
+            USE_CASE_PROMPT.version, USE_CASE_PATCH_PROMPT.version,
+            self.llm.default_model, system_context.build(state)
+        )
+
+    async def generate(
+        self,
+        state: SessionState,
+        on_progress: Optional[ProgressCallback] = None,
+        regenerate: bool = False
+    ) -> UseCaseArtifact:
         # 1. Context
         context_str = system_context.build(state)
 
@@ -22,18 +39,48 @@ class UseCaseAgent:
             internal_id = f"use_case-v{current_version}"
             raw_data = state.artifacts.get(internal_id)
             if raw_data:
+                # 3. Incremental Path: only new / affected use cases (an explicit regenerate rewrites them all)
+                plan = None if regenerate else plan_incremental(
+                    state, "use_case", internal_id, raw_data.get("use_cases", []), actor_field="primary_actor"
+                )
+                if plan:
+                    return await self._patch(context_str, plan)
                 current_json = json.dumps(raw_data, indent=2)
         
-        messages = [
-            {"role": "system", "content": USE_CASE_PROMPT.format(
-                context_block=context_str,
-                current_artifact_json=current_json
-            )}
-        ]
-
-        result = await self.llm.get_structured_completion(
-            messages=messages,
-            response_model=UseCaseArtifact,
+        messages = USE_CASE_PROMPT.messages(
+            context_block=context_str,
+            current_artifact_json=current_json
         )
+
+        # 4. Full Generation (streamed: each finished use case is reported)
+        with llm_agent(USE_CASE_PROMPT.name):
+            if on_progress:
+                result = await self.llm.stream_structured_completion(
+                    messages=messages,
+                    response_model=UseCaseArtifact,
+                    on_text=item_progress("use_cases", UseCase, on_progress),
+                )
+            else:
+                result = await self.llm.get_structured_completion(
+                    messages=messages,
+                    response_model=UseCaseArtifact,
+                )
         
-        return result
\ No newline at end of file
+        return result
+
+    async def _patch(self, context_str: str, plan: IncrementalPlan) -> UseCaseArtifact:
+        messages = USE_CASE_PATCH_PROMPT.messages(
+            context_block=context_str,
+            delta_block=plan.delta.render(),
+            affected_json=json.dumps(plan.affected, indent=2) if plan.affected else "None.",
+            index_block=plan.index(lambda uc: f"{uc.get('primary_actor')} | {uc.get('title')}"),
+        )
+
+        with llm_agent(USE_CASE_PATCH_PROMPT.name):
+            patch = await self.llm.get_structured_completion(
+                messages=messages,
+                response_model=UseCasePatch,
+            )
+
+        merged = plan.merge([uc.model_dump() for uc in patch.use_cases], patch.removed_ids)
+        return UseCaseArtifact.model_validate({"use_cases": merged})
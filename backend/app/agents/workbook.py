@@ -1,16 +1,24 @@
 # app/agents/workbook.py
 import json
+from typing import Optional
 from app.core.llm.interface import ILLMClient
 from app.domain.models.state import SessionState
-from app.domain.models.artifacts import WorkbookArtifact
+from app.domain.models.artifacts import WorkbookArtifact, WorkbookCategory
 from app.core.services.context import system_context
+from app.core.services.fingerprint import digest
 from app.agents.prompts.workbook import WORKBOOK_PROMPT
+from app.core.llm.usage import llm_agent
+from app.core.llm.partial_json import ProgressCallback, item_progress
 
 class WorkbookAgent:
     def __init__(self, llm_client: ILLMClient):
         self.llm = llm_client
 
-    async def generate(self, state: SessionState) -> WorkbookArtifact:
+    def input_key(self, state: SessionState) -> str:
+        """Hash of everything this generator reads besides the draft (see artifact_fingerprint)."""
+        return digest(WORKBOOK_PROMPT.version, self.llm.default_model, system_context.build(state))
+
+    async def generate(self, state: SessionState, on_progress: Optional[ProgressCallback] = None) -> WorkbookArtifact:
         # 1. Context
         context_str = system_context.build(state)
 
@@ -24,16 +32,23 @@ class WorkbookAgent:
             if raw_data:
                 current_json = json.dumps(raw_data, indent=2)
         
-        messages = [
-            {"role": "system", "content": WORKBOOK_PROMPT.format(
-                context_block=context_str,
-                current_artifact_json=current_json
-            )}
-        ]
-
-        result = await self.llm.get_structured_completion(
-            messages=messages,
-            response_model=WorkbookArtifact,
+        messages = WORKBOOK_PROMPT.messages(
+            context_block=context_str,
+            current_artifact_json=current_json
         )
+
+        # 3. Call LLM (streamed: each finished category is reported)
+        with llm_agent(WORKBOOK_PROMPT.name):
+            if on_progress:
+                result = await self.llm.stream_structured_completion(
+                    messages=messages,
+                    response_model=WorkbookArtifact,
+                    on_text=item_progress("categories", WorkbookCategory, on_progress),
+                )
+            else:
+                result = await self.llm.get_structured_completion(
+                    messages=messages,
+                    response_model=WorkbookArtifact,
+                )
         
         return result
\ No newline at end of file
@@ -0,0 +1,121 @@
+# app/api/delta_encoder.py
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.core.services.json_patch import make_patch
+from app.core.services.mapper import DomainMapper
+from app.utils.logger import setup_logger
+
+logger = setup_logger("DeltaEncoder")
+
+@dataclass
+class _DocStream:
+    """Per-document version bookkeeping for one connection."""
+    version: int = 0
+    last_sent: Any = None
+    acked_version: Optional[int] = None
+    # Forces the next message to be a full payload (after a client mismatch).
+    needs_full: bool = True
+
+class DeltaEncoder:
+    """
+    Per-connection JSON Patch encoder for ARTIFACT_UPDATE and STATE_UPDATE.
+
+    Runs inside the OutboundQueue writer (after coalescing), so every message it
+    encodes is actually written, in order, to the socket. Patches are therefore
+    computed against the last version delivered on this ordered channel.
+
+    Acknowledgements (PATCH_ACK) bound the optimism: if the client falls more than
+    'max_unacked' versions behind, or reports a base mismatch, the next message is
+    a full payload (single root 'replace' with base_version = None).
+    """
+
+    def __init__(self, max_unacked: int = 8):
+        self.max_unacked = max_unacked
+        self._streams: Dict[Tuple[str, str], _DocStream] = {}
+        self._opened: Set[str] = set()
+
+    HANDLED_TYPES = {"ARTIFACT_UPDATE", "STATE_UPDATE", "ARTIFACT_OPEN"}
+
+    def handles(self, event_type: str) -> bool:
+        return event_type in self.HANDLED_TYPES
+
+    def encode(self, event_type: str, payload: Any) -> Tuple[str, Any]:
+        """Returns (event_type, payload) to put on the wire."""
+        if event_type == "ARTIFACT_UPDATE":
+            doc_id = payload.get("id")
+            return self._encode("artifact", doc_id, self._parse_content(payload.get("content")))
+
+        if event_type == "STATE_UPDATE":
+            doc_id = payload.get("sessionId")
+            return self._encode("state", doc_id, payload)
+
+        if event_type == "ARTIFACT_OPEN":
+            # Re-opening a tab only focuses it; the content is already held by the client
+            # through its patch stream. Delta clients treat empty content as "use your copy".
+            doc_id = payload.get("id")
+            if doc_id in self._opened and ("artifact", doc_id) in self._streams:
+                return event_type, {**payload, "content": ""}
+            self._opened.add(doc_id)
+
+        return event_type, payload
+
+    def acknowledge(self, target: str, doc_id: str, version: int, status: str = "applied"):
+        stream = self._streams.get((target, doc_id))
+        if not stream:
+            return
+
+        if status != "applied":
+            logger.info(f"🔁 Client mismatch on {target}:{doc_id} (v{version}). Next update is full.")
+            stream.needs_full = True
+            return
+
+        if stream.acked_version is None or version > stream.acked_version:
+            stream.acked_version = version
+
+    # --- Internals ---
+
+    def _encode(self, target: str, doc_id: str, doc: Any) -> Tuple[str, Any]:
+        stream = self._streams.setdefault((target, doc_id), _DocStream())
+        base_version = stream.version
+        stream.version += 1
+
+        lagging = (
+            stream.acked_version is None
+            or stream.version - stream.acked_version > self.max_unacked
+        )
+
+        ops = None
+        if not stream.needs_full and not lagging:
+            ops = make_patch(stream.last_sent, doc)
+            # Fall back when the patch is not actually smaller than the document
+            if len(json.dumps(ops)) >= len(json.dumps(doc)):
+                ops = None
+
+        stream.last_sent = doc
+
+        if ops is None:
+            stream.needs_full = False
+            msg = DomainMapper.to_json_patch(
+                target, doc_id, [{"op": "replace", "path": "", "value": doc}],
+                version=stream.version, base_version=None
+            )
+        else:
+            msg = DomainMapper.to_json_patch(
+                target, doc_id, ops,
+                version=stream.version, base_version=base_version
+            )
+
+        return msg["type"], msg["payload"]
+
+    @staticmethod
+    def _parse_content(content: Any) -> Any:
+        if isinstance(content, str):
+            try:
+                parsed = json.loads(content)
+                if isinstance(parsed, (dict, list)):
+                    return parsed
+            except ValueError:
+                pass
+        return content
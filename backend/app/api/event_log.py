@@ -0,0 +1,95 @@
+# app/api/event_log.py
+import uuid
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from app.api.outbound_queue import OutboundEvent
+
+class SessionEventLog:
+    """
+    Bounded ring buffer of the events broadcast on one session.
+    Every event gets a monotonically increasing 'seq' (stamped on the wire envelope).
+    Bounded by event count and by serialized size (artifact updates can be large):
+    the oldest events are evicted first, the newest one is always kept.
+
+    A reconnecting client sends its last seen seq + the log 'epoch'; if the log
+    still covers the gap, only the missed events are replayed. The epoch changes
+    whenever the log is recreated (process restart, eviction), so stale
+    sequence numbers never match a different log.
+    """
+
+    def __init__(self, capacity: int, max_bytes: int):
+        self.epoch = uuid.uuid4().hex[:12]
+        self.head = 0
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        # Serialized size of the retained events
+        self.size = 0
+        self._events: Deque[Tuple[OutboundEvent, int]] = deque()
+
+    def append(self, event: OutboundEvent) -> int:
+        self.head += 1
+        event.seq = self.head
+        # Wire text is cached on the event, so subscribers reuse this serialization
+        event_size = len(event.serialize())
+        self._events.append((event, event_size))
+        self.size += event_size
+
+        while len(self._events) > 1 and (len(self._events) > self.capacity or self.size > self.max_bytes):
+            _, evicted_size = self._events.popleft()
+            self.size -= evicted_size
+        return self.head
+
+    def since(self, last_seq: int, epoch: Optional[str]) -> Optional[List[OutboundEvent]]:
+        """
+        Events with seq > last_seq, or None if the client must take a full snapshot
+        (unknown epoch, seq from the future, or the gap was evicted from the buffer).
+        """
+        if epoch != self.epoch or last_seq < 0 or last_seq > self.head:
+            return None
+
+        oldest = self._events[0][0].seq if self._events else self.head + 1
+        if last_seq + 1 < oldest:
+            return None
+
+        return _compact([event for event, _ in self._events if event.seq > last_seq])
+
+def _compact(events: List[OutboundEvent]) -> List[OutboundEvent]:
+    """
+    Merges runs of CHAT_DELTA into one event (keeping the last seq),
+    so replaying a streamed reply costs one message instead of one per token.
+    ARTIFACT_UPDATEs superseded by a later one for the same artifact are dropped
+    (progressive rendering sends one per batch of completed items).
+    """
+    latest_update = {
+        _update_id(event): event.seq for event in events if _update_id(event) is not None
+    }
+    events = [
+        event for event in events
+        if _update_id(event) is None or latest_update[_update_id(event)] == event.seq
+    ]
+
+    compacted: List[OutboundEvent] = []
+    run: List[OutboundEvent] = []
+
+    def flush():
+        if len(run) == 1:
+            compacted.append(run[0])
+        elif run:
+            text = "".join(event.payload for event in run)
+            compacted.append(OutboundEvent("CHAT_DELTA", text, seq=run[-1].seq))
+        run.clear()
+
+    for event in events:
+        if event.event_type == "CHAT_DELTA" and isinstance(event.payload, str):
+            run.append(event)
+        else:
+            flush()
+            compacted.append(event)
+    flush()
+    return compacted
+
+def _update_id(event: OutboundEvent) -> Optional[str]:
+    if event.event_type == "ARTIFACT_UPDATE" and isinstance(event.payload, dict):
+        return event.payload.get("id")
+    return None
@@ -0,0 +1,28 @@
+# app/api/metrics.py
+from typing import Any, Dict
+from fastapi import APIRouter
+from app.core.llm.usage import prompt_cache_stats
+from app.service_container import get_service_container
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def metrics() -> Dict[str, Any]:
+    """Process-local runtime telemetry (per worker)."""
+    services = get_service_container()
+    return {
+        # Provider prefix-cache hit rate per agent (see PromptTemplate)
+        "prompt_cache": prompt_cache_stats.snapshot(),
+        # LLM pools: active / queued per priority / admission wait (see WorkScheduler)
+        "scheduler": services.work_scheduler.snapshot(),
+        # Per provider/model: AIMD concurrency, cooldown, RPM / TPM headroom, 429s (see RateLimiter)
+        "rate_limits": services.rate_limiter.snapshot(),
+        # Per-route calls / failovers / hedges and latency histograms (see LLMGateway)
+        "gateway": services.llm_gateway.snapshot(),
+        # Structured-completion cache hits per tier / misses / bypasses (see CompletionCache)
+        "completion_cache": services.completion_cache.snapshot() if services.completion_cache else None,
+        # Live turns / generators per kind, detached work, lifetime outcomes (see TaskSupervisor)
+        "tasks": services.task_supervisor.snapshot(),
+        # Record / replay mode, recorded takes, replays and misses (see Cassette)
+        "cassette": services.cassette.snapshot() if services.cassette else None,
+    }
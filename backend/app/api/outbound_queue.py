@@ -0,0 +1,204 @@
+# app/api/outbound_queue.py
+import asyncio
+import json
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional
+
+from fastapi import WebSocket
+
+from app.api.delta_encoder import DeltaEncoder
+from app.api.wire_format import BinaryCodec, JsonCodec, WireCodec
+from app.utils.logger import setup_logger
+
+logger = setup_logger("OutboundQueue")
+
+@dataclass
+class OutboundEvent:
+    event_type: str
+    payload: Any
+    # Coalescing key: events with the same key replace each other while still pending.
+    key: Optional[str] = None
+    # Session sequence number (SessionEventLog). None for per-subscriber events (restore, acks).
+    seq: Optional[int] = None
+    # Cached wire text. One event object may be fanned out to several queues (SessionHub),
+    # so whichever writer gets to it first serializes it for everyone.
+    _text: Optional[str] = None
+    # Cached binary frame (MessagePack subscribers), same sharing rules as _text
+    _packed: Optional[bytes] = None
+
+    @classmethod
+    def create(cls, event_type: str, payload: Any) -> "OutboundEvent":
+        return cls(event_type, payload, cls._coalesce_key(event_type, payload))
+
+    @staticmethod
+    def _coalesce_key(event_type: str, payload: Any) -> Optional[str]:
+        if event_type == "STATUS_UPDATE":
+            return event_type
+        if event_type == "ARTIFACT_UPDATE" and isinstance(payload, dict) and payload.get("id"):
+            return f"{event_type}:{payload['id']}"
+        return None
+
+    def envelope(self) -> Dict[str, Any]:
+        message = {"type": self.event_type, "payload": self.payload}
+        if self.seq is not None:
+            message["seq"] = self.seq
+        return message
+
+    def serialize(self) -> str:
+        if self._text is None:
+            self._text = json.dumps(self.envelope())
+        return self._text
+
+    def pack(self, codec: BinaryCodec) -> bytes:
+        if self._packed is None:
+            self._packed = codec.pack(self.envelope())
+        return self._packed
+
+class OutboundQueue:
+    """
+    Per-connection writer.
+    Emitters enqueue without awaiting the network; a single writer task drains
+    the queue and serializes each surviving message exactly once.
+
+    Coalescing rules (applied while an event is still pending):
+    - Consecutive STATUS_UPDATEs collapse into the latest one.
+    - ARTIFACT_UPDATE for a doc id replaces the pending update for the same doc id.
+
+    Backpressure: the queue is bounded. When full, the oldest pending STATUS_UPDATE
+    is dropped. If nothing is droppable, the client is too slow and the socket is
+    closed (the frontend reconnects and receives a full state restore).
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_size: int = 256,
+        encoder: Optional[DeltaEncoder] = None,
+        codec: Optional[WireCodec] = None
+    ):
+        self.websocket = websocket
+        # Optional JSON Patch encoding, applied after coalescing (see DeltaEncoder)
+        self.encoder = encoder
+        # Negotiated framing (see wire_format.negotiate). Defaults to JSON text frames.
+        self.codec = codec or JsonCodec()
+        self.max_size = max_size
+        self._pending: Deque[OutboundEvent] = deque()
+        self._wakeup = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def start(self):
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._run())
+
+    async def send(self, event_type: str, payload: Any):
+        """
+        Emitter-facing callback (same signature as the old send_event closure).
+        Never awaits the socket.
+        """
+        self.enqueue(OutboundEvent.create(event_type, payload))
+
+    def enqueue(self, event: OutboundEvent):
+        """Enqueues a prepared (possibly shared) event."""
+        if self._closed:
+            return
+
+        if event.key and self._replace_pending(event):
+            return
+
+        if len(self._pending) >= self.max_size and not self._drop_status():
+            logger.warning(f"🐢 Outbound queue overflow ({self.max_size}). Closing slow connection.")
+            self._stop()
+            asyncio.create_task(self._shutdown(code=1013))
+            return
+
+        self._pending.append(event)
+        self._wakeup.set()
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    async def close(self, code: int = 1000):
+        """Stops the writer. Pending events are discarded."""
+        if self._closed:
+            return
+        self._stop()
+        await self._shutdown(code)
+
+    # --- Internals ---
+
+    def _stop(self):
+        self._closed = True
+        self._pending.clear()
+        self._wakeup.set()
+
+    async def _shutdown(self, code: int):
+        if self._writer and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+
+        if code != 1000:
+            try:
+                await self.websocket.close(code=code)
+            except Exception:
+                pass
+
+    def _replace_pending(self, event: OutboundEvent) -> bool:
+        if event.event_type == "STATUS_UPDATE":
+            # Only collapse with the tail: a status between two other events keeps its position.
+            if self._pending and self._pending[-1].key == event.key:
+                self._pending[-1] = event
+                return True
+            return False
+
+        for i, pending in enumerate(self._pending):
+            if pending.key == event.key:
+                self._pending[i] = event
+                return True
+        return False
+
+    def _drop_status(self) -> bool:
+        for i, pending in enumerate(self._pending):
+            if pending.event_type == "STATUS_UPDATE":
+                del self._pending[i]
+                return True
+        return False
+
+    async def _run(self):
+        try:
+            while not self._closed:
+                if not self._pending:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                event = self._pending.popleft()
+                try:
+                    if self.encoder and self.encoder.handles(event.event_type):
+                        # Per-client versions: cannot share the serialized form
+                        event_type, payload = self.encoder.encode(event.event_type, event.payload)
+                        event = OutboundEvent(event_type, payload, seq=event.seq)
+
+                    if isinstance(self.codec, BinaryCodec) and self.codec.is_binary(event.event_type):
+                        frame = event.pack(self.codec)
+                    else:
+                        frame = event.serialize()
+                except (TypeError, ValueError) as e:
+                    logger.error(f"❌ Failed to serialize {event.event_type}: {e}")
+                    continue
+
+                if isinstance(frame, bytes):
+                    await self.websocket.send_bytes(frame)
+                else:
+                    await self.websocket.send_text(frame)
+
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.warning(f"⚠️ Outbound writer stopped: {e}")
+            self._stop()
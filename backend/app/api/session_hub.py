@@ -0,0 +1,137 @@
+# app/api/session_hub.py
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+
+from app.api.event_log import SessionEventLog
+from app.api.outbound_queue import OutboundEvent, OutboundQueue
+from app.api.session_mailbox import SessionMailbox
+from app.config.settings import AppConfig
+from app.core.orchestrator import Orchestrator
+from app.service_container import get_service_container
+from app.utils.logger import setup_logger
+
+logger = setup_logger("SessionHub")
+
+class SessionChannel:
+    """
+    One session: a single Orchestrator + Mailbox shared by every socket
+    (tab / device) subscribed to the same session_id, plus the event log
+    used to replay missed events on reconnect.
+
+    Orchestrator events go through the session event bus, so a turn running on
+    another worker reaches the sockets held here (and vice versa).
+    """
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.subscribers: Set[OutboundQueue] = set()
+        self.log = SessionEventLog(AppConfig.EVENT_LOG_CAPACITY, AppConfig.EVENT_LOG_MAX_BYTES)
+
+        services = get_service_container()
+        self.bus = services.event_bus
+        self.orchestrator = Orchestrator(
+            session_id=session_id,
+            emit=self.broadcast,
+            services=services
+        )
+        self.bus.subscribe(session_id, self.deliver)
+
+        self.mailbox: Optional[SessionMailbox] = None
+        self.open_mailbox()
+
+    def open_mailbox(self):
+        self.mailbox = SessionMailbox(self.session_id)
+        self.mailbox.start()
+
+    def detach(self):
+        self.bus.unsubscribe(self.session_id, self.deliver)
+
+    async def broadcast(self, event_type: str, payload: Any):
+        """Orchestrator emitter: publishes to every worker holding this session."""
+        await self.bus.publish(self.session_id, event_type, payload)
+
+    def deliver(self, event_type: str, payload: Any):
+        """
+        Event bus handler. Builds ONE OutboundEvent (serialized lazily, once),
+        numbers it in the session log and hands the same object to every subscriber's queue.
+        Events are logged even with no subscribers (e.g. a generator finishing during
+        a reconnect), so the next connection can replay them.
+        """
+        event = OutboundEvent.create(event_type, payload)
+        self.log.append(event)
+        for queue in list(self.subscribers):
+            queue.enqueue(event)
+
+class SessionHub:
+    """
+    Process-wide registry of sessions, keyed by session_id.
+    A channel is live while at least one socket is subscribed. After the last
+    subscriber leaves, its mailbox is closed but the channel (orchestrator + event log)
+    is kept in an LRU, bounded by count and by the total size of the retained logs,
+    so a client dropping and reconnecting can resume.
+    """
+
+    def __init__(self):
+        self._channels: Dict[str, SessionChannel] = {}
+        self._idle: "OrderedDict[str, SessionChannel]" = OrderedDict()
+
+    def join(self, session_id: str, outbound: OutboundQueue) -> SessionChannel:
+        channel = self._channels.get(session_id)
+        if channel is None:
+            channel = self._idle.pop(session_id, None)
+            if channel is not None:
+                channel.open_mailbox()
+                logger.info(f"📡 Revived channel for session {session_id} (seq {channel.log.head})")
+            else:
+                channel = SessionChannel(session_id)
+                logger.info(f"📡 Opened channel for session {session_id}")
+            self._channels[session_id] = channel
+
+        if not channel.subscribers:
+            # Detached turns / generators report to this socket again
+            get_service_container().task_supervisor.session_reattached(session_id)
+        channel.subscribers.add(outbound)
+        logger.info(f"➕ Subscriber joined {session_id} ({len(channel.subscribers)} total)")
+        return channel
+
+    def replay(self, channel: SessionChannel, last_seq: Optional[int], epoch: Optional[str]) -> Optional[List[OutboundEvent]]:
+        """
+        Missed events for a resuming subscriber, or None when a full snapshot is needed.
+        Must be called right after join() with no await in between, so that no
+        broadcast can fall between the replayed range and the live stream.
+        """
+        if last_seq is None:
+            return None
+        return channel.log.since(last_seq, epoch)
+
+    async def leave(self, channel: SessionChannel, outbound: OutboundQueue):
+        channel.subscribers.discard(outbound)
+        logger.info(f"➖ Subscriber left {channel.session_id} ({len(channel.subscribers)} remaining)")
+
+        if not channel.subscribers and self._channels.get(channel.session_id) is channel:
+            del self._channels[channel.session_id]
+            self._retain(channel)
+            await channel.mailbox.close()
+            get_service_container().task_supervisor.session_disconnected(channel.session_id)
+            logger.info(f"📴 Closed channel for session {channel.session_id}")
+
+    @property
+    def active_sessions(self) -> int:
+        return len(self._channels)
+
+    def _retain(self, channel: SessionChannel):
+        self._idle[channel.session_id] = channel
+        # Idle logs still grow while detached tasks finish, so the size is re-read here
+        idle_bytes = sum(idle.log.size for idle in self._idle.values())
+        while self._idle and (
+            len(self._idle) > AppConfig.EVENT_LOG_IDLE_SESSIONS or idle_bytes > AppConfig.EVENT_LOG_IDLE_BYTES
+        ):
+            session_id, evicted = self._idle.popitem(last=False)
+            idle_bytes -= evicted.log.size
+            evicted.detach()
+            # Nobody can resume it any more: stop whatever it still runs
+            get_service_container().task_supervisor.cancel_session(session_id, "channel evicted")
+            logger.debug(f"🗑️ Evicted idle channel {session_id}")
+
+# Global Singleton for the application lifespan
+session_hub = SessionHub()
@@ -0,0 +1,91 @@
+# app/api/session_mailbox.py
+import asyncio
+import traceback
+from enum import Enum
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger("SessionMailbox")
+
+Job = Callable[[], Awaitable[None]]
+
+class Lane(str, Enum):
+    # Multi-turn LLM loops. Serialized: one chat turn at a time, in arrival order.
+    CHAT = "chat"
+    # Cheap events (ARTIFACT_EDIT, ARTIFACT_VISUAL_SYNC, PROJECT_PUBLISH start). Serialized among themselves.
+    FAST = "fast"
+
+class SessionMailbox:
+    """
+    Per-session actor for inbound WebSocket events.
+    The receive loop only posts jobs; each lane has its own worker, so a long
+    chat turn never blocks an edit.
+
+    Ordering guarantees:
+    1. Jobs within a lane run strictly FIFO, one at a time.
+    2. Lanes never wait for each other (an edit posted during a chat turn runs immediately).
+    3. Both lanes act on the same SessionState instance from the repository, and each
+       handler mutates it synchronously between awaits, so a FAST-lane edit is visible
+       to the next LLM iteration / artifact generation of an in-flight chat turn.
+    4. PROJECT_PUBLISH starts on the FAST lane, so it always reflects every edit received before it;
+       the upload then runs as a supervised task (Orchestrator.request_publish) and never holds the lane.
+    """
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self._queues: Dict[Lane, asyncio.Queue[Tuple[str, Job]]] = {lane: asyncio.Queue() for lane in Lane}
+        self._workers: Dict[Lane, asyncio.Task] = {}
+        self._current: Dict[Lane, Optional[str]] = {lane: None for lane in Lane}
+        self._closed = False
+
+    def start(self):
+        for lane in Lane:
+            if lane not in self._workers:
+                self._workers[lane] = asyncio.create_task(self._run(lane))
+
+    def post(self, lane: Lane, label: str, job: Job):
+        """Enqueues a job without awaiting it."""
+        if self._closed:
+            logger.warning(f"⚠️ Mailbox closed, dropping {label} for {self.session_id}")
+            return
+        self._queues[lane].put_nowait((label, job))
+
+    def depth(self, lane: Lane) -> int:
+        return self._queues[lane].qsize()
+
+    async def close(self):
+        """
+        Stops accepting jobs and discards queued (not yet started) ones.
+        A job that is already running is allowed to finish in the background,
+        matching the pre-mailbox behavior where a turn completed after disconnect.
+        """
+        self._closed = True
+        for lane, queue in self._queues.items():
+            dropped = 0
+            while not queue.empty():
+                queue.get_nowait()
+                dropped += 1
+            if dropped:
+                logger.info(f"🗑️ Dropped {dropped} queued {lane.value} job(s) for {self.session_id}")
+            # Wake idle workers so they can exit
+            queue.put_nowait(None)
+
+    async def _run(self, lane: Lane):
+        queue = self._queues[lane]
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+
+            label, job = item
+            self._current[lane] = label
+            try:
+                await job()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"🔥 {lane.value} lane job '{label}' crashed: {e}")
+                traceback.print_exc()
+            finally:
+                self._current[lane] = None
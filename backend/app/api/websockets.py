@@ -1,10 +1,13 @@
 # app/api/websockets.py
-import json
 import uuid
 from typing import Optional
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
-from app.core.orchestrator import Orchestrator
-from app.state_container import session_repository
+from app.api.outbound_queue import OutboundEvent, OutboundQueue
+from app.api.delta_encoder import DeltaEncoder
+from app.api.session_mailbox import Lane
+from app.api.session_hub import session_hub
+from app.api.wire_format import negotiate, decode_frame, normalize_visual_data
+from app.core.services.mapper import DomainMapper
 
 router = APIRouter()
 
@@ -12,10 +15,19 @@ router = APIRouter()
 async def websocket_endpoint(
     websocket: WebSocket, 
     client_id: str,
-    session_id: Optional[str] = Query(None) 
+    session_id: Optional[str] = Query(None),
+    delta: Optional[str] = Query(None),
+    last_seq: Optional[int] = Query(None),
+    epoch: Optional[str] = Query(None)
 ):
-    await websocket.accept()
-    
+    # 0. Wire Format Negotiation
+    # Framing via Sec-WebSocket-Protocol (JSON text by default, MessagePack when offered).
+    # Compression (permessage-deflate) is negotiated by the ASGI server (uvicorn enables it by default).
+    codec, subprotocol = negotiate(websocket.scope.get("subprotocols", []))
+    await websocket.accept(subprotocol=subprotocol)
+    deflate = "permessage-deflate" in websocket.headers.get("sec-websocket-extensions", "")
+    print(f"🗜️ [WS] Client {client_id} framing={codec.name} deflate_offered={deflate}")
+
     # 1. Determine Session Identity
     if session_id:
         # Resume existing session
@@ -29,81 +41,179 @@ async def websocket_endpoint(
         print(f"🔌 [WS] Client {client_id} starting NEW session: {current_session_id}")
 
     # 2. Define the callback
-    async def send_event(event_type: str, payload: dict):
+    # Emitters only enqueue; a dedicated writer task owns the socket.
+    # Clients opt into JSON Patch updates with ?delta=json-patch
+    delta_encoder = DeltaEncoder() if delta == "json-patch" else None
+    outbound = OutboundQueue(websocket, encoder=delta_encoder, codec=codec)
+    outbound.start()
+
+    # 3. Join the Session Channel
+    # Every tab on the same session_id shares one Orchestrator + Mailbox;
+    # events are serialized once and fanned out to all subscribers.
+    channel = session_hub.join(current_session_id, outbound)
+    engine = channel.orchestrator
+    mailbox = channel.mailbox
+
+    # 4. Handshake & Restore (only to this subscriber)
+    # A resuming client gets only the events it missed (same objects, same seq);
+    # the full snapshot is the fallback when the gap is no longer in the log.
+    # No await between join() and replay(): the replayed range must meet the live stream.
+    missed = session_hub.replay(channel, last_seq, epoch) if not is_new_session else None
+    if missed is not None and len(missed) > outbound.max_size // 2:
+        # Replaying would overflow the outbound queue; a snapshot is cheaper
+        missed = None
+
+    if missed is not None:
+        established = DomainMapper.to_session_established(
+            current_session_id, False, epoch=channel.log.epoch, seq=last_seq, resumed=True
+        )
+        outbound.enqueue(OutboundEvent.create(established["type"], established["payload"]))
+        for event in missed:
+            outbound.enqueue(event)
+        print(f"⏩ [WS] Client {client_id} resumed at seq {last_seq}: replayed {len(missed)} events")
+    else:
         try:
-            await websocket.send_json({"type": event_type, "payload": payload})
+            # We pass the flag so Orchestrator knows whether to emit SESSION_ESTABLISHED
+            await engine.load_initial_state(
+                is_new_session=is_new_session,
+                emit=outbound.send,
+                epoch=channel.log.epoch,
+                seq=channel.log.head
+            )
         except Exception as e:
-            print(f"Error sending to client: {e}")
+            print(f"🔥 Failed to load initial state: {e}")
+            # Optionally emit error to client here
 
-    # 3. Init Engine with the resolved Session ID
-    engine = Orchestrator(
-        session_id=current_session_id, 
-        emit=send_event, 
-        repository=session_repository
-    )
+    # 5. Inbound Mailbox (shared per session)
+    # The receive loop never awaits a handler: chat turns run on a serialized lane,
+    # edits / visual sync / publish on a fast lane (see SessionMailbox for ordering).
 
-    # 4. Handshake & Restore
-    try:
-        # We pass the flag so Orchestrator knows whether to emit SESSION_ESTABLISHED
-        await engine.load_initial_state(is_new_session=is_new_session)
-    except Exception as e:
-        print(f"🔥 Failed to load initial state: {e}")
-        # Optionally emit error to client here
+    async def run_user_message(content: str, ticket: int, message_id: Optional[str]):
+        try:
+            await engine.handle_user_message(content, ticket, message_id)
+        except Exception as logic_error:
+            print(f"🔥 LOGIC CRASH: {logic_error}")
+            await engine.emit("ERROR", {"message": f"Server Logic Error: {str(logic_error)}"})
+            import traceback
+            traceback.print_exc()
+
+    async def run_artifact_edit(doc_id: str, content):
+        try:
+            await engine.handle_artifact_edit(doc_id, content)
+        except Exception as e:
+            print(f"Error handling edit: {e}")
+
+    async def run_visual_sync(doc_id: str, visual: str, fmt: str, digest: Optional[str]):
+        try:
+            await engine.handle_visual_sync(doc_id, visual, fmt, digest, emit=outbound.send)
+        except Exception as e:
+            print(f"Error handling visual sync: {e}")
 
     try:
         while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
             try:
-                raw_data = await websocket.receive_text()
-                data = json.loads(raw_data)
-                
-            except json.JSONDecodeError:
-                print("❌ Client sent invalid JSON. Ignoring.")
+                data = decode_frame(codec, message)
+            except ValueError:
+                # Covers json.JSONDecodeError and msgpack unpack errors
+                print("❌ Client sent an undecodable frame. Ignoring.")
+                continue
+
+            if not isinstance(data, dict):
                 continue
 
             event_type = data.get("type")
             payload = data.get("payload")
+            # Object payloads only (MessagePack frames may carry any type); USER_MESSAGE also takes a string
+            fields = payload if isinstance(payload, dict) else {}
 
             if event_type == "USER_MESSAGE":
-                try:
-                    content = payload if isinstance(payload, str) else payload.get("content", "")
-                    await engine.handle_user_message(content)
-                except Exception as logic_error:
-                    print(f"🔥 LOGIC CRASH: {logic_error}")
-                    await send_event("ERROR", {"message": f"Server Logic Error: {str(logic_error)}"})
-                    import traceback
-                    traceback.print_exc()
+                content = payload if isinstance(payload, str) else fields.get("content", "")
+                message_id = fields.get("id")
+                # A newer message supersedes the in-flight turn (cancelled right away, not after it finishes)
+                ticket = engine.supersede_turn()
+                mailbox.post(Lane.CHAT, event_type, lambda c=content, t=ticket, m=message_id: run_user_message(c, t, m))
                 
             elif event_type == "ARTIFACT_EDIT":
-                try:
-                    p_doc_id = payload.get("id")
-                    p_content = payload.get("content")
-                    if p_doc_id and p_content:
-                        await engine.handle_artifact_edit(p_doc_id, p_content)
-                    else:
-                        print("⚠️ Invalid ARTIFACT_EDIT payload structure")
-                except Exception as e:
-                    print(f"Error handling edit: {e}")
+                p_doc_id = fields.get("id")
+                p_content = fields.get("content")
+                if p_doc_id and p_content:
+                    mailbox.post(Lane.FAST, event_type, lambda d=p_doc_id, c=p_content: run_artifact_edit(d, c))
+                else:
+                    print("⚠️ Invalid ARTIFACT_EDIT payload structure")
 
             elif event_type == "ARTIFACT_VISUAL_SYNC":
+                p_id = fields.get("id")
+                p_fmt = fields.get("format", "svg")
+                p_digest = fields.get("digest")
+                try:
+                    # Binary frames may carry raw SVG / PNG bytes
+                    p_visual = normalize_visual_data(fields.get("visual_data"), p_fmt)
+                except ValueError:
+                    # Covers UnicodeDecodeError and non-text visual data
+                    print("❌ Client sent undecodable visual data. Ignoring.")
+                    continue
+
+                if p_id and p_visual:
+                    mailbox.post(
+                        Lane.FAST, event_type,
+                        lambda d=p_id, v=p_visual, f=p_fmt, h=p_digest: run_visual_sync(d, v, f, h)
+                    )
+                else:
+                    print("⚠️ Invalid ARTIFACT_VISUAL_SYNC payload")
+
+            elif event_type == "ARTIFACT_VISUAL_OFFER":
+                # Hash-first: acks go to this subscriber only, the blob is uploaded on demand
+                p_id = fields.get("id")
+                p_digest = fields.get("digest")
+                if p_id and p_digest:
+                    mailbox.post(
+                        Lane.FAST, event_type,
+                        lambda d=p_id, h=p_digest: engine.handle_visual_offer(d, h, emit=outbound.send)
+                    )
+                else:
+                    print("⚠️ Invalid ARTIFACT_VISUAL_OFFER payload")
+
+            elif event_type == "ARTIFACT_VISUAL_CHUNK":
+                p = fields
+                if p.get("id") and p.get("digest") and p.get("data") is not None:
+                    mailbox.post(
+                        Lane.FAST, event_type,
+                        lambda p=p: engine.handle_visual_chunk(
+                            p["id"], p["digest"], int(p.get("index", 0)), int(p.get("total", 1)), p["data"],
+                            emit=outbound.send
+                        )
+                    )
+                else:
+                    print("⚠️ Invalid ARTIFACT_VISUAL_CHUNK payload")
+
+            elif event_type == "PATCH_ACK":
+                # Transport-level bookkeeping: handled inline, never queued behind a lane
+                if not delta_encoder or not isinstance(payload, dict):
+                    continue
                 try:
-                    p_id = payload.get("id")
-                    p_visual = payload.get("visual_data")
-                    p_fmt = payload.get("format", "svg")
-                    
-                    if p_id and p_visual:
-                        # Fire and forget (don't await strictly if performance matters, 
-                        # but awaiting ensures state consistency)
-                        await engine.handle_visual_sync(p_id, p_visual, p_fmt)
-                    else:
-                        print("⚠️ Invalid ARTIFACT_VISUAL_SYNC payload")
-                except Exception as e:
-                    print(f"Error handling visual sync: {e}")
+                    version = int(payload.get("version", 0))
+                except (TypeError, ValueError):
+                    print("⚠️ Invalid PATCH_ACK version. Ignoring.")
+                    continue
+                delta_encoder.acknowledge(
+                    payload.get("target"),
+                    payload.get("id"),
+                    version,
+                    payload.get("status", "applied")
+                )
 
             elif event_type == "PROJECT_PUBLISH":
-                target = payload.get("target", "confluence")
-                await engine.handle_publish(target)
+                target = fields.get("target", "confluence")
+                mailbox.post(Lane.FAST, event_type, lambda t=target: engine.request_publish(t))
 
     except WebSocketDisconnect:
         print(f"Client {client_id} disconnected from {current_session_id}")
     except Exception as e:
-        print(f"Critical Error in Socket Loop: {e}")
\ No newline at end of file
+        print(f"Critical Error in Socket Loop: {e}")
+    finally:
+        await session_hub.leave(channel, outbound)
+        await outbound.close()
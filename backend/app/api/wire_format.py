@@ -0,0 +1,107 @@
+# app/api/wire_format.py
+import base64
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger("WireFormat")
+
+# Optional dependency: MessagePack framing is only offered when installed.
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - depends on environment
+    msgpack = None
+
+JSON_SUBPROTOCOL = "ba.json.v1"
+MSGPACK_SUBPROTOCOL = "ba.msgpack.v1"
+
+class WireCodec(ABC):
+    """Framing of one WebSocket connection, negotiated by subprotocol. Outbound frames are JSON text."""
+    name: str
+    subprotocol: str
+
+    @abstractmethod
+    def unpack(self, frame: bytes) -> Dict[str, Any]:
+        """Decodes an inbound binary frame."""
+        pass
+
+class BinaryCodec(WireCodec):
+    """A codec that also sends some event types as binary frames."""
+
+    @abstractmethod
+    def is_binary(self, event_type: str) -> bool:
+        pass
+
+    @abstractmethod
+    def pack(self, message: Dict[str, Any]) -> bytes:
+        pass
+
+class JsonCodec(WireCodec):
+    """Default framing: UTF-8 JSON text frames for everything."""
+    name = "json"
+    subprotocol = JSON_SUBPROTOCOL
+
+    def unpack(self, frame: bytes) -> Dict[str, Any]:
+        return json.loads(frame)
+
+class MsgpackCodec(BinaryCodec):
+    """
+    Hybrid framing: large payloads (artifact contents, patches, history) travel as
+    binary MessagePack frames; small control messages stay JSON text.
+    Inbound, clients may send ARTIFACT_VISUAL_SYNC as a binary frame with raw SVG/PNG bytes
+    in 'visual_data' (no base64 / JSON string escaping).
+    """
+    name = "msgpack"
+    subprotocol = MSGPACK_SUBPROTOCOL
+
+    BINARY_TYPES = {"ARTIFACT_OPEN", "ARTIFACT_UPDATE", "JSON_PATCH", "CHAT_HISTORY"}
+
+    def is_binary(self, event_type: str) -> bool:
+        return event_type in self.BINARY_TYPES
+
+    def pack(self, message: Dict[str, Any]) -> bytes:
+        return msgpack.packb(message, use_bin_type=True)
+
+    def unpack(self, frame: bytes) -> Dict[str, Any]:
+        return msgpack.unpackb(frame, raw=False)
+
+def negotiate(offered: List[str]) -> Tuple[WireCodec, Optional[str]]:
+    """
+    Picks the codec from the client's Sec-WebSocket-Protocol offer (in client preference order).
+    Returns (codec, subprotocol to echo in accept). Clients that offer nothing get plain JSON.
+    """
+    for proto in offered:
+        if proto == MSGPACK_SUBPROTOCOL:
+            if msgpack is None:
+                logger.warning("⚠️ Client offered MessagePack but 'msgpack' is not installed. Skipping.")
+                continue
+            return MsgpackCodec(), proto
+        if proto == JSON_SUBPROTOCOL:
+            return JsonCodec(), proto
+    return JsonCodec(), None
+
+def decode_frame(codec: WireCodec, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Decodes a raw ASGI 'websocket.receive' message (text or bytes) into a dict.
+    Returns None for frames that carry nothing.
+    """
+    if message.get("text") is not None:
+        return json.loads(message["text"])
+    if message.get("bytes") is not None:
+        return codec.unpack(message["bytes"])
+    return None
+
+def normalize_visual_data(visual: Any, fmt: str) -> Optional[str]:
+    """
+    Binary visual payloads (MessagePack) are stored as text: SVG as UTF-8, PNG as base64.
+    Raises ValueError (incl. UnicodeDecodeError) for bytes that are not UTF-8 and for non-text data.
+    """
+    if isinstance(visual, (bytes, bytearray)):
+        if fmt == "png":
+            return base64.b64encode(visual).decode("ascii")
+        return bytes(visual).decode("utf-8")
+    if visual is not None and not isinstance(visual, str):
+        raise ValueError(f"Unsupported visual data type: {type(visual).__name__}")
+    return visual
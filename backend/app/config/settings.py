@@ -1,5 +1,6 @@
 # app/config/settings.py
 import os
+import json
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -11,8 +12,20 @@ class AgentConfig:
     SMART_MODEL = os.getenv("OPENAI_SMART_MODEL", "gpt-5-mini")
     FAST_MODEL = os.getenv("OPENAI_FAST_MODEL", "gpt-5-mini")
     SUPER_FAST_MODEL = 'gpt-5-nano'
+    GROQ_MODEL = os.getenv("GROQ_MODEL", "openai/gpt-oss-120b")
     MAX_AGENT_TURNS: int = 5
 
+    # Conversation window (see HistoryWindow): token budget for summary + verbatim history, per model
+    HISTORY_TOKEN_BUDGETS = json.loads(os.getenv("HISTORY_TOKEN_BUDGETS", '{"gpt-5-mini": 24000, "gpt-5-nano": 12000}'))
+    DEFAULT_HISTORY_TOKEN_BUDGET = int(os.getenv("DEFAULT_HISTORY_TOKEN_BUDGET", "16000"))
+    HISTORY_KEEP_EXCHANGES = int(os.getenv("HISTORY_KEEP_EXCHANGES", "4"))
+    HISTORY_SUMMARY_MAX_WORDS = int(os.getenv("HISTORY_SUMMARY_MAX_WORDS", "350"))
+
+    # Incremental regeneration (stories / use cases): only items tied to changed actors & steps
+    # are sent to the LLM; above this share of affected items a full regeneration is cheaper
+    INCREMENTAL_ARTIFACTS = os.getenv("INCREMENTAL_ARTIFACTS", "true").lower() in ("1", "true", "yes")
+    INCREMENTAL_MAX_AFFECTED_SHARE = float(os.getenv("INCREMENTAL_MAX_AFFECTED_SHARE", "0.5"))
+
 class AppConfig:
     
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -25,4 +38,87 @@ class AppConfig:
     CONFLUENCE_USER_NAME = os.getenv("CONFLUENCE_USER_NAME")
     CONFLUENCE_API_TOKEN = os.getenv("CONFLUENCE_API_TOKEN")
 
+    # Shared HTTP transport (per LLM provider, process-wide)
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+    HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+
+    # Visual sync (hash-first uploads, see VisualSyncService)
+    VISUAL_MAX_BYTES = int(os.getenv("VISUAL_MAX_BYTES", str(5 * 1024 * 1024)))
+    VISUAL_CHUNK_SIZE = int(os.getenv("VISUAL_CHUNK_SIZE", str(64 * 1024)))
+    VISUAL_UPLOAD_TTL = float(os.getenv("VISUAL_UPLOAD_TTL", "60"))
+    # Total size of the in-memory blob store (LRU, see MemoryBlobStore)
+    VISUAL_STORE_MAX_BYTES = int(os.getenv("VISUAL_STORE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+    # Reconnect replay (SessionEventLog): events / serialized bytes kept per session,
+    # disconnected sessions kept per process and the total bytes of their logs
+    EVENT_LOG_CAPACITY = int(os.getenv("EVENT_LOG_CAPACITY", "2048"))
+    EVENT_LOG_MAX_BYTES = int(os.getenv("EVENT_LOG_MAX_BYTES", str(4 * 1024 * 1024)))
+    EVENT_LOG_IDLE_SESSIONS = int(os.getenv("EVENT_LOG_IDLE_SESSIONS", "1000"))
+    EVENT_LOG_IDLE_BYTES = int(os.getenv("EVENT_LOG_IDLE_BYTES", str(256 * 1024 * 1024)))
+
+    # Session event bus: "memory" (single worker) or "socket" (local broker, multi-worker)
+    EVENT_BUS = os.getenv("EVENT_BUS", "memory")
+    EVENT_BUS_HOST = os.getenv("EVENT_BUS_HOST", "127.0.0.1")
+    EVENT_BUS_PORT = int(os.getenv("EVENT_BUS_PORT", "7400"))
+
+    # LLM work scheduler: max concurrent calls per pool ("provider/model" or "provider", see WorkScheduler)
+    LLM_POOL_LIMITS = json.loads(os.getenv("LLM_POOL_LIMITS", '{"openai": 32, "groq": 8}'))
+    LLM_POOL_DEFAULT_LIMIT = int(os.getenv("LLM_POOL_DEFAULT_LIMIT", "8"))
+
+    # Client-side rate limiting (see RateLimiter): optional RPM / TPM per "provider" or "provider/model",
+    # e.g. '{"groq": {"rpm": 1000, "tpm": 250000}}'. 429s always trigger a shared Retry-After cooldown
+    # and an AIMD decrease of the pool limit above (which acts as the ceiling).
+    LLM_RATE_LIMITS = json.loads(os.getenv("LLM_RATE_LIMITS", "{}"))
+    LLM_RATE_LIMIT_ATTEMPTS = int(os.getenv("LLM_RATE_LIMIT_ATTEMPTS", "5"))
+    LLM_AIMD_INCREASE = float(os.getenv("LLM_AIMD_INCREASE", "1.0"))
+    LLM_AIMD_DECREASE = float(os.getenv("LLM_AIMD_DECREASE", "0.5"))
+    # Output tokens charged to the TPM bucket up front (the prompt is counted)
+    LLM_OUTPUT_TOKEN_ESTIMATE = int(os.getenv("LLM_OUTPUT_TOKEN_ESTIMATE", "1024"))
+
+    # Structured-completion cache (see CompletionCache): byte-identical requests are answered locally.
+    # COMPLETION_CACHE_DB = SQLite file for a durable tier shared across restarts / workers (empty = memory only)
+    COMPLETION_CACHE_ENABLED = os.getenv("COMPLETION_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    COMPLETION_CACHE_SIZE = int(os.getenv("COMPLETION_CACHE_SIZE", "512"))
+    COMPLETION_CACHE_TTL = float(os.getenv("COMPLETION_CACHE_TTL", str(6 * 3600)))
+    COMPLETION_CACHE_DB = os.getenv("COMPLETION_CACHE_DB", "")
+
+    # Record / replay of provider exchanges for offline benchmarking (see CassetteLLMClient).
+    # LLM_CASSETTE_MODE: "" (off), "record", "replay" (no network, a miss is an error) or "auto".
+    # LLM_CASSETTE_LATENCY: injected latency of replays per task type (llm_agent name) or "default",
+    # e.g. '{"default": {"distribution": "lognormal", "median": 2.5, "sigma": 0.6}, "manager": {"distribution": "recorded"}}'
+    LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", "")
+    LLM_CASSETTE_PATH = os.getenv("LLM_CASSETTE_PATH", os.path.join(BASE_DIR, "data", "cassettes", "llm.jsonl"))
+    LLM_CASSETTE_LATENCY = json.loads(os.getenv("LLM_CASSETTE_LATENCY", '{"default": {"distribution": "recorded"}}'))
+    LLM_CASSETTE_SEED = int(os.getenv("LLM_CASSETTE_SEED", "0"))
+
+    # LLM gateway routes per task type (the llm_agent name), see LLMGateway.
+    # providers = preference order (fallbacks), timeout = seconds an attempt may run
+    # (after its pool slot / rate-limit wait; 0 = none),
+    # hedge = race the next provider once the primary is slower than its p95 (opt-in)
+    LLM_ROUTES = json.loads(os.getenv("LLM_ROUTES") or json.dumps({
+        "manager": {"providers": ["openai", "groq"], "timeout": 90},
+        "history_summary": {"providers": ["openai", "groq"], "timeout": 60},
+    }))
+    # Everything else (artifact generators, checker): full artifacts stream for minutes
+    LLM_DEFAULT_ROUTE = json.loads(os.getenv("LLM_DEFAULT_ROUTE") or json.dumps(
+        {"providers": ["groq", "openai"], "timeout": 300}
+    ))
+
+    # Task supervisor: what happens to a session's turns / generators when its last socket leaves
+    # ("detach" = keep running, results are replayed on reconnect; "cancel"), see TaskSupervisor
+    TASK_DISCONNECT_POLICY = json.loads(os.getenv("TASK_DISCONNECT_POLICY", '{"turn": "detach", "artifact": "detach", "publish": "detach"}'))
+    TASK_DISCONNECT_DEFAULT = os.getenv("TASK_DISCONNECT_DEFAULT", "detach")
+    TASK_DETACH_TIMEOUT = float(os.getenv("TASK_DETACH_TIMEOUT", "300"))
+    # Graceful shutdown (SIGTERM -> lifespan shutdown): max seconds to let live tasks finish
+    SHUTDOWN_DRAIN_SECONDS = float(os.getenv("SHUTDOWN_DRAIN_SECONDS", "20"))
+
+    # Speculative generation: ledger changes start the affected artifact generators
+    # immediately (without waiting for the LLM to call 'trigger_visualization')
+    SPECULATIVE_ARTIFACTS = os.getenv("SPECULATIVE_ARTIFACTS", "false").lower() in ("1", "true", "yes")
+
+    # Progressive rendering: stories / use cases / workbook categories are streamed to the
+    # artifact tab as they complete, at most one ARTIFACT_UPDATE per interval (0 = off)
+    ARTIFACT_PROGRESS_INTERVAL = float(os.getenv("ARTIFACT_PROGRESS_INTERVAL", "0.5"))
+
     LLM = AgentConfig
\ No newline at end of file
@@ -0,0 +1,29 @@
+# app/core/interfaces/blob_store.py
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Optional
+
+def blob_digest(data: bytes) -> str:
+    """The content address used by every IBlobStore (SHA-256, hex)."""
+    return hashlib.sha256(data).hexdigest()
+
+class IBlobStore(ABC):
+    """
+    Interface for content-addressed blob storage (rendered visuals).
+    Blobs are keyed by their SHA-256 hex digest, so identical content is stored once.
+    """
+
+    @abstractmethod
+    async def has(self, digest: str) -> bool:
+        """Returns True if a blob with this digest is stored."""
+        pass
+
+    @abstractmethod
+    async def get(self, digest: str) -> Optional[bytes]:
+        """Retrieve a blob by digest. Returns None if not found."""
+        pass
+
+    @abstractmethod
+    async def put(self, data: bytes) -> str:
+        """Stores the blob (no-op if already present) and returns its digest."""
+        pass
@@ -0,0 +1,24 @@
+# app/core/interfaces/cassette_store.py
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+
+class ICassetteStore(ABC):
+    """
+    Interface for the storage of recorded LLM exchanges (see CassetteLLMClient).
+    A cassette is an append-only sequence of JSON records; each carries the
+    canonical request hash ('key') it answers.
+    """
+
+    @abstractmethod
+    def load(self) -> List[Dict[str, Any]]:
+        """Every record of the cassette, in recording order (called once, at startup)."""
+        pass
+
+    @abstractmethod
+    async def append(self, record: Dict[str, Any]) -> None:
+        """Adds one recorded exchange."""
+        pass
+
+    async def close(self) -> None:
+        """Releases the underlying storage (called on application shutdown)."""
+        pass
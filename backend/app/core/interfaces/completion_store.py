@@ -0,0 +1,24 @@
+# app/core/interfaces/completion_store.py
+from abc import ABC, abstractmethod
+from typing import Optional
+
+class ICompletionStore(ABC):
+    """
+    Interface for the durable tier of the structured-completion cache.
+    Values are serialized results (JSON), keyed by the canonical request hash
+    (see CompletionCache.key). Entries expire 'ttl' seconds after they were written.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """Returns the stored value, or None if missing or expired."""
+        pass
+
+    @abstractmethod
+    async def put(self, key: str, value: str, ttl: float) -> None:
+        """Stores (or replaces) the value for 'ttl' seconds."""
+        pass
+
+    async def close(self) -> None:
+        """Releases the underlying storage (called on application shutdown)."""
+        pass
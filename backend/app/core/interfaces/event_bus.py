@@ -0,0 +1,35 @@
+# app/core/interfaces/event_bus.py
+from abc import ABC, abstractmethod
+from typing import Any, Callable
+
+# Handler signature: (event_type, payload) -> None. Must not block (enqueue only).
+EventHandler = Callable[[str, Any], None]
+
+class IEventBus(ABC):
+    """
+    Interface for session event delivery across workers.
+    Orchestrators publish to a session; every worker holding a socket
+    (or a retained channel) for that session has subscribed and receives it.
+    Per-session ordering is preserved for a single publisher.
+    """
+
+    async def start(self) -> None:
+        """Opens connections (no-op for in-process implementations)."""
+        pass
+
+    async def close(self) -> None:
+        """Releases connections."""
+        pass
+
+    @abstractmethod
+    async def publish(self, session_id: str, event_type: str, payload: Any) -> None:
+        """Delivers an event to every subscriber of the session (including this worker)."""
+        pass
+
+    @abstractmethod
+    def subscribe(self, session_id: str, handler: EventHandler) -> None:
+        pass
+
+    @abstractmethod
+    def unsubscribe(self, session_id: str, handler: EventHandler) -> None:
+        pass
@@ -1,6 +1,6 @@
 # app/core/interfaces/repository.py
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Set
 from app.domain.models.state import SessionState
 
 class ISessionRepository(ABC):
@@ -19,6 +19,13 @@ class ISessionRepository(ABC):
         """Persist the session state."""
         pass
     
+    async def save_partial(self, state: SessionState, sections: Set[str]) -> None:
+        """
+        Persist only the dirty sections (see StateManager unit of work).
+        Default: full save. Durable repositories can override to write less.
+        """
+        await self.save(state)
+
     @abstractmethod
     async def delete(self, session_id: str) -> None:
         """Remove a session (useful for cleanup)."""
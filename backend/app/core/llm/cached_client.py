@@ -0,0 +1,110 @@
+# app/core/llm/cached_client.py
+from typing import List, Dict, Type, TypeVar, Optional, Any, AsyncIterator, Awaitable, Callable
+from pydantic import BaseModel, ValidationError
+
+from app.core.llm.interface import ILLMClient
+from app.core.llm.latency import mark_call_cached
+from app.core.llm.types import LLMResponse, LLMStreamChunk
+from app.core.llm.usage import current_agent
+from app.core.services.completion_cache import CompletionCache, cache_bypassed
+from app.utils.logger import setup_logger
+
+logger = setup_logger("LLM_Cache")
+
+T = TypeVar('T', bound=BaseModel)
+
+class CachedLLMClient(ILLMClient):
+    """
+    Decorator: structured completions are served from the CompletionCache when the
+    exact same request (provider, model, temperature, messages, schema) was answered before.
+    Sits outside ScheduledLLMClient, so a hit never waits for a pool slot.
+    Streamed structured completions share the same entries (a hit returns at once, without progress).
+    Hits are flagged to the gateway's call clock, so they stay out of its latency histograms.
+    Callers that need a fresh answer (an explicit regenerate) use bypass_completion_cache.
+    Text / tool-calling / streaming chat calls pass through (conversational, rarely identical).
+    """
+
+    def __init__(self, inner: ILLMClient, cache: CompletionCache, provider: str):
+        self.inner = inner
+        self.cache = cache
+        self.provider = provider
+
+    @property
+    def default_model(self) -> str:
+        return self.inner.default_model
+
+    async def get_structured_completion(
+        self,
+        messages: List[Dict[str, str]],
+        response_model: Type[T],
+        temperature: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> T:
+        return await self._cached(
+            messages, response_model, temperature, model,
+            lambda: self.inner.get_structured_completion(messages, response_model, temperature, model)
+        )
+
+    async def stream_structured_completion(
+        self,
+        messages: List[Dict[str, str]],
+        response_model: Type[T],
+        on_text: Callable[[str, int], None],
+        temperature: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> T:
+        return await self._cached(
+            messages, response_model, temperature, model,
+            lambda: self.inner.stream_structured_completion(messages, response_model, on_text, temperature, model)
+        )
+
+    async def _cached(
+        self,
+        messages: List[Dict[str, str]],
+        response_model: Type[T],
+        temperature: Optional[float],
+        model: Optional[str],
+        call: Callable[[], Awaitable[T]]
+    ) -> T:
+        key = self.cache.key(self.provider, model or self.inner.default_model, temperature, messages, response_model)
+
+        if cache_bypassed():
+            self.cache.counters.bypassed += 1
+        else:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                try:
+                    result = response_model.model_validate_json(cached)
+                    mark_call_cached()
+                    logger.info(f"🎯 Cache hit [{current_agent()}] {self.provider} {response_model.__name__}")
+                    return result
+                except ValidationError:
+                    # Schema-compatible hash but unreadable payload: treat as a miss
+                    logger.warning(f"⚠️ Discarding unreadable cached {response_model.__name__}")
+
+        result = await call()
+        await self.cache.put(key, result.model_dump_json())
+        return result
+
+    async def get_text_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> str:
+        return await self.inner.get_text_completion(messages, temperature, model)
+
+    async def chat_with_tools(
+        self,
+        messages: List[Dict[str, str]],
+        tools_schema: List[Dict[str, Any]],
+    ) -> LLMResponse:
+        return await self.inner.chat_with_tools(messages, tools_schema)
+
+    async def stream_chat_with_tools(
+        self,
+        messages: List[Dict[str, str]],
+        tools_schema: List[Dict[str, Any]],
+    ) -> AsyncIterator[LLMStreamChunk]:
+        async for chunk in self.inner.stream_chat_with_tools(messages, tools_schema):
+            yield chunk
@@ -0,0 +1,380 @@
+# app/core/llm/cassette.py
+import asyncio
+import math
+import random
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
+from app.core.interfaces.cassette_store import ICassetteStore
+from app.core.llm.exceptions import CassetteMissError
+from app.core.llm.interface import ILLMClient
+from app.core.llm.types import LLMResponse, LLMStreamChunk, ToolCallRequest
+from app.core.llm.usage import current_agent
+from app.core.services.fingerprint import content_hash, digest
+from app.utils.logger import setup_logger
+
+logger = setup_logger("LLM_Cassette")
+
+T = TypeVar('T', bound=BaseModel)
+
+# Replayed streams: share of the latency spent before the first chunk (when none was recorded)
+FIRST_TOKEN_SHARE = 0.3
+# Replayed streams: characters per chunk when the recording has no chunks (one-shot call)
+REPLAY_CHUNK_CHARS = 24
+
+class CassetteMode(str, Enum):
+    RECORD = "record"  # every call goes to the provider and is appended to the cassette
+    REPLAY = "replay"  # every call is answered from the cassette; a miss is an error (offline)
+    AUTO = "auto"      # replay what was recorded, record the rest
+
+DISTRIBUTIONS = ("recorded", "none", "fixed", "uniform", "normal", "lognormal")
+
+@dataclass
+class LatencyProfile:
+    """
+    Injected latency of replayed calls (seconds), per task type (the llm_agent name).
+    recorded:  what the provider took while recording
+    fixed:     'value'
+    uniform:   between 'low' and 'high'
+    normal:    'mean' +- 'stddev' (clipped at 0)
+    lognormal: 'median' and 'sigma' (long tail, the usual shape of LLM latency)
+    none:      no delay
+    The sample is multiplied by 'scale' and capped at 'cap' (if set).
+    """
+    distribution: str = "recorded"
+    scale: float = 1.0
+    cap: Optional[float] = None
+    value: float = 0.0
+    low: float = 0.0
+    high: float = 0.0
+    mean: float = 0.0
+    stddev: float = 0.0
+    median: float = 1.0
+    sigma: float = 0.5
+
+    def __post_init__(self):
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{self.distribution}' (one of {DISTRIBUTIONS})")
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "LatencyProfile":
+        return cls(**cfg)
+
+    def sample(self, rng: random.Random, recorded: float) -> float:
+        if self.distribution == "none":
+            return 0.0
+        if self.distribution == "recorded":
+            seconds = recorded
+        elif self.distribution == "fixed":
+            seconds = self.value
+        elif self.distribution == "uniform":
+            seconds = rng.uniform(self.low, self.high)
+        elif self.distribution == "normal":
+            seconds = max(0.0, rng.gauss(self.mean, self.stddev))
+        else:
+            seconds = rng.lognormvariate(math.log(self.median), self.sigma)
+
+        seconds *= self.scale
+        return min(seconds, self.cap) if self.cap is not None else seconds
+
+@dataclass
+class _CassetteCounters:
+    recorded: int = 0
+    replayed: int = 0
+    misses: int = 0
+    store_errors: int = 0
+
+class Cassette:
+    """
+    Recorded LLM exchanges of every provider, indexed by canonical request hash.
+    1. A request can have several takes (recorded repeatedly); replays cycle through them in order.
+    2. Latency is drawn from the task type's LatencyProfile with a generator seeded by
+       (seed, request hash, replay number), so a run replays the same delays regardless of
+       how concurrent calls interleave.
+    """
+
+    def __init__(
+        self,
+        store: ICassetteStore,
+        mode: CassetteMode,
+        latency: Dict[str, Dict[str, Any]],
+        seed: int = 0
+    ):
+        self.store = store
+        self.mode = mode
+        self.seed = seed
+        self.profiles = {name: LatencyProfile.from_config(cfg) for name, cfg in latency.items()}
+        self.default_profile = self.profiles.pop("default", LatencyProfile())
+
+        self._takes: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for record in store.load():
+            self._takes[record["key"]].append(record)
+        self._plays: Dict[str, int] = defaultdict(int)
+        self.counters = _CassetteCounters()
+
+    @staticmethod
+    def key(provider: str, kind: str, model: str, temperature: Optional[float], messages: List[Dict[str, Any]], spec: Any = None) -> str:
+        """kind: 'structured' (spec = JSON schema), 'text', or 'tools' (spec = tool schemas)."""
+        return digest(provider, kind, model, repr(temperature), content_hash(messages), content_hash(spec))
+
+    def play(self, key: str) -> Optional[Dict[str, Any]]:
+        takes = self._takes.get(key)
+        if not takes:
+            self.counters.misses += 1
+            return None
+        n = self._plays[key]
+        self._plays[key] += 1
+        self.counters.replayed += 1
+        record = takes[n % len(takes)]
+        return {**record, "delay": self._delay(key, n, record)}
+
+    def _delay(self, key: str, n: int, record: Dict[str, Any]) -> float:
+        profile = self.profiles.get(current_agent(), self.default_profile)
+        rng = random.Random(f"{self.seed}:{key}:{n}")
+        return profile.sample(rng, record.get("latency", 0.0))
+
+    async def record(self, record: Dict[str, Any]):
+        self._takes[record["key"]].append(record)
+        self.counters.recorded += 1
+        try:
+            await self.store.append(record)
+        except Exception as e:
+            self.counters.store_errors += 1
+            logger.warning(f"⚠️ Cassette write failed: {e}")
+
+    async def close(self):
+        await self.store.close()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode.value,
+            "requests": len(self._takes),
+            "takes": sum(len(takes) for takes in self._takes.values()),
+            **vars(self.counters),
+        }
+
+class CassetteLLMClient(ILLMClient):
+    """
+    Stand-in for one provider client: records its exchanges to a Cassette, or replays
+    them by request hash with injected latency (no network, no API key).
+    Sits innermost (inside the rate limiter and scheduler), so everything above it
+    (gateway, cache, pools, orchestrator, agents) runs exactly as in production.
+    Replayed streams are cut into chunks and spread over the sampled latency.
+    """
+
+    def __init__(self, inner: Optional[ILLMClient], cassette: Cassette, provider: str, default_model: str):
+        if inner is None and cassette.mode != CassetteMode.REPLAY:
+            raise ValueError(f"Cassette mode '{cassette.mode.value}' needs the real {provider} client")
+        self.inner = inner
+        self.cassette = cassette
+        self.provider = provider
+        self._default_model = default_model
+        self._schemas: Dict[Type[BaseModel], Any] = {}
+
+    @property
+    def default_model(self) -> str:
+        return self.inner.default_model if self.inner else self._default_model
+
+    # --- ILLMClient ---
+
+    async def get_structured_completion(
+        self,
+        messages: List[Dict[str, str]],
+        response_model: Type[T],
+        temperature: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> T:
+        key = self._key("structured", model, temperature, messages, self._schema(response_model))
+        take = self._play(key)
+        if take:
+            await asyncio.sleep(take["delay"])
+            return response_model.model_validate_json(take["result"])
+
+        started = time.monotonic()
+        result = await self.inner.get_structured_completion(messages, response_model, temperature, model)
+        await self._record(key, "structured", model, started, result.model_dump_json())
+        return result
+
+    async def stream_structured_completion(
+        self,
+        messages: List[Dict[str, str]],
+        response_model: Type[T],
+        on_text: Callable[[str, int], None],
+        temperature: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> T:
+        # Same takes as the one-shot call: the answer does not depend on how it is delivered
+        key = self._key("structured", model, temperature, messages, self._schema(response_model))
+        take = self._play(key)
+        if take:
+            received = 0
+            async for chunk in self._replay_chunks(take, _split(take["result"])):
+                on_text(chunk, received)
+                received += len(chunk)
+            return response_model.model_validate_json(take["result"])
+
+        started = time.monotonic()
+        first: List[float] = []
+
+        def observe(delta: str, offset: int):
+            if not first:
+                first.append(time.monotonic() - started)
+            on_text(delta, offset)
+
+        result = await self.inner.stream_structured_completion(messages, response_model, observe, temperature, model)
+        await self._record(key, "structured", model, started, result.model_dump_json(), ttft=first[0] if first else None)
+        return result
+
+    async def get_text_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> str:
+        key = self._key("text", model, temperature, messages)
+        take = self._play(key)
+        if take:
+            await asyncio.sleep(take["delay"])
+            return take["result"]
+
+        started = time.monotonic()
+        result = await self.inner.get_text_completion(messages, temperature, model)
+        await self._record(key, "text", model, started, result)
+        return result
+
+    async def chat_with_tools(
+        self,
+        messages: List[Dict[str, str]],
+        tools_schema: List[Dict[str, Any]],
+    ) -> LLMResponse:
+        key = self._key("tools", None, None, messages, tools_schema)
+        take = self._play(key)
+        if take:
+            await asyncio.sleep(take["delay"])
+            return _response_from_record(take["result"])
+
+        started = time.monotonic()
+        response = await self.inner.chat_with_tools(messages, tools_schema)
+        await self._record(key, "tools", None, started, _response_to_record(response))
+        return response
+
+    async def stream_chat_with_tools(
+        self,
+        messages: List[Dict[str, str]],
+        tools_schema: List[Dict[str, Any]],
+    ) -> AsyncIterator[LLMStreamChunk]:
+        # Shares the takes of chat_with_tools (a one-shot recording replays as a chunked stream)
+        key = self._key("tools", None, None, messages, tools_schema)
+        take = self._play(key)
+        if take:
+            chunks = take.get("chunks") or _split(take["result"].get("content") or "")
+            async for chunk in self._replay_chunks(take, chunks):
+                yield LLMStreamChunk(content_delta=chunk)
+            yield LLMStreamChunk(response=_response_from_record(take["result"]))
+            return
+
+        started = time.monotonic()
+        ttft: Optional[float] = None
+        chunks: List[str] = []
+        async for chunk in self.inner.stream_chat_with_tools(messages, tools_schema):
+            if chunk.content_delta:
+                if ttft is None:
+                    ttft = time.monotonic() - started
+                chunks.append(chunk.content_delta)
+            if chunk.response is not None:
+                await self._record(
+                    key, "tools", None, started, _response_to_record(chunk.response), ttft=ttft, chunks=chunks
+                )
+            yield chunk
+
+    # --- Internals ---
+
+    def _key(
+        self,
+        kind: str,
+        model: Optional[str],
+        temperature: Optional[float],
+        messages: List[Dict[str, Any]],
+        spec: Any = None
+    ) -> str:
+        return Cassette.key(self.provider, kind, model or self.default_model, temperature, messages, spec)
+
+    def _schema(self, response_model: Type[BaseModel]) -> Any:
+        schema = self._schemas.get(response_model)
+        if schema is None:
+            schema = self._schemas[response_model] = response_model.model_json_schema()
+        return schema
+
+    def _play(self, key: str) -> Optional[Dict[str, Any]]:
+        """The take to replay, or None when the provider should be called (and recorded)."""
+        if self.cassette.mode == CassetteMode.RECORD:
+            return None
+        take = self.cassette.play(key)
+        if take is None and self.cassette.mode == CassetteMode.REPLAY:
+            raise CassetteMissError(self.provider, current_agent(), key)
+        return take
+
+    async def _record(
+        self,
+        key: str,
+        kind: str,
+        model: Optional[str],
+        started: float,
+        result: Any,
+        ttft: Optional[float] = None,
+        chunks: Optional[List[str]] = None
+    ):
+        record = {
+            "key": key,
+            "provider": self.provider,
+            "kind": kind,
+            "model": model or self.default_model,
+            "agent": current_agent(),
+            "latency": round(time.monotonic() - started, 3),
+            "result": result,
+        }
+        if ttft is not None:
+            record["ttft"] = round(ttft, 3)
+        if chunks:
+            record["chunks"] = chunks
+        await self.cassette.record(record)
+
+    async def _replay_chunks(self, take: Dict[str, Any], chunks: List[str]) -> AsyncIterator[str]:
+        """Yields 'chunks' over the take's delay: first chunk after the recorded TTFT share, the rest evenly."""
+        delay = take["delay"]
+        recorded = take.get("latency") or 0.0
+        share = take["ttft"] / recorded if take.get("ttft") is not None and recorded > 0 else FIRST_TOKEN_SHARE
+
+        if not chunks:
+            await asyncio.sleep(delay)
+            return
+
+        await asyncio.sleep(delay * share)
+        gap = delay * (1 - share) / max(1, len(chunks) - 1)
+        for i, chunk in enumerate(chunks):
+            if i:
+                await asyncio.sleep(gap)
+            yield chunk
+
+def _split(text: str) -> List[str]:
+    return [text[i:i + REPLAY_CHUNK_CHARS] for i in range(0, len(text), REPLAY_CHUNK_CHARS)]
+
+def _response_to_record(response: LLMResponse) -> Dict[str, Any]:
+    # Provider usage / raw objects are not replayable (and not needed downstream)
+    return {
+        "content": response.content,
+        "role": response.role,
+        "tool_calls": [asdict(tc) for tc in response.tool_calls],
+    }
+
+def _response_from_record(data: Dict[str, Any]) -> LLMResponse:
+    return LLMResponse(
+        content=data.get("content"),
+        role=data.get("role", "assistant"),
+        tool_calls=[ToolCallRequest(**tc) for tc in data.get("tool_calls", [])],
+    )
@@ -12,4 +12,12 @@ class LLMRefusalError(LLMError):
 
 class LLMParsingError(LLMError):
     """Raised when the structure cannot be parsed (should be rare with strict=True)."""
-    pass
\ No newline at end of file
+    pass
+
+class CassetteMissError(LLMError):
+    """Raised in replay mode when the cassette has no recording of the request."""
+    def __init__(self, provider: str, agent: str, key: str):
+        self.provider = provider
+        self.agent = agent
+        self.key = key
+        super().__init__(f"No recorded {provider} exchange for '{agent}' (request {key[:12]})")
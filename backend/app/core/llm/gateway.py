@@ -0,0 +1,297 @@
+# app/core/llm/gateway.py
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from app.core.llm.interface import ILLMClient
+from app.core.llm.latency import CallClock, LatencyHistogram
+from app.core.llm.types import LLMResponse, LLMStreamChunk
+from app.core.llm.usage import current_agent
+from app.utils.logger import setup_logger
+
+logger = setup_logger("LLM_Gateway")
+
+T = TypeVar('T', bound=BaseModel)
+
+# One provider attempt: (client, model override) -> result
+Attempt = Callable[[ILLMClient, Optional[str]], Awaitable[Any]]
+
+@dataclass
+class LLMRoute:
+    """
+    How one task type (the llm_agent name: 'mermaid', 'manager', 'checker', ...) is served.
+    providers: preference order; later ones are fallbacks (and hedges).
+    timeout:   seconds an attempt may run before failing over (0 = none); pool queueing
+               and rate-limit cooldowns do not count.
+    hedge:     fire the next provider when the first one has been running longer than the
+               route's 'hedge_quantile' latency; the first valid result wins.
+    """
+    name: str
+    providers: List[str]
+    timeout: float = 60.0
+    hedge: bool = False
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 20
+    # Used until the histogram has 'hedge_min_samples' observations
+    hedge_initial_delay: float = 10.0
+
+    @classmethod
+    def from_config(cls, name: str, cfg: Dict[str, Any]) -> "LLMRoute":
+        return cls(name=name, **cfg)
+
+@dataclass
+class _RouteCounters:
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    failovers: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+
+def _consume(task: asyncio.Task):
+    """Retrieves an abandoned attempt's outcome (no 'exception was never retrieved' noise)."""
+    if not task.cancelled():
+        task.exception()
+
+class LLMGateway(ILLMClient):
+    """
+    Single ILLMClient for every agent.
+    1. Routing: the task type is the caller's llm_agent name (see usage.py); unknown
+       names use the default route.
+    2. Failover: an error or a per-attempt timeout moves on to the next provider.
+       A caller's 'model' override only applies to the route's first provider
+       (model names are provider specific); fallbacks use their default model.
+    3. Hedging (non-streaming calls, opt-in per route): once the primary attempt exceeds
+       the route's p95 latency, the next provider is started too and the loser is cancelled.
+    4. Streams fail over only before the first chunk (afterwards the user already sees it).
+       Streamed structured completions fail over at any point (their progress restarts) but never hedge:
+       two attempts would interleave their partial text.
+    Latency histograms are kept per route and provider, and they set the hedge delay.
+    Timeouts, latencies and the hedge delay all run on a CallClock, which starts only once
+    the call got its pool slot and passed the rate limiter; cache hits are not observed.
+    """
+
+    def __init__(
+        self,
+        providers: Dict[str, ILLMClient],
+        routes: Dict[str, Dict[str, Any]],
+        default_route: Dict[str, Any]
+    ):
+        self.providers = providers
+        self.routes = {name: LLMRoute.from_config(name, cfg) for name, cfg in routes.items()}
+        self.default_route = LLMRoute.from_config("default", default_route)
+        for route in [self.default_route, *self.routes.values()]:
+            unknown = [p for p in route.providers if p not in providers]
+            if unknown or not route.providers:
+                raise ValueError(f"LLM route '{route.name}' has unknown providers: {unknown or '[]'}")
+
+        self._latency: Dict[Tuple[str, str], LatencyHistogram] = defaultdict(LatencyHistogram)
+        self._counters: Dict[str, _RouteCounters] = defaultdict(_RouteCounters)
+
+    def route(self, name: Optional[str] = None) -> LLMRoute:
+        return self.routes.get(name or current_agent(), self.default_route)
+
+    @property
+    def default_model(self) -> str:
+        """Primary model of the current task type's route."""
+        return self.providers[self.route().providers[0]].default_model
+
+    # --- ILLMClient ---
+
+    async def get_structured_completion(
+        self,
+        messages: List[Dict[str, str]],
+        response_model: Type[T],
+        temperature: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> T:
+        return await self._call(
+            lambda client, m: client.get_structured_completion(messages, response_model, temperature, m), model
+        )
+
+    async def stream_structured_completion(
+        self,
+        messages: List[Dict[str, str]],
+        response_model: Type[T],
+        on_text: Callable[[str, int], None],
+        temperature: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> T:
+        return await self._call(
+            lambda client, m: client.stream_structured_completion(messages, response_model, on_text, temperature, m),
+            model, hedge=False
+        )
+
+    async def get_text_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> str:
+        return await self._call(lambda client, m: client.get_text_completion(messages, temperature, m), model)
+
+    async def chat_with_tools(
+        self,
+        messages: List[Dict[str, str]],
+        tools_schema: List[Dict[str, Any]],
+    ) -> LLMResponse:
+        return await self._call(lambda client, m: client.chat_with_tools(messages, tools_schema), None)
+
+    async def stream_chat_with_tools(
+        self,
+        messages: List[Dict[str, str]],
+        tools_schema: List[Dict[str, Any]],
+    ) -> AsyncIterator[LLMStreamChunk]:
+        route = self.route()
+        counters = self._counters[route.name]
+        counters.calls += 1
+        last_error: Optional[BaseException] = None
+
+        for i, provider in enumerate(route.providers):
+            if i:
+                counters.failovers += 1
+                logger.warning(f"🔀 [{route.name}] stream failing over to {provider}: {last_error!r}")
+
+            stream = self.providers[provider].stream_chat_with_tools(messages, tools_schema)
+            clock = CallClock(route.timeout)
+            try:
+                # Time to first chunk is what the user waits for
+                async with clock.measure():
+                    first = await anext(stream)
+            except StopAsyncIteration:
+                return
+            except (Exception, asyncio.TimeoutError) as e:
+                await stream.aclose()
+                last_error = self._record_error(route, provider, e)
+                continue
+
+            self._observe(route, provider, clock)
+            try:
+                yield first
+                async for chunk in stream:
+                    yield chunk
+            finally:
+                await stream.aclose()
+            return
+
+        raise last_error
+
+    # --- Routing Core ---
+
+    async def _call(self, attempt: Attempt, model: Optional[str], hedge: bool = True) -> Any:
+        """
+        Runs the attempts of the current route: at most two in flight (primary + hedge),
+        further providers strictly as fallbacks. hedge=False: strictly one at a time.
+        """
+        route = self.route()
+        counters = self._counters[route.name]
+        counters.calls += 1
+
+        queue = list(route.providers)
+        running: Dict[asyncio.Task, str] = {}
+        hedged = False
+        last_error: Optional[BaseException] = None
+        primary_clock = CallClock(route.timeout)
+
+        def start(provider: str, clock: CallClock):
+            m = model if provider == route.providers[0] else None
+            running[asyncio.create_task(self._attempt(route, provider, attempt, m, clock))] = provider
+
+        start(queue.pop(0), primary_clock)
+        try:
+            while running:
+                wait = None
+                if hedge and route.hedge and queue and not hedged:
+                    hedge_delay = self._hedge_delay(route)
+                    # Still queued for a slot: look again after the full delay
+                    wait = max(0.0, hedge_delay - (primary_clock.elapsed() or 0.0))
+                done, _ = await asyncio.wait(running, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    elapsed = primary_clock.elapsed()
+                    if elapsed is None or elapsed < hedge_delay:
+                        continue
+                    # Primary is slower than usual for this route: race the next provider
+                    hedged = True
+                    counters.hedges += 1
+                    provider = queue.pop(0)
+                    logger.info(f"🏁 [{route.name}] hedging to {provider} after {hedge_delay:.1f}s")
+                    start(provider, CallClock(route.timeout))
+                    continue
+
+                for task in done:
+                    provider = running.pop(task)
+                    if task.exception() is None:
+                        if hedged and provider != route.providers[0]:
+                            counters.hedge_wins += 1
+                        return task.result()
+                    last_error = task.exception()
+
+                if not running and queue:
+                    counters.failovers += 1
+                    provider = queue.pop(0)
+                    logger.warning(f"🔀 [{route.name}] failing over to {provider}: {last_error!r}")
+                    start(provider, CallClock(route.timeout))
+        finally:
+            # The loser of a hedge (or everything, if we were cancelled)
+            for task in running:
+                task.cancel()
+                task.add_done_callback(_consume)
+
+        raise last_error
+
+    async def _attempt(
+        self, route: LLMRoute, provider: str, attempt: Attempt, model: Optional[str], clock: CallClock
+    ) -> Any:
+        try:
+            async with clock.measure():
+                result = await attempt(self.providers[provider], model)
+        except asyncio.CancelledError:
+            raise
+        except (Exception, asyncio.TimeoutError) as e:
+            raise self._record_error(route, provider, e)
+        self._observe(route, provider, clock)
+        return result
+
+    def _observe(self, route: LLMRoute, provider: str, clock: CallClock):
+        # Cache hits would drag the p95 (and with it the hedge delay) towards zero
+        elapsed = clock.elapsed()
+        if elapsed is not None and not clock.cached:
+            self._latency[(route.name, provider)].observe(elapsed)
+
+    def _hedge_delay(self, route: LLMRoute) -> float:
+        histogram = self._latency.get((route.name, route.providers[0]))
+        if histogram is None or histogram.total < route.hedge_min_samples:
+            return route.hedge_initial_delay
+        return histogram.quantile(route.hedge_quantile)
+
+    def _record_error(self, route: LLMRoute, provider: str, error: BaseException) -> BaseException:
+        counters = self._counters[route.name]
+        if isinstance(error, asyncio.TimeoutError):
+            counters.timeouts += 1
+            error = asyncio.TimeoutError(f"{provider} timed out after {route.timeout:.0f}s on route '{route.name}'")
+        else:
+            counters.errors += 1
+        logger.warning(f"⚠️ [{route.name}] {provider} failed: {error!r}")
+        return error
+
+    # --- Telemetry ---
+
+    def snapshot(self) -> Dict[str, Any]:
+        routes: Dict[str, Any] = {}
+        for name, counters in sorted(self._counters.items()):
+            route = self.routes.get(name, self.default_route)
+            routes[name] = {
+                "providers": route.providers,
+                "hedge": route.hedge,
+                "hedge_delay_s": round(self._hedge_delay(route), 2) if route.hedge else None,
+                **vars(counters),
+                "latency": {
+                    provider: self._latency[(name, provider)].snapshot()
+                    for provider in route.providers if (name, provider) in self._latency
+                },
+            }
+        return routes
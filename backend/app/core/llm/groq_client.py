@@ -1,14 +1,17 @@
+import asyncio
 import time
 import json
-from typing import List, Dict, Type, TypeVar, Optional, Any
+from typing import List, Dict, Type, TypeVar, Optional, Any, AsyncIterator, Callable
 from pydantic import BaseModel
-from groq import AsyncGroq, APIConnectionError, RateLimitError, InternalServerError
+from groq import AsyncGroq, APIConnectionError, InternalServerError
 from tenacity import retry, stop_after_attempt, wait_random_exponential, retry_if_exception_type
 
 from app.config.settings import AppConfig
 from app.core.llm.interface import ILLMClient
-from app.core.llm.types import LLMResponse, ToolCallRequest
+from app.core.llm.types import LLMResponse, LLMStreamChunk, ToolCallRequest
+from app.core.llm.stream_assembler import StreamAssembler
 from app.core.llm.exceptions import LLMRefusalError
+from app.core.llm.usage import prompt_cache_stats
 from app.utils.logger import setup_logger
 
 logger = setup_logger("LLM_Client")
@@ -16,9 +19,12 @@ logger = setup_logger("LLM_Client")
 T = TypeVar('T', bound=BaseModel)
 
 class GroqClient(ILLMClient):
-    def __init__(self):
-        self.client = AsyncGroq(api_key=AppConfig.GROQ_API_KEY)
-        self.default_model = 'openai/gpt-oss-120b' 
+    def __init__(self, http_client: Optional[Any] = None):
+        # http_client: shared pooled transport (see ServiceContainer). None = SDK default.
+        # max_retries=0: 429s go to the shared RateLimiter (see RateLimitedLLMClient),
+        # connection / 5xx errors to the tenacity decorators below
+        self.client = AsyncGroq(api_key=AppConfig.GROQ_API_KEY, http_client=http_client, max_retries=0)
+        self.default_model = AppConfig.LLM.GROQ_MODEL
 
     def _build_params(self, model: Optional[str], temperature: Optional[float] = None) -> Dict[str, Any]:
         params = {"model": model or self.default_model}
@@ -27,7 +33,7 @@ class GroqClient(ILLMClient):
         return params
 
     @retry(
-        retry=retry_if_exception_type((RateLimitError, APIConnectionError, InternalServerError)),
+        retry=retry_if_exception_type((APIConnectionError, InternalServerError)),
         wait=wait_random_exponential(min=1, max=60),
         stop=stop_after_attempt(6)
     )
@@ -53,12 +59,14 @@ class GroqClient(ILLMClient):
                 **params
             )
             
+            prompt_cache_stats.record(params["model"], response.usage)
             message = response.choices[0].message
             
             # Map Groq response to our architecture's generic LLMResponse
             llm_response = LLMResponse(
                 content=message.content,
-                role=message.role
+                role=message.role,
+                usage=response.usage
             )
 
             # Extract Tool Calls if present
@@ -76,6 +84,56 @@ class GroqClient(ILLMClient):
             logger.error(f"❌ Groq Tool Call Error: {str(e)}")
             raise e
 
+    async def stream_chat_with_tools(
+        self, 
+        messages: List[Dict[str, str]], 
+        tools_schema: List[Dict[str, Any]],
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """
+        Streaming Tool Calling for Groq (OpenAI-compatible chunk format).
+        Same sampling as chat_with_tools (temperature 0).
+        """
+        params = self._build_params(self.default_model, 0.0)
+        assembler = StreamAssembler()
+        start_time = time.time()
+
+        stream = None
+        try:
+            logger.info(f"🚀 Streaming Groq Chat with Tools [{params['model']}]")
+
+            stream = await self.client.chat.completions.create(
+                messages=messages,
+                tools=tools_schema,
+                tool_choice="auto",
+                stream=True,
+                **params
+            )
+
+            async for chunk in stream:
+                delta = assembler.feed(chunk)
+                if delta:
+                    yield LLMStreamChunk(content_delta=delta)
+
+        except asyncio.CancelledError:
+            # Superseded turn: abort the HTTP response instead of leaving it to drain
+            if stream is not None:
+                await stream.close()
+            logger.info(f"🛑 Stream cancelled ({time.time() - start_time:.2f}s)")
+            raise
+        except Exception as e:
+            logger.error(f"❌ Groq Streaming Error: {str(e)}")
+            raise e
+
+        logger.info(f"✅ Stream complete ({time.time() - start_time:.2f}s)")
+        llm_response = assembler.build()
+        prompt_cache_stats.record(params["model"], llm_response.usage)
+        yield LLMStreamChunk(response=llm_response)
+
+    @retry(
+        retry=retry_if_exception_type((APIConnectionError, InternalServerError)),
+        wait=wait_random_exponential(min=1, max=60),
+        stop=stop_after_attempt(6)
+    )
     async def get_structured_completion(
         self,
         messages: List[Dict[str, str]],
@@ -91,12 +149,7 @@ class GroqClient(ILLMClient):
             "type": "json_object" # Groq standard JSON mode
         }
         
-        # We append a system instruction to ensure JSON compliance
-        schema_json = json.dumps(response_model.model_json_schema())
-        messages_with_schema = [
-            *messages, 
-            {"role": "system", "content": f"Return the answer as valid JSON matching this schema: {schema_json}"}
-        ]
+        messages_with_schema = self._with_schema(messages, response_model)
 
         try:
             response = await self.client.chat.completions.create(
@@ -107,6 +160,7 @@ class GroqClient(ILLMClient):
 
             duration = time.time() - start_time
             logger.info(f"✅ Success ({duration:.2f}s)")
+            prompt_cache_stats.record(params["model"], response.usage)
 
             raw = response.choices[0].message.content
             data = json.loads(raw)
@@ -117,6 +171,76 @@ class GroqClient(ILLMClient):
             logger.error(f"❌ LLM Error: {str(e)}")
             raise e
 
+    @retry(
+        retry=retry_if_exception_type((APIConnectionError, InternalServerError)),
+        wait=wait_random_exponential(min=1, max=60),
+        stop=stop_after_attempt(6)
+    )
+    async def stream_structured_completion(
+        self,
+        messages: List[Dict[str, str]],
+        response_model: Type[T],
+        on_text: Callable[[str, int], None],
+        temperature: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> T:
+        """
+        JSON mode over a streamed chat completion: the text is reported as it grows,
+        then parsed and validated once complete.
+        """
+        params = self._build_params(model, temperature)
+        assembler = StreamAssembler()
+        start_time = time.time()
+        received = 0
+
+        stream = None
+        try:
+            logger.info(f"🚀 Streaming Groq Structured [{params['model']}]")
+
+            stream = await self.client.chat.completions.create(
+                messages=self._with_schema(messages, response_model),
+                response_format={"type": "json_object"},
+                stream=True,
+                **params
+            )
+
+            async for chunk in stream:
+                delta = assembler.feed(chunk)
+                if delta:
+                    on_text(delta, received)
+                    received += len(delta)
+
+        except asyncio.CancelledError:
+            if stream is not None:
+                await stream.close()
+            logger.info(f"🛑 Stream cancelled ({time.time() - start_time:.2f}s)")
+            raise
+        except Exception as e:
+            logger.error(f"❌ LLM Error: {str(e)}")
+            raise e
+
+        logger.info(f"✅ Stream complete ({time.time() - start_time:.2f}s)")
+        llm_response = assembler.build()
+        prompt_cache_stats.record(params["model"], llm_response.usage)
+
+        return response_model.model_validate(json.loads(llm_response.content or ""))
+
+    @staticmethod
+    def _with_schema(messages: List[Dict[str, str]], response_model: Type[BaseModel]) -> List[Dict[str, str]]:
+        # We prepend a system instruction to ensure JSON compliance.
+        # The schema is static per response model, so it leads the cacheable prefix
+        # (ahead of the agent instructions; the dynamic blocks stay last).
+        schema_json = json.dumps(response_model.model_json_schema())
+        return [
+            {"role": "system", "content": f"Return the answer as valid JSON matching this schema: {schema_json}"},
+            *messages
+        ]
+
+    @retry(
+        retry=retry_if_exception_type((APIConnectionError, InternalServerError)),
+        wait=wait_random_exponential(min=1, max=60),
+        stop=stop_after_attempt(6)
+    )
     async def get_text_completion(
         self, 
         messages: List[Dict[str, str]], 
@@ -137,6 +261,7 @@ class GroqClient(ILLMClient):
             
             duration = time.time() - start_time
             logger.info(f"✅ Success ({duration:.2f}s)")
+            prompt_cache_stats.record(params["model"], completion.usage)
             
             return completion.choices[0].message.content
         except Exception as e:
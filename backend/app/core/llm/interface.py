@@ -1,8 +1,8 @@
 # app/core/llm/interface.py
 from abc import ABC, abstractmethod
-from typing import List, Dict, Type, TypeVar, Optional, Any
+from typing import List, Dict, Type, TypeVar, Optional, Any, AsyncIterator, Callable
 from pydantic import BaseModel
-from app.core.llm.types import LLMResponse
+from app.core.llm.types import LLMResponse, LLMStreamChunk
 
 T = TypeVar('T', bound=BaseModel)
 
@@ -17,6 +17,22 @@ class ILLMClient(ABC):
     ) -> T:
         pass
 
+    async def stream_structured_completion(
+        self,
+        messages: List[Dict[str, str]],
+        response_model: Type[T],
+        on_text: Callable[[str, int], None],
+        temperature: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> T:
+        """
+        Streaming variant of get_structured_completion.
+        'on_text' is called (synchronously) with each raw JSON text delta and its offset
+        in the text; a retry restarts at offset 0. The validated model is returned at the end.
+        Providers without streaming fall back to the one-shot call (no progress).
+        """
+        return await self.get_structured_completion(messages, response_model, temperature, model)
+
     @abstractmethod
     async def get_text_completion(
         self, 
@@ -36,4 +52,17 @@ class ILLMClient(ABC):
         Generic method for any provider (OpenAI, Anthropic, Gemini).
         Returns a standardized LLMResponse object.
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def stream_chat_with_tools(
+        self, 
+        messages: List[Dict[str, str]], 
+        tools_schema: List[Dict[str, Any]],
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """
+        Streaming variant of chat_with_tools.
+        Yields content deltas as they arrive; the final chunk carries the
+        assembled LLMResponse (including complete tool calls).
+        """
+        pass
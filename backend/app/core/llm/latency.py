@@ -0,0 +1,124 @@
+# app/core/llm/latency.py
+import asyncio
+import bisect
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Dict, List, Optional
+
+# Upper bounds in seconds (log-spaced, like Prometheus buckets); the last bucket is open-ended
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 3, 4, 6, 8, 12, 16, 24, 32, 48, 64, 96, 128)
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram (constant memory per route).
+    Quantiles are interpolated linearly inside the bucket that contains them.
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.bounds: List[float] = list(buckets)
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.total += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.total:
+            return None
+
+        rank = q * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                return lower + (upper - lower) * ((rank - seen) / count)
+            seen += count
+        return self.max
+
+    def snapshot(self) -> Dict:
+        def ms(value: Optional[float]) -> float:
+            return round(value * 1000, 1) if value is not None else 0.0
+
+        return {
+            "count": self.total,
+            "mean_ms": ms(self.sum / self.total) if self.total else 0.0,
+            "p50_ms": ms(self.quantile(0.5)),
+            "p95_ms": ms(self.quantile(0.95)),
+            "p99_ms": ms(self.quantile(0.99)),
+            "max_ms": ms(self.max),
+            # Cumulative counts per upper bound (seconds), "+Inf" for the open bucket
+            "buckets": {
+                **{str(b): sum(self.counts[:i + 1]) for i, b in enumerate(self.bounds)},
+                "+Inf": self.total,
+            },
+        }
+
+class CallClock:
+    """
+    Times one provider attempt from the moment the call actually runs.
+    It starts with the attempt; the decorators below the gateway stop it while the call
+    waits for a pool slot or a rate-limit cooldown (see mark_call_waiting / mark_call_running),
+    so queueing never counts towards the attempt's timeout or latency.
+    'cached': the answer came from a cache above the provider; it is not a provider latency.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.timeout = timeout
+        self.started: Optional[float] = None
+        self.cached = False
+        self._deadline: Optional[asyncio.Timeout] = None
+
+    @asynccontextmanager
+    async def measure(self) -> AsyncIterator[None]:
+        """
+        Applies the clock to the calls awaited inside the block (same task only: no yield inside).
+        Raises TimeoutError once the call has been running for 'timeout' seconds.
+        """
+        async with asyncio.timeout(None) as deadline:
+            self._deadline = deadline
+            self.running()
+            token = _call_clock.set(self)
+            try:
+                yield
+            finally:
+                _call_clock.reset(token)
+                self._deadline = None
+
+    def running(self):
+        self.started = asyncio.get_running_loop().time()
+        if self._deadline is not None and self.timeout:
+            self._deadline.reschedule(self.started + self.timeout)
+
+    def waiting(self):
+        self.started = None
+        if self._deadline is not None:
+            self._deadline.reschedule(None)
+
+    def elapsed(self) -> Optional[float]:
+        return asyncio.get_running_loop().time() - self.started if self.started is not None else None
+
+_call_clock: ContextVar[Optional[CallClock]] = ContextVar("llm_call_clock", default=None)
+
+def mark_call_running():
+    """Hook for the client decorators: the provider call starts now (slot granted, no cooldown left)."""
+    clock = _call_clock.get()
+    if clock is not None:
+        clock.running()
+
+def mark_call_cached():
+    """Hook for the client decorators: answered without a provider call (e.g. a completion cache hit)."""
+    clock = _call_clock.get()
+    if clock is not None:
+        clock.cached = True
+
+def mark_call_waiting():
+    """Hook for the client decorators: the call is queued or cooling down again."""
+    clock = _call_clock.get()
+    if clock is not None:
+        clock.waiting()
@@ -1,14 +1,17 @@
 # app/core/llm/openai_client.py
+import asyncio
 import time
-from typing import List, Dict, Type, TypeVar, Optional, Any
+from typing import List, Dict, Type, TypeVar, Optional, Any, AsyncIterator, Callable
 from pydantic import BaseModel
-from openai import AsyncOpenAI, APIError, RateLimitError, APIConnectionError, InternalServerError
+from openai import AsyncOpenAI, APIError, APIConnectionError, InternalServerError
 from tenacity import retry, stop_after_attempt, wait_random_exponential, retry_if_exception_type
 
 from app.config.settings import AppConfig
 from app.core.llm.interface import ILLMClient
 from app.core.llm.exceptions import LLMRefusalError
-from app.core.llm.types import LLMResponse, ToolCallRequest
+from app.core.llm.types import LLMResponse, LLMStreamChunk, ToolCallRequest
+from app.core.llm.stream_assembler import StreamAssembler
+from app.core.llm.usage import current_agent, prompt_cache_stats
 from app.utils.logger import setup_logger
 
 logger = setup_logger("LLM_Client")
@@ -16,18 +19,27 @@ logger = setup_logger("LLM_Client")
 T = TypeVar('T', bound=BaseModel)
 
 class OpenAIClient(ILLMClient):
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=AppConfig.OPENAI_API_KEY)
+    def __init__(self, http_client: Optional[Any] = None):
+        # http_client: shared pooled transport (see ServiceContainer). None = SDK default.
+        # max_retries=0: 429s go to the shared RateLimiter (see RateLimitedLLMClient),
+        # connection / 5xx errors to the tenacity decorators below
+        self.client = AsyncOpenAI(api_key=AppConfig.OPENAI_API_KEY, http_client=http_client, max_retries=0)
         self.default_model = AppConfig.LLM.SMART_MODEL
 
     def _build_params(self, model: Optional[str], temperature: Optional[float]) -> Dict[str, Any]:
-        params = {"model": model or self.default_model}
+        params = {"model": model or self.default_model, **self._cache_params()}
         if temperature is not None:
             params["temperature"] = temperature
         return params
 
+    @staticmethod
+    def _cache_params() -> Dict[str, Any]:
+        # Routes requests of the same agent (same static prefix) to the same prompt cache
+        agent = current_agent()
+        return {"prompt_cache_key": f"ba-{agent}"} if agent != "unattributed" else {}
+
     @retry(
-        retry=retry_if_exception_type((RateLimitError, APIConnectionError, InternalServerError)),
+        retry=retry_if_exception_type((APIConnectionError, InternalServerError)),
         wait=wait_random_exponential(min=1, max=60),
         stop=stop_after_attempt(6)
     )
@@ -53,6 +65,7 @@ class OpenAIClient(ILLMClient):
             
             duration = time.time() - start_time
             logger.info(f"✅ Success ({duration:.2f}s)")
+            prompt_cache_stats.record(params["model"], response.usage)
             
             result = response.output_parsed
             if result is None:
@@ -65,7 +78,61 @@ class OpenAIClient(ILLMClient):
             raise e
 
     @retry(
-        retry=retry_if_exception_type((RateLimitError, APIConnectionError, InternalServerError)),
+        retry=retry_if_exception_type((APIConnectionError, InternalServerError)),
+        wait=wait_random_exponential(min=1, max=60),
+        stop=stop_after_attempt(6)
+    )
+    async def stream_structured_completion(
+        self,
+        messages: List[Dict[str, str]],
+        response_model: Type[T],
+        on_text: Callable[[str, int], None],
+        temperature: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> T:
+        """
+        Structured output over the Responses streaming API.
+        The JSON text is reported as it grows; the SDK parses the final response.
+        """
+        params = self._build_params(model, temperature)
+        start_time = time.time()
+        received = 0
+
+        try:
+            logger.info(f"🚀 Streaming Structured API [{params['model']}]")
+
+            async with self.client.responses.stream(
+                input=messages,
+                text_format=response_model,
+                **params
+            ) as stream:
+                async for event in stream:
+                    if event.type == "response.output_text.delta":
+                        if not received:
+                            logger.info(f"⚡ First token ({time.time() - start_time:.2f}s)")
+                        on_text(event.delta, received)
+                        received += len(event.delta)
+                response = await stream.get_final_response()
+
+            duration = time.time() - start_time
+            logger.info(f"✅ Stream complete ({duration:.2f}s)")
+            prompt_cache_stats.record(params["model"], response.usage)
+
+            result = response.output_parsed
+            if result is None:
+                logger.warning("⚠️ Model Refusal detected")
+                raise LLMRefusalError("The model returned no parsed output.")
+            return result
+
+        except asyncio.CancelledError:
+            logger.info(f"🛑 Stream cancelled ({time.time() - start_time:.2f}s)")
+            raise
+        except Exception as e:
+            logger.error(f"❌ LLM Error: {str(e)}")
+            raise e
+
+    @retry(
+        retry=retry_if_exception_type((APIConnectionError, InternalServerError)),
         wait=wait_random_exponential(min=1, max=60),
         stop=stop_after_attempt(6)
     )
@@ -89,6 +156,7 @@ class OpenAIClient(ILLMClient):
             
             duration = time.time() - start_time
             logger.info(f"✅ Success ({duration:.2f}s)")
+            prompt_cache_stats.record(params["model"], completion.usage)
             
             return completion.choices[0].message.content
         except Exception as e:
@@ -109,19 +177,22 @@ class OpenAIClient(ILLMClient):
             "messages": messages,
             "tools": tools_schema,
             "tool_choice": "auto",
+            **self._cache_params(),
         }
 
         try:
             logger.info(f"🚀 Calling Chat API with Tools [{params['model']}]")
             
             completion = await self.client.chat.completions.create(**params)
+            prompt_cache_stats.record(params["model"], completion.usage)
             
             message = completion.choices[0].message
             
             # --- Convert OpenAI Object to Generic LLMResponse ---
             response = LLMResponse(
                 content=message.content,
-                role=message.role
+                role=message.role,
+                usage=completion.usage
             )
 
             if message.tool_calls:
@@ -136,4 +207,58 @@ class OpenAIClient(ILLMClient):
 
         except Exception as e:
             logger.error(f"❌ OpenAI Tool Call Error: {str(e)}")
-            raise e
\ No newline at end of file
+            raise e
+
+    async def stream_chat_with_tools(
+        self, 
+        messages: List[Dict[str, str]], 
+        tools_schema: List[Dict[str, Any]],
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """
+        Streaming implementation of chat_with_tools.
+        Text deltas are yielded immediately; tool-call fragments are assembled
+        and only surfaced (complete) in the final chunk.
+        """
+        params = {
+            "model": self.default_model,
+            "messages": messages,
+            "tools": tools_schema,
+            "tool_choice": "auto",
+            "stream": True,
+            # Final chunk carries token usage (incl. cached prompt tokens)
+            "stream_options": {"include_usage": True},
+            **self._cache_params(),
+        }
+
+        assembler = StreamAssembler()
+        start_time = time.time()
+
+        stream = None
+        try:
+            logger.info(f"🚀 Streaming Chat API with Tools [{params['model']}]")
+
+            stream = await self.client.chat.completions.create(**params)
+            first_token_logged = False
+
+            async for chunk in stream:
+                delta = assembler.feed(chunk)
+                if delta:
+                    if not first_token_logged:
+                        logger.info(f"⚡ First token ({time.time() - start_time:.2f}s)")
+                        first_token_logged = True
+                    yield LLMStreamChunk(content_delta=delta)
+
+        except asyncio.CancelledError:
+            # Superseded turn: abort the HTTP response instead of leaving it to drain
+            if stream is not None:
+                await stream.close()
+            logger.info(f"🛑 Stream cancelled ({time.time() - start_time:.2f}s)")
+            raise
+        except Exception as e:
+            logger.error(f"❌ OpenAI Streaming Error: {str(e)}")
+            raise e
+
+        logger.info(f"✅ Stream complete ({time.time() - start_time:.2f}s)")
+        response = assembler.build()
+        prompt_cache_stats.record(params["model"], response.usage)
+        yield LLMStreamChunk(response=response)
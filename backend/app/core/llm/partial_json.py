@@ -0,0 +1,140 @@
+# app/core/llm/partial_json.py
+import json
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from pydantic import BaseModel, ValidationError
+
+# Called with each streamed text delta and its offset in the attempt's text.
+# Offset 0 starts a new text: a retry / failover restarts it
+TextCallback = Callable[[str, int], None]
+# Called with the artifact built from the completed items so far, e.g. {"stories": [...]}
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+class PartialArrayParser:
+    """
+    Incremental scanner over a growing JSON document of the shape {"<field>": [{...}, {...}, ...], ...}.
+    Returns each element object of the top-level array 'field' as soon as its closing brace arrives.
+    Fed delta by delta: every character is scanned once and only the text of the item
+    (or top-level key) still open is kept, so a stream costs O(length), not O(length²).
+    A delta at offset 0 (a retried or failed-over stream) starts a new scan.
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self.restarts = 0
+        self._reset()
+
+    def _reset(self):
+        # Unconsumed tail of the text; '_base' is its offset in the whole text
+        self._buffer = ""
+        self._base = 0
+        self._length = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._key: Optional[str] = None
+        self._in_target = False
+        self._item_start = 0
+
+    def feed(self, delta: str, offset: int) -> List[Dict[str, Any]]:
+        """Consumes the next delta. Returns the items it completes."""
+        if offset == 0 and self._length:
+            self.restarts += 1
+            self._reset()
+        if offset != self._length:
+            # Deltas arrive in order; anything else cannot be scanned (wait for a restart)
+            return []
+        self._length += len(delta)
+
+        # Positions below are offsets in the whole text; 'text' starts at '_base'
+        base = self._base
+        text = self._buffer + delta
+        completed: List[Dict[str, Any]] = []
+        for pos in range(base + len(self._buffer), base + len(text)):
+            c = text[pos - base]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif c == "\\":
+                    self._escaped = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = text[self._string_start - base:pos - base + 1]
+                continue
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif c == ":" and self._depth == 1:
+                self._key = self._decode_key(self._last_string)
+            elif c in "{[":
+                if c == "[" and self._depth == 1 and self._key == self.field:
+                    self._in_target = True
+                elif c == "{" and self._depth == 2 and self._in_target:
+                    self._item_start = pos
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._in_target and self._depth == 2 and c == "}":
+                    item = self._decode_item(text[self._item_start - base:pos - base + 1])
+                    if item is not None:
+                        completed.append(item)
+                elif self._in_target and self._depth == 1:
+                    self._in_target = False
+
+        # Keep only what a later delta can still complete
+        if self._in_target and self._depth >= 3:
+            keep = self._item_start
+        elif self._in_string and self._depth == 1:
+            keep = self._string_start
+        else:
+            keep = self._length
+        self._buffer = text[keep - base:]
+        self._base = keep
+        return completed
+
+    @staticmethod
+    def _decode_key(raw: Optional[str]) -> Optional[str]:
+        try:
+            return json.loads(raw) if raw else None
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _decode_item(raw: str) -> Optional[Dict[str, Any]]:
+        try:
+            item = json.loads(raw)
+        except ValueError:
+            return None
+        return item if isinstance(item, dict) else None
+
+def item_progress(field: str, item_model: Type[BaseModel], on_progress: ProgressCallback) -> TextCallback:
+    """
+    Adapts a streamed structured completion to artifact progress:
+    'on_progress' receives {field: [completed items]} whenever another item validates against 'item_model'.
+    """
+    parser = PartialArrayParser(field)
+    items: List[Dict[str, Any]] = []
+
+    def on_text(delta: str, offset: int):
+        restarts = parser.restarts
+        completed = parser.feed(delta, offset)
+        if parser.restarts != restarts:
+            items.clear()
+
+        added = False
+        for raw in completed:
+            try:
+                items.append(item_model.model_validate(raw).model_dump())
+                added = True
+            except ValidationError:
+                # Incomplete item (the final model validation will report it, if it persists)
+                continue
+        if added:
+            on_progress({field: list(items)})
+
+    return on_text
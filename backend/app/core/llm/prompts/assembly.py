@@ -0,0 +1,33 @@
+# app/core/llm/prompts/assembly.py
+import hashlib
+from dataclasses import dataclass
+from typing import Dict
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """
+    Prompt split for provider-side prefix caching.
+
+    'static' holds the instructions. It is never formatted, so it is byte-identical
+    on every call and always sent FIRST (the cacheable prefix).
+    'dynamic' is a format string for the volatile blocks (ledger, current draft),
+    sent LAST so that changing them never invalidates the prefix.
+    """
+    name: str
+    static: str
+    dynamic: str
+
+    @property
+    def version(self) -> str:
+        """Content hash of the whole template (changes whenever the prompt text is edited)."""
+        return hashlib.sha256(f"{self.static}\x00{self.dynamic}".encode("utf-8")).hexdigest()[:12]
+
+    def static_message(self) -> Dict[str, str]:
+        return {"role": "system", "content": self.static}
+
+    def dynamic_message(self, role: str = "user", **blocks: str) -> Dict[str, str]:
+        return {"role": role, "content": self.dynamic.format(**blocks)}
+
+    def messages(self, **blocks: str):
+        """Single-shot layout for the artifact agents: [static instructions, dynamic blocks]."""
+        return [self.static_message(), self.dynamic_message(**blocks)]
@@ -0,0 +1,195 @@
+# app/core/llm/rate_limited_client.py
+import re
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import List, Dict, Type, TypeVar, Optional, Any, AsyncIterator, Awaitable, Callable
+from pydantic import BaseModel
+
+from app.core.llm.interface import ILLMClient
+from app.core.llm.latency import mark_call_running, mark_call_waiting
+from app.core.llm.tokens import TokenCounter
+from app.core.llm.types import LLMResponse, LLMStreamChunk
+from app.core.services.rate_limiter import RateLimiter
+from app.utils.logger import setup_logger
+
+logger = setup_logger("LLM_RateLimit")
+
+T = TypeVar('T', bound=BaseModel)
+
+# '1m30.5s', '20s', '250ms' (x-ratelimit-reset-* headers of OpenAI & Groq)
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNIT_SECONDS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+def is_rate_limited(error: BaseException) -> bool:
+    """429 from either SDK (both expose status_code on APIStatusError)."""
+    return getattr(error, "status_code", None) == 429
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    How long the provider asks us to wait, from the 429 response headers:
+    retry-after-ms, retry-after (seconds or HTTP date), then the x-ratelimit-reset-* durations.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000.0
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            try:
+                return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+
+    resets = [
+        _parse_duration(headers.get(name))
+        for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+    ]
+    resets = [r for r in resets if r is not None]
+    return max(resets) if resets else None
+
+def _parse_duration(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _UNIT_SECONDS[unit] for amount, unit in parts)
+
+class RateLimitedLLMClient(ILLMClient):
+    """
+    Decorator: every call first passes the shared ProviderLimiter of its
+    'provider/model' (RPM / TPM pacing, Retry-After cooldown). A 429 feeds the
+    limiter (cooldown + AIMD decrease) and the call is retried after the cooldown,
+    up to 'max_attempts'. Sits inside ScheduledLLMClient, whose pool limit AIMD adjusts.
+    Pacing and cooldowns pause the gateway's call clock.
+    """
+
+    def __init__(
+        self,
+        inner: ILLMClient,
+        limiter: RateLimiter,
+        provider: str,
+        max_attempts: int,
+        output_token_estimate: int
+    ):
+        self.inner = inner
+        self.limiter = limiter
+        self.provider = provider
+        self.max_attempts = max(1, max_attempts)
+        self.output_token_estimate = output_token_estimate
+        self._counters: Dict[str, TokenCounter] = {}
+
+    @property
+    def default_model(self) -> str:
+        return self.inner.default_model
+
+    def _estimate(self, model: str, messages: List[Dict[str, Any]]) -> int:
+        """Prompt tokens + a fixed output allowance (what the TPM bucket is charged up front)."""
+        counter = self._counters.get(model)
+        if counter is None:
+            counter = self._counters[model] = TokenCounter(model)
+        return counter.count_messages(messages) + self.output_token_estimate
+
+    async def _run(self, model: Optional[str], messages: List[Dict[str, Any]], call: Callable[[], Awaitable[Any]]) -> Any:
+        model = model or self.inner.default_model
+        limiter = self.limiter.limiter(f"{self.provider}/{model}")
+        tokens = self._estimate(model, messages)
+
+        for attempt in range(1, self.max_attempts + 1):
+            mark_call_waiting()
+            await limiter.acquire(tokens)
+            mark_call_running()
+            try:
+                result = await call()
+            except Exception as e:
+                if not is_rate_limited(e):
+                    raise
+                limiter.on_rate_limited(retry_after_seconds(e))
+                if attempt == self.max_attempts:
+                    raise
+                logger.info(f"🔁 [{limiter.name}] rate limited, retry {attempt}/{self.max_attempts - 1} after cooldown")
+                continue
+            limiter.on_success()
+            return result
+
+    async def get_structured_completion(
+        self,
+        messages: List[Dict[str, str]],
+        response_model: Type[T],
+        temperature: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> T:
+        return await self._run(
+            model, messages,
+            lambda: self.inner.get_structured_completion(messages, response_model, temperature, model)
+        )
+
+    async def stream_structured_completion(
+        self,
+        messages: List[Dict[str, str]],
+        response_model: Type[T],
+        on_text: Callable[[str, int], None],
+        temperature: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> T:
+        # A retry restarts the text at offset 0 ('on_text' consumers reset on that)
+        return await self._run(
+            model, messages,
+            lambda: self.inner.stream_structured_completion(messages, response_model, on_text, temperature, model)
+        )
+
+    async def get_text_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> str:
+        return await self._run(model, messages, lambda: self.inner.get_text_completion(messages, temperature, model))
+
+    async def chat_with_tools(
+        self,
+        messages: List[Dict[str, str]],
+        tools_schema: List[Dict[str, Any]],
+    ) -> LLMResponse:
+        return await self._run(None, messages, lambda: self.inner.chat_with_tools(messages, tools_schema))
+
+    async def stream_chat_with_tools(
+        self,
+        messages: List[Dict[str, str]],
+        tools_schema: List[Dict[str, Any]],
+    ) -> AsyncIterator[LLMStreamChunk]:
+        model = self.inner.default_model
+        limiter = self.limiter.limiter(f"{self.provider}/{model}")
+        tokens = self._estimate(model, messages)
+
+        for attempt in range(1, self.max_attempts + 1):
+            mark_call_waiting()
+            await limiter.acquire(tokens)
+            mark_call_running()
+            started = False
+            try:
+                async for chunk in self.inner.stream_chat_with_tools(messages, tools_schema):
+                    started = True
+                    yield chunk
+            except Exception as e:
+                # A 429 arrives before the first chunk; anything later is not retryable
+                if started or not is_rate_limited(e):
+                    raise
+                limiter.on_rate_limited(retry_after_seconds(e))
+                if attempt == self.max_attempts:
+                    raise
+                logger.info(f"🔁 [{limiter.name}] stream rate limited, retry {attempt}/{self.max_attempts - 1} after cooldown")
+                continue
+            limiter.on_success()
+            return
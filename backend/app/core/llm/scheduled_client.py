@@ -0,0 +1,85 @@
+# app/core/llm/scheduled_client.py
+from contextlib import asynccontextmanager
+from typing import List, Dict, Type, TypeVar, Optional, Any, AsyncIterator, Callable
+from pydantic import BaseModel
+
+from app.core.llm.interface import ILLMClient
+from app.core.llm.latency import mark_call_running, mark_call_waiting
+from app.core.llm.types import LLMResponse, LLMStreamChunk
+from app.core.services.work_scheduler import WorkScheduler
+
+T = TypeVar('T', bound=BaseModel)
+
+class ScheduledLLMClient(ILLMClient):
+    """
+    Decorator: every call holds a slot of the '<provider>/<model>' pool in the
+    WorkScheduler while it runs (streams hold it until the last chunk).
+    Priority and session come from the caller's work_context.
+    The gateway's call clock starts once the slot is granted (queue time is not latency).
+    """
+
+    def __init__(self, inner: ILLMClient, scheduler: WorkScheduler, provider: str):
+        self.inner = inner
+        self.scheduler = scheduler
+        self.provider = provider
+
+    @property
+    def default_model(self) -> str:
+        return self.inner.default_model
+
+    def _pool(self, model: Optional[str]) -> str:
+        return f"{self.provider}/{model or self.inner.default_model}"
+
+    @asynccontextmanager
+    async def _slot(self, model: Optional[str]) -> AsyncIterator[None]:
+        mark_call_waiting()
+        async with self.scheduler.slot(self._pool(model)):
+            mark_call_running()
+            yield
+
+    async def get_structured_completion(
+        self,
+        messages: List[Dict[str, str]],
+        response_model: Type[T],
+        temperature: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> T:
+        async with self._slot(model):
+            return await self.inner.get_structured_completion(messages, response_model, temperature, model)
+
+    async def stream_structured_completion(
+        self,
+        messages: List[Dict[str, str]],
+        response_model: Type[T],
+        on_text: Callable[[str, int], None],
+        temperature: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> T:
+        async with self._slot(model):
+            return await self.inner.stream_structured_completion(messages, response_model, on_text, temperature, model)
+
+    async def get_text_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> str:
+        async with self._slot(model):
+            return await self.inner.get_text_completion(messages, temperature, model)
+
+    async def chat_with_tools(
+        self,
+        messages: List[Dict[str, str]],
+        tools_schema: List[Dict[str, Any]],
+    ) -> LLMResponse:
+        async with self._slot(None):
+            return await self.inner.chat_with_tools(messages, tools_schema)
+
+    async def stream_chat_with_tools(
+        self,
+        messages: List[Dict[str, str]],
+        tools_schema: List[Dict[str, Any]],
+    ) -> AsyncIterator[LLMStreamChunk]:
+        async with self._slot(None):
+            async for chunk in self.inner.stream_chat_with_tools(messages, tools_schema):
+                yield chunk
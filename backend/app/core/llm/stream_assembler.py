@@ -0,0 +1,72 @@
+# app/core/llm/stream_assembler.py
+from typing import Any, Dict, List, Optional
+
+from app.core.llm.types import LLMResponse, ToolCallRequest
+
+class StreamAssembler:
+    """
+    Accumulates OpenAI-compatible streaming chunks (OpenAI & Groq share the format)
+    into a single LLMResponse.
+    Tool calls arrive as fragments keyed by 'index'; arguments are concatenated in order.
+    """
+
+    def __init__(self):
+        self._content_parts: List[str] = []
+        self._role: str = "assistant"
+        # index -> {"id": str, "name": str, "arguments": [str]}
+        self._tool_calls: Dict[int, Dict[str, Any]] = {}
+        self._usage: Any = None
+
+    def feed(self, chunk: Any) -> Optional[str]:
+        """
+        Consumes one raw provider chunk.
+        Returns the text delta (if any) so the caller can forward it immediately.
+        """
+        # Usage arrives on the last chunk: OpenAI (stream_options.include_usage) / Groq (x_groq.usage)
+        usage = getattr(chunk, "usage", None) or getattr(getattr(chunk, "x_groq", None), "usage", None)
+        if usage is not None:
+            self._usage = usage
+
+        if not chunk.choices:
+            return None
+
+        delta = chunk.choices[0].delta
+        if delta is None:
+            return None
+
+        if getattr(delta, "role", None):
+            self._role = delta.role
+
+        for tc in getattr(delta, "tool_calls", None) or []:
+            slot = self._tool_calls.setdefault(tc.index, {"id": None, "name": "", "arguments": []})
+            if tc.id:
+                slot["id"] = tc.id
+            if tc.function:
+                if tc.function.name:
+                    slot["name"] += tc.function.name
+                if tc.function.arguments:
+                    slot["arguments"].append(tc.function.arguments)
+
+        if delta.content:
+            self._content_parts.append(delta.content)
+            return delta.content
+
+        return None
+
+    def build(self) -> LLMResponse:
+        """Returns the complete response once the stream is exhausted."""
+        response = LLMResponse(
+            content="".join(self._content_parts) or None,
+            role=self._role,
+            usage=self._usage
+        )
+
+        for index in sorted(self._tool_calls):
+            slot = self._tool_calls[index]
+            response.tool_calls.append(ToolCallRequest(
+                call_id=slot["id"] or f"call_{index}",
+                function_name=slot["name"],
+                arguments="".join(slot["arguments"]) or "{}"
+            ))
+
+        return response
@@ -0,0 +1,68 @@
+# app/core/llm/tokens.py
+from typing import Any, Dict, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # Optional dependency: fall back to a character heuristic
+    tiktoken = None
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger("TokenCounter")
+
+# Chat formatting overhead per message (role + separators), as per the OpenAI cookbook
+MESSAGE_OVERHEAD = 4
+CHARS_PER_TOKEN = 4
+_CACHE_LIMIT = 8192
+
+class TokenCounter:
+    """
+    Counts prompt tokens for chat messages.
+    Uses tiktoken when installed (exact for OpenAI models), otherwise ~4 chars/token.
+    Per-text counts are memoized: history messages are re-counted on every turn.
+    """
+
+    def __init__(self, model: Optional[str] = None):
+        self._encoding = _load_encoding(model)
+        self._cache: Dict[str, int] = {}
+
+    def count_text(self, text: Optional[str]) -> int:
+        if not text:
+            return 0
+        cached = self._cache.get(text)
+        if cached is not None:
+            return cached
+
+        if self._encoding is not None:
+            count = len(self._encoding.encode(text, disallowed_special=()))
+        else:
+            count = (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+        if len(self._cache) >= _CACHE_LIMIT:
+            self._cache.clear()
+        self._cache[text] = count
+        return count
+
+    def count_message(self, message: Dict[str, Any]) -> int:
+        tokens = MESSAGE_OVERHEAD + self.count_text(message.get("content"))
+        for tool_call in message.get("tool_calls") or []:
+            function = tool_call.get("function", {})
+            tokens += self.count_text(function.get("name")) + self.count_text(function.get("arguments"))
+        return tokens
+
+    def count_messages(self, messages: List[Dict[str, Any]]) -> int:
+        return sum(self.count_message(m) for m in messages)
+
+def _load_encoding(model: Optional[str]):
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model or "")
+        except KeyError:
+            # Unknown / newer model names: the current OpenAI base encoding is close enough for budgeting
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # Encodings are downloaded on first use; offline hosts fall back to the heuristic
+        logger.warning(f"⚠️ tiktoken unavailable ({e}). Using ~{CHARS_PER_TOKEN} chars/token estimate.")
+        return None
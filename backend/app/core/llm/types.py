@@ -12,4 +12,15 @@ class LLMResponse:
     content: Optional[str] = None
     tool_calls: List[ToolCallRequest] = field(default_factory=list)
     role: str = "assistant"
-    raw_response: Any = None
\ No newline at end of file
+    raw_response: Any = None
+    # Provider usage object (token counts incl. cached prompt tokens), if reported
+    usage: Any = None
+
+@dataclass
+class LLMStreamChunk:
+    """
+    One increment of a streamed completion.
+    Intermediate chunks carry a text delta; the final chunk carries the assembled response.
+    """
+    content_delta: Optional[str] = None
+    response: Optional[LLMResponse] = None
@@ -0,0 +1,94 @@
+# app/core/llm/usage.py
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger("LLM_Usage")
+
+# Which agent the current LLM call belongs to. Set by the caller, read by the clients.
+_current_agent: ContextVar[str] = ContextVar("llm_agent", default="unattributed")
+
+@contextmanager
+def llm_agent(name: str) -> Iterator[None]:
+    """Attributes every LLM call made inside the block to 'name' (per asyncio task)."""
+    token = _current_agent.set(name)
+    try:
+        yield
+    finally:
+        _current_agent.reset(token)
+
+def current_agent() -> str:
+    return _current_agent.get()
+
+@dataclass
+class _CacheCounters:
+    calls: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+class PromptCacheStats:
+    """
+    Process-wide prompt-cache telemetry per agent.
+    Providers report how many prompt tokens were served from their prefix cache;
+    the hit rate shows whether the static-first prompt layout is paying off.
+    """
+
+    def __init__(self):
+        self._agents: Dict[str, _CacheCounters] = defaultdict(_CacheCounters)
+
+    def record(self, model: str, usage: Any, agent: Optional[str] = None) -> None:
+        prompt_tokens, cached_tokens = extract_prompt_usage(usage)
+        if prompt_tokens is None:
+            return
+
+        name = agent or current_agent()
+        counters = self._agents[name]
+        counters.calls += 1
+        counters.prompt_tokens += prompt_tokens
+        counters.cached_tokens += cached_tokens
+
+        rate = cached_tokens / prompt_tokens if prompt_tokens else 0.0
+        logger.info(
+            f"💾 [{name}] {cached_tokens}/{prompt_tokens} prompt tokens cached ({rate:.0%}) [{model}] "
+            f"| agent total {counters.hit_rate:.0%}"
+        )
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "calls": c.calls,
+                "prompt_tokens": c.prompt_tokens,
+                "cached_tokens": c.cached_tokens,
+                "hit_rate": round(c.hit_rate, 4),
+            }
+            for name, c in sorted(self._agents.items())
+        }
+
+def extract_prompt_usage(usage: Any) -> Tuple[Optional[int], int]:
+    """
+    (prompt_tokens, cached_tokens) from any provider usage object.
+    Chat Completions (OpenAI & Groq): prompt_tokens / prompt_tokens_details.cached_tokens
+    Responses API:                    input_tokens / input_tokens_details.cached_tokens
+    """
+    if usage is None:
+        return None, 0
+
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    details = getattr(usage, "prompt_tokens_details", None)
+    if prompt_tokens is None:
+        prompt_tokens = getattr(usage, "input_tokens", None)
+        details = getattr(usage, "input_tokens_details", None)
+
+    cached_tokens = getattr(details, "cached_tokens", None) or 0
+    return prompt_tokens, cached_tokens
+
+# Global Singleton
+prompt_cache_stats = PromptCacheStats()
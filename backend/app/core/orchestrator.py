@@ -2,41 +2,33 @@
 import asyncio
 import json
 import traceback
-from typing import Callable, Dict, Any, Awaitable, List
+from contextlib import nullcontext
+from typing import Callable, Dict, Any, Awaitable, List, Optional, Set
 
-from app.config.settings import AgentConfig
+from app.config.settings import AgentConfig, AppConfig
 from app.core.llm.interface import ILLMClient
-from app.core.llm.openai_client import OpenAIClient
-from app.core.llm.groq_client import GroqClient
 from app.core.llm.types import LLMResponse, ToolCallRequest
-
-from app.core.services.state_manager import StateManager
-from app.core.services.requirements import RequirementsService
-from app.core.gap_engine import GapEngine
-from app.agents.checker import CheckerAgent
-from app.agents.mermaid import MermaidAgent
-from app.agents.analyst import AnalystAgent
-from app.agents.workbook import WorkbookAgent
-from app.agents.use_case import UseCaseAgent
+from app.core.llm.usage import llm_agent
 
 from app.core.services.mapper import DomainMapper
+from app.core.services.state_manager import ARTIFACTS, CHAT_HISTORY, LEDGER
+from app.core.services.work_scheduler import WorkPriority, work_context
+from app.core.services.task_supervisor import TaskKind
 from app.domain.models.state import SessionState
-from app.core.services.publisher import PublishService
-
-# Persistence & RAG
-from app.core.interfaces.repository import ISessionRepository
-from app.infrastructure.knowledge.local_store import LocalPolicyStore
+from app.service_container import ServiceContainer
 
 # Tooling
 from app.core.tools.base import ToolContext
-from app.core.tools.registry import ToolRegistry
-from app.core.tools.definitions import UpdateRequirementsTool, TriggerVisualizationTool, InspectArtifactTool, PatchArtifactTool
 
 # Validation & Context
 from app.core.services.validator import ConsistencyValidator
 from app.domain.models.validation import ComplianceIssue
 
 from app.core.services.edit_strategies import EditStrategyFactory
+from app.core.services.fingerprint import artifact_fingerprint
+from app.core.services.incremental import ledger_basis
+from app.core.services.progress import ProgressThrottle
+from app.core.services.completion_cache import bypass_completion_cache
 from app.core.services.context import system_context
 
 # Prompts
@@ -47,31 +39,35 @@ from app.utils.logger import setup_logger
 
 logger = setup_logger("Orchestrator")
 
+INTERRUPTED_NOTE = "_(Interrupted by a newer message.)_"
+
 class Orchestrator:
-    def __init__(self, session_id: str, emit: Callable, repository: ISessionRepository):
+    def __init__(self, session_id: str, emit: Callable, services: ServiceContainer):
         self.session_id = session_id
         self.emit = emit # Raw emitter
         
-        # 1. Infrastructure
-        self.openai_client: ILLMClient = OpenAIClient()
-        self.groq_client: ILLMClient = GroqClient()
-        self.policy_store = LocalPolicyStore()
+        # 1. Shared Infrastructure (process lifetime, pooled HTTP transports)
+        self.openai_client: ILLMClient = services.openai_client
+        self.groq_client: ILLMClient = services.groq_client
+        # Routed per task type, with provider failover (see LLMGateway)
+        self.llm: ILLMClient = services.llm_gateway
+        self.policy_store = services.policy_store
         
-        # 2. Domain Services
-        self.state_manager = StateManager(repository)
-        self.gap_engine = GapEngine()
-        self.checker_agent = CheckerAgent(self.groq_client, self.policy_store)
-        self.requirements_service = RequirementsService(
-            self.state_manager,
-            self.gap_engine,
-            self.checker_agent
-        )
-
-        # 3. Artifact Agents
-        self.mermaid_agent = MermaidAgent(self.groq_client)
-        self.analyst_agent = AnalystAgent(self.groq_client)
-        self.workbook_agent = WorkbookAgent(self.groq_client)
-        self.use_case_agent = UseCaseAgent(self.groq_client)
+        # 2. Domain Services (stateless, shared)
+        self.state_manager = services.state_manager
+        self.gap_engine = services.gap_engine
+        self.checker_agent = services.checker_agent
+        self.requirements_service = services.requirements_service
+        self.publish_service = services.publish_service
+        self.visual_sync = services.visual_sync
+        self.history_window = services.history_window
+        self.supervisor = services.task_supervisor
+
+        # 3. Artifact Agents (stateless, shared)
+        self.mermaid_agent = services.mermaid_agent
+        self.analyst_agent = services.analyst_agent
+        self.workbook_agent = services.workbook_agent
+        self.use_case_agent = services.use_case_agent
 
         # Maps artifact_type -> Async Generator Function
         self.artifact_generators: Dict[str, Callable[[SessionState], Awaitable[Any]]] = {
@@ -81,6 +77,19 @@ class Orchestrator:
             "use_case": self.use_case_agent.generate,
         }
 
+        # Generators that accept 'on_progress' (partial artifact of the items completed so far)
+        self.progressive_artifacts: Set[str] = {"user_story", "workbook", "use_case"}
+        # Generators that patch the previous draft from a ledger diff ('regenerate' forces a full run)
+        self.incremental_artifacts: Set[str] = {"user_story", "use_case"}
+
+        # Maps artifact_type -> Input Key Function (content-addressed regeneration skip)
+        self.artifact_input_keys: Dict[str, Callable[[SessionState], str]] = {
+            "mermaid_diagram": self.mermaid_agent.input_key,
+            "user_story": self.analyst_agent.input_key,
+            "workbook": self.workbook_agent.input_key,
+            "use_case": self.use_case_agent.input_key,
+        }
+
         # Maps artifact_type -> Sync Validator Function
         # Signature: (content_dict, state) -> List[ComplianceIssue]
         self.artifact_validators: Dict[str, Callable[[Dict, SessionState], List[ComplianceIssue]]] = {
@@ -91,53 +100,128 @@ class Orchestrator:
         }
 
         self.tasks: Dict[str, asyncio.Task] = {}
-
-        # 4. Tool Registry
+        # Artifacts regenerated speculatively from a ledger change during the current turn
+        self._speculated: Set[str] = set()
+
+        # Chat turn in flight; a newer USER_MESSAGE cancels it (see supersede_turn)
+        self._turn_task: Optional[asyncio.Task] = None
+        self._turn_ticket = 0
+        # Artifact types scheduled by the current turn (cancelled together with it)
+        self._turn_spawned: Set[str] = set()
+        # Documentation upload in flight (one at a time, see request_publish)
+        self._publish_task: Optional[asyncio.Task] = None
+
+        # 4. Tool Registry (shared) + per-session service bindings
         self.services = {
             "requirements_service": self.requirements_service,
             "scheduler": self._schedule_artifact_task
         }
-        self.registry = ToolRegistry()
-        self.registry.register(UpdateRequirementsTool())
-        self.registry.register(TriggerVisualizationTool())
-        self.registry.register(InspectArtifactTool())
-        self.registry.register(PatchArtifactTool())
-        self.publish_service = PublishService()
-
-    async def emit_mapped(self, message_dict: Dict[str, Any]):
-        """Helper to emit strictly typed messages from Mapper."""
-        await self.emit(message_dict["type"], message_dict["payload"])
-
-    async def handle_user_message(self, message: str):
-        # 1. Load State (Ensures we act on persisted data)
+        self.registry = services.tool_registry
+        self.tool_executor = services.tool_executor
+
+    async def emit_mapped(self, message_dict: Dict[str, Any], emit: Optional[Callable] = None):
+        """
+        Helper to emit strictly typed messages from Mapper.
+        'emit' targets a single subscriber instead of the session broadcast.
+        """
+        await (emit or self.emit)(message_dict["type"], message_dict["payload"])
+
+    def supersede_turn(self) -> int:
+        """
+        Called as soon as a USER_MESSAGE arrives (before it waits in the chat lane).
+        Cancels the in-flight turn, including its provider request, tool calls and
+        the artifact tasks it spawned. Returns the ticket of the new turn.
+        """
+        self._turn_ticket += 1
+        turn = self._turn_task
+        if turn and not turn.done() and not turn.cancelling():
+            logger.info(f"✋ Superseding the in-flight turn for {self.session_id}")
+            turn.cancel()
+        return self._turn_ticket
+
+    async def handle_user_message(self, message: str, ticket: Optional[int] = None, message_id: Optional[str] = None):
+        # Every tab of the session shows the message before the turn's reply streams in
+        await self.emit_mapped(DomainMapper.to_user_message(message, message_id))
+
+        # Recorded before the (cancellable) turn starts: a message superseded before
+        # the turn's first step must still be in history for the newer turn and the restore
         state = await self.state_manager.get_or_create_session(self.session_id)
-        
-        # 2. Append User Message
         state.chat_history.append({"role": "user", "content": message})
-        await self.state_manager.save_session(state)
+        await self.state_manager.save_session(state, CHAT_HISTORY)
+
+        if ticket is not None and ticket != self._turn_ticket:
+            logger.info("⏭️ Skipped a superseded queued message (recorded in history)")
+            return
+
+        # LLM calls of the turn (incl. tools and audits) are admitted as interactive work
+        with work_context(self.session_id, WorkPriority.INTERACTIVE):
+            turn = self.supervisor.spawn(self.session_id, TaskKind.TURN, "turn", self._run_turn(message))
+        self._turn_task = turn
+        try:
+            await turn
+        except asyncio.CancelledError:
+            # Our own cancellation (shutdown) propagates; a superseded turn just ends
+            if asyncio.current_task().cancelling():
+                raise
+            logger.info(f"🛑 Turn cancelled for {self.session_id}")
+
+    async def _run_turn(self, message: str):
+        # Write-behind: every save in the turn (user message, tool batches, reply,
+        # ledger updates) is coalesced into one flush when the turn ends.
+        # Scoped to the turn task: edits and generators keep writing through meanwhile.
+        async with self.state_manager.unit_of_work(self.session_id):
+            await self._execute_turn(message)
+
+    async def _execute_turn(self, message: str):
+        # 1. Load State (the user message is already recorded, see handle_user_message)
+        state = await self.state_manager.get_or_create_session(self.session_id)
+        self._speculated.clear()
+        self._turn_spawned.clear()
         
         # Notify UI that we are working
         await self.emit_mapped(DomainMapper.to_status_update("thinking", "Processing..."))
         
         tool_context = ToolContext(state, self.emit, self.services)
 
-        #INJECT CONTEXT INTO SYSTEM PROMPT
+        # PROMPT LAYOUT (prefix-cache friendly): static instructions -> history -> ledger.
+        # Only the trailing ledger block changes between turns, so the provider can
+        # reuse the cached prefix (instructions + summary + earlier history).
         context_str = system_context.build(state)
-        formatted_system_prompt = SYSTEM_MANAGER_PROMPT.format(context_block=context_str)
-        
-        messages = [{"role": "system", "content": formatted_system_prompt}] + state.chat_history
+        ledger_msg = SYSTEM_MANAGER_PROMPT.dynamic_message(role="system", context_block=context_str)
+
+        # Token-budgeted history: rolling summary + last exchanges verbatim
+        history = await self.history_window.build(state, AgentConfig.SMART_MODEL)
+        messages = [SYSTEM_MANAGER_PROMPT.static_message()] + history + [ledger_msg]
         tools_schema = self.registry.get_schemas()
         max_turns = AgentConfig.MAX_AGENT_TURNS
 
+        # Interruption bookkeeping: text streamed / tool calls issued but not yet in history
+        # (both are reset as soon as they are persisted)
+        streamed: List[str] = []
+        open_calls: List[str] = []
+
         try:
             for i in range(max_turns):
                 status_msg = "Processing..." if i == 0 else "Reviewing results..."
                 await self.emit_mapped(DomainMapper.to_status_update("thinking", status_msg))
-
-                response: LLMResponse = await self.openai_client.chat_with_tools(
-                    messages=messages,
-                    tools_schema=tools_schema,
-                )
+                streamed.clear()
+
+                # STREAMING: Forward text deltas as they arrive (Time-to-first-token).
+                # Tool calls are only surfaced once fully assembled in the final chunk.
+                response: Optional[LLMResponse] = None
+                with llm_agent(SYSTEM_MANAGER_PROMPT.name):
+                    async for chunk in self.llm.stream_chat_with_tools(
+                        messages=messages,
+                        tools_schema=tools_schema,
+                    ):
+                        if chunk.content_delta:
+                            streamed.append(chunk.content_delta)
+                            await self.emit_mapped(DomainMapper.to_chat_delta(chunk.content_delta))
+                        if chunk.response:
+                            response = chunk.response
+
+                if response is None:
+                    raise RuntimeError("LLM stream ended without a final response.")
                 
                 if response.tool_calls:
                     # Update UI status
@@ -159,28 +243,15 @@ class Orchestrator:
                     }
                     messages.append(assistant_msg)
                     state.chat_history.append(assistant_msg)
-                    await self.state_manager.save_session(state)
-
-                    for tool_call in response.tool_calls:
-                        tool_name = tool_call.function_name
-                        tool = self.registry.get_tool(tool_name)
-                        tool_output_str = ""
-
-                        if tool:
-                            try:
-                                args = json.loads(tool_call.arguments)
-                                logger.info(f"🛠️ Tool Execution: {tool_name}")
-                                # Tools handle their own Mapper logic for Side Effects
-                                tool_output_str = await tool.execute(args, tool_context)
-                            except Exception as e:
-                                error_msg = f"Tool execution failed: {str(e)}"
-                                logger.error(f"❌ {error_msg}")
-                                tool_output_str = json.dumps({"error": error_msg})
-                        else:
-                            error_msg = f"Unknown tool: {tool_name}"
-                            logger.error(f"❌ {error_msg}")
-                            tool_output_str = json.dumps({"error": error_msg})
+                    # The streamed text is in history now (as this message's content)
+                    streamed.clear()
+                    open_calls = [tc.call_id for tc in response.tool_calls]
+                    await self.state_manager.save_session(state, CHAT_HISTORY)
+
+                    # Independent calls run concurrently; outputs come back in call order
+                    tool_outputs = await self.tool_executor.run(response.tool_calls, tool_context)
 
+                    for tool_call, tool_output_str in zip(response.tool_calls, tool_outputs):
                         tool_msg = {
                             "role": "tool",
                             "tool_call_id": tool_call.call_id,
@@ -188,40 +259,93 @@ class Orchestrator:
                         }
                         messages.append(tool_msg)
                         state.chat_history.append(tool_msg)
+                    open_calls = []
                     
-                    await self.state_manager.save_session(state)
+                    await self.state_manager.save_session(state, CHAT_HISTORY)
                     continue
                 
                 if response.content:
                     state.chat_history.append({"role": "assistant", "content": response.content})
-                    await self.state_manager.save_session(state)
+                    await self.state_manager.save_session(state, CHAT_HISTORY)
                     
-                    # STRICT MAPPING: Chat Delta
-                    await self.emit_mapped(DomainMapper.to_chat_delta(response.content))
+                    # Content was already streamed to the UI as CHAT_DELTA chunks.
                     
                     # Reset Status
                     await self.emit_mapped(DomainMapper.to_status_update("idle", "Ready"))
                     break 
             
+        except asyncio.CancelledError:
+            # Superseded by a newer message: leave a consistent, annotated history
+            self._record_interruption(state, "".join(streamed), open_calls)
+            await self.state_manager.save_session(state, CHAT_HISTORY)
+            for artifact_type in self._turn_spawned:
+                task = self.tasks.get(artifact_type)
+                if task and not task.done():
+                    task.cancel()
+            await self.emit_mapped(DomainMapper.to_status_update("idle", "Interrupted"))
+            raise
+
         except Exception as e:
             logger.error(f"💀 Orchestrator Error: {e}")
             traceback.print_exc()
             await self.emit_mapped(DomainMapper.to_status_update("idle", "Error processing request"))
             await self.emit_mapped(DomainMapper.to_chat_delta("I encountered an internal error."))
 
-    def _schedule_artifact_task(self, artifact_type: str):
+    @staticmethod
+    def _record_interruption(state: SessionState, partial_text: str, open_calls: List[str]):
+        """
+        Closes an interrupted turn in chat_history:
+        every issued tool call gets a result (the provider rejects dangling calls),
+        and the not yet persisted partial reply (already shown to the user) is kept with a note.
+        """
+        for call_id in open_calls:
+            state.chat_history.append({
+                "role": "tool",
+                "tool_call_id": call_id,
+                "content": json.dumps({"status": "cancelled", "message": "Interrupted by a newer user message."})
+            })
+        state.chat_history.append({
+            "role": "assistant",
+            "content": f"{partial_text}\n\n{INTERRUPTED_NOTE}" if partial_text else INTERRUPTED_NOTE
+        })
+
+    def _schedule_artifact_task(self, artifact_type: str, speculative: bool = False, regenerate: bool = False) -> bool:
+        """
+        (Re)starts the generator for 'artifact_type'. Returns False (no-op) when a
+        speculative run started from this turn's ledger change is in flight or done.
+        'regenerate': the user asked for a fresh version (no skip, no cached completion).
+        """
+        if not speculative and not regenerate and artifact_type in self._speculated:
+            logger.info(f"⏭️ {artifact_type} already generating from the latest ledger update")
+            return False
+
+        if not self.supervisor.accepting:
+            logger.info(f"🚦 Shutting down: not starting {artifact_type}")
+            return False
+
         if artifact_type in self.tasks:
             task = self.tasks[artifact_type]
             if not task.done():
                 task.cancel()
         
-        new_task = asyncio.create_task(self._run_artifact_generator(artifact_type))
+        # Generation waits behind interactive work in the global WorkScheduler
+        with work_context(self.session_id, WorkPriority.BACKGROUND):
+            new_task = self.supervisor.spawn(
+                self.session_id, TaskKind.ARTIFACT, artifact_type, self._run_artifact_generator(artifact_type, regenerate)
+            )
         self.tasks[artifact_type] = new_task
+        self._turn_spawned.add(artifact_type)
+        if speculative:
+            self._speculated.add(artifact_type)
         
         def _cleanup(t):
             if self.tasks.get(artifact_type) == t:
                 del self.tasks[artifact_type]
+                # A failed / cancelled speculative run must not swallow a later explicit trigger
+                if speculative and (t.cancelled() or not t.result()):
+                    self._speculated.discard(artifact_type)
         new_task.add_done_callback(_cleanup)
+        return True
 
     async def handle_artifact_edit(self, doc_id: str, new_content: Any):
         """
@@ -231,31 +355,35 @@ class Orchestrator:
         await self.emit_mapped(DomainMapper.to_artifact_sync(doc_id, "processing", "Validating..."))
         
         try:
-            state = await self.state_manager.get_or_create_session(self.session_id)
+            # One flush for the artifact + reverse-synced ledger (own unit: not deferred behind a running turn)
+            async with self.state_manager.unit_of_work(self.session_id):
+                state = await self.state_manager.get_or_create_session(self.session_id)
 
-            # 2. Identify the Internal Target
-            artifact_type = doc_id 
-            current_version = state.artifact_counters.get(artifact_type, 0)
+                # 2. Identify the Internal Target
+                artifact_type = doc_id 
+                current_version = state.artifact_counters.get(artifact_type, 0)
             
-            if current_version == 0:
-                current_version = 1
-                state.artifact_counters[artifact_type] = 1
+                if current_version == 0:
+                    current_version = 1
+                    state.artifact_counters[artifact_type] = 1
 
-            internal_id = f"{artifact_type}-v{current_version}"
+                internal_id = f"{artifact_type}-v{current_version}"
 
-            # 3. Validate & Parse (Strategy Pattern)
-            strategy = EditStrategyFactory.get_strategy(artifact_type)
-            parsed_content = strategy.validate_and_parse(new_content)
+                # 3. Validate & Parse (Strategy Pattern)
+                strategy = EditStrategyFactory.get_strategy(artifact_type)
+                parsed_content = strategy.validate_and_parse(new_content)
 
-            # 4. Save to State (Current State Logic)
-            state.artifacts[internal_id] = parsed_content
+                # 4. Save to State (Current State Logic)
+                state.artifacts[internal_id] = parsed_content
             
-            # 5. REVERSE SYNC (Active Ingestion)
-            # This ensures edits to Goal/Actors propagate to the Ledger
-            # so subsequent AI generations allow for these changes.
-            strategy.apply_reverse_sync(state, parsed_content)
+                # 5. REVERSE SYNC (Active Ingestion)
+                # This ensures edits to Goal/Actors propagate to the Ledger
+                # so subsequent AI generations allow for these changes.
+                strategy.apply_reverse_sync(state, parsed_content)
             
-            await self.state_manager.save_session(state)
+                await self.state_manager.save_session(state, ARTIFACTS, LEDGER)
+                # The user changed it by hand: an explicit regenerate must not be skipped
+                self._speculated.discard(artifact_type)
 
             # 6. Success Response
             await self.emit_mapped(DomainMapper.to_artifact_sync(doc_id, "synced", "Saved"))
@@ -273,20 +401,55 @@ class Orchestrator:
             await self.emit_mapped(DomainMapper.to_artifact_sync(doc_id, "error", "Internal Server Error"))
 
             
-    async def _run_artifact_generator(self, artifact_type: str):
+    async def _run_artifact_generator(self, artifact_type: str, regenerate: bool = False) -> bool:
+        """Returns True once a new version was stored and emitted."""
         # STRICT MAPPING: Status Update
         await self.emit_mapped(DomainMapper.to_status_update("working", f"Generating {artifact_type}..."))
+        progress: Optional[ProgressThrottle] = None
+        stored = False
         
         try:
             generator_func = self.artifact_generators.get(artifact_type)
             if not generator_func:
                 logger.warning(f"⚠️ No generator registered for: {artifact_type}")
-                return
+                return False
 
             state = await self.state_manager.get_or_create_session(self.session_id)
+
+            # 0. CONTENT-ADDRESSED SKIP
+            # Same ledger context, prompt, model and an unedited current version:
+            # the LLM would only reproduce what we already have.
+            input_key_func = self.artifact_input_keys.get(artifact_type)
+            input_key = input_key_func(state) if input_key_func else None
+            current_version = state.artifact_counters.get(artifact_type, 0)
+            current_id = f"{artifact_type}-v{current_version}"
+            current_content = state.artifacts.get(current_id)
+
+            if (
+                not regenerate and input_key and current_content is not None
+                and state.artifact_fingerprints.get(current_id) == artifact_fingerprint(input_key, current_content)
+            ):
+                logger.info(f"♻️ Inputs unchanged: keeping {current_id}")
+                await self.emit_mapped(DomainMapper.to_artifact_open(artifact_type, current_content, doc_id=artifact_type))
+                await self.emit_mapped(DomainMapper.to_status_update("success", f"{artifact_type} is up to date"))
+                return True
             
             # 1. EXECUTION
-            result_model = await generator_func(state)
+            # Ledger as read BEFORE the LLM call: the basis the next incremental run diffs against
+            basis = ledger_basis(state, artifact_type)
+            options: Dict[str, Any] = {}
+            if artifact_type in self.incremental_artifacts:
+                options["regenerate"] = regenerate
+            # An explicit regenerate must reach the provider (the fresh answer still refills the cache)
+            with bypass_completion_cache() if regenerate else nullcontext():
+                if artifact_type in self.progressive_artifacts and AppConfig.ARTIFACT_PROGRESS_INTERVAL > 0:
+                    progress = self._progress_throttle(artifact_type)
+                    try:
+                        result_model = await generator_func(state, on_progress=progress.push, **options)
+                    finally:
+                        progress.close()
+                else:
+                    result_model = await generator_func(state, **options)
             new_content = result_model.model_dump()
             
             # 2. DYNAMIC VALIDATION (The "Reviewer")
@@ -306,7 +469,14 @@ class Orchestrator:
                 
                 internal_id = f"{artifact_type}-v{new_version}"
                 state.artifacts[internal_id] = new_content
-                await self.state_manager.save_session(state)
+                if input_key:
+                    # Inputs as read BEFORE the LLM call (the ledger may have moved on since)
+                    state.artifact_fingerprints[internal_id] = artifact_fingerprint(input_key, new_content)
+                # Only the latest version is ever diffed
+                state.artifact_bases.pop(f"{artifact_type}-v{current_version}", None)
+                state.artifact_bases[internal_id] = basis
+                await self.state_manager.save_session(state, ARTIFACTS)
+                stored = True
                 
                 # 4. Emission (EXTERNAL)
                 try:
@@ -328,6 +498,7 @@ class Orchestrator:
 
                     await self.emit_mapped(DomainMapper.to_status_update("success", f"Generated {artifact_type}"))
                     logger.info(f"✅ Generator FINISHED: {internal_id} -> Wire: {wire_id}")
+                    return True
                     
                 except Exception as map_err:
                     logger.error(f"🔥 MAPPING ERROR for {artifact_type}: {map_err}")
@@ -335,24 +506,73 @@ class Orchestrator:
                     raise map_err 
                 
         except asyncio.CancelledError:
+            # Propagates after the cleanup below, so the supervisor counts the run as cancelled
             logger.info(f"🛑 Generator Cancelled: {artifact_type}")
+            raise
         except Exception as e:
             logger.error(f"❌ Generator Failed: {e}")
             await self.emit_mapped(DomainMapper.to_status_update("idle", f"Failed to generate {artifact_type}"))
             traceback.print_exc()
         finally:
+            if progress is not None and progress.sent and not stored:
+                await self._reset_progress(artifact_type, progress)
             await self.emit_mapped(DomainMapper.to_status_update("idle", "Ready"))
+        return False
 
-    async def load_initial_state(self, is_new_session: bool = False):
+    async def _reset_progress(self, artifact_type: str, progress: ProgressThrottle):
+        """
+        The run ended without a new version after partial items were shown:
+        puts the stored version back (or an empty one), which is also what the event log replays.
+        """
+        try:
+            state = await self.state_manager.get_or_create_session(self.session_id)
+            current_id = f"{artifact_type}-v{state.artifact_counters.get(artifact_type, 0)}"
+            content = state.artifacts.get(current_id)
+            if content is None:
+                # Nothing stored yet: same shape as the progress frames, without items
+                current_id = "an empty draft"
+                content = {field: [] for field in (progress.last or {})}
+            await self.emit_mapped(DomainMapper.to_artifact_update(artifact_type, content, doc_id=artifact_type))
+            logger.info(f"↩️ Partial {artifact_type} discarded, back to {current_id}")
+        except Exception as e:
+            logger.error(f"❌ Could not reset partial {artifact_type}: {e}")
+
+    def _progress_throttle(self, artifact_type: str) -> ProgressThrottle:
+        """
+        Progressive rendering: the completed items so far, as throttled ARTIFACT_UPDATEs.
+        The first frame opens the tab (an update alone is ignored by a client without it).
         """
-        Called on WebSocket connection. 
+        opened = False
+
+        async def send(partial: Dict[str, Any]):
+            nonlocal opened
+            if not opened:
+                opened = True
+                await self.emit_mapped(DomainMapper.to_artifact_open(artifact_type, partial, doc_id=artifact_type))
+            await self.emit_mapped(DomainMapper.to_artifact_update(artifact_type, partial, doc_id=artifact_type))
+
+        return ProgressThrottle(AppConfig.ARTIFACT_PROGRESS_INTERVAL, send, name=artifact_type)
+
+    async def load_initial_state(
+        self,
+        is_new_session: bool = False,
+        emit: Optional[Callable] = None,
+        epoch: Optional[str] = None,
+        seq: Optional[int] = None
+    ):
+        """
+        Called on WebSocket connection (when missed events cannot be replayed).
         Restores the frontend to the last known backend state.
+        'emit' restricts the restore to the joining subscriber (other tabs are already in sync).
+        'epoch' / 'seq' identify the session event log position the snapshot covers.
         """
         logger.info(f"🔄 [Orchestrator] Loading initial state for session: {self.session_id} (New={is_new_session})")
         
         try:
             # 1. EMIT SESSION IDENTITY (Must be first)
-            await self.emit_mapped(DomainMapper.to_session_established(self.session_id, is_new_session))
+            await self.emit_mapped(
+                DomainMapper.to_session_established(self.session_id, is_new_session, epoch=epoch, seq=seq), emit
+            )
 
             # 2. Get State
             state = await self.state_manager.get_or_create_session(self.session_id)
@@ -360,13 +580,13 @@ class Orchestrator:
             logger.info(f"   - Found {len(state.artifacts)} stored artifacts.")
             
             # 3. Push Ledger State
-            await self.emit_mapped(DomainMapper.to_state_update(state))
+            await self.emit_mapped(DomainMapper.to_state_update(state), emit)
             
             # 4. Push Chat History
             # We wrap this in a specific try/catch to identify Mapping errors specifically
             try:
                 history_msg = DomainMapper.to_chat_history(state.chat_history)
-                await self.emit_mapped(history_msg)
+                await self.emit_mapped(history_msg, emit)
                 logger.info("   ✅ Emitted CHAT_HISTORY")
             except Exception as history_err:
                 logger.error(f"   ❌ Failed to emit history: {history_err}")
@@ -385,49 +605,82 @@ class Orchestrator:
                         artifact_type, 
                         content, 
                         doc_id=wire_id
-                    ))
+                    ), emit)
             
             # 6. Signal Ready
-            await self.emit_mapped(DomainMapper.to_status_update("idle", "Session Restored"))
+            await self.emit_mapped(DomainMapper.to_status_update("idle", "Session Restored"), emit)
             logger.info("   ✨ Session Restore Complete")
 
         except Exception as e:
             logger.error(f"🔥 Critical Error during load_initial_state: {e}")
             traceback.print_exc()
 
-    async def handle_visual_sync(self, doc_id: str, visual_data: str, fmt: str):
+    async def handle_visual_sync(
+        self, doc_id: str, visual_data: str, fmt: str,
+        digest: Optional[str] = None, emit: Optional[Callable] = None
+    ):
         """
-        Stores the visual representation (SVG) sent by the frontend.
-        Associates it with the CURRENT version of the artifact.
+        Stores the visual representation (SVG) sent by the frontend in one message.
+        Associates it with the CURRENT version of the artifact (by digest, see VisualSyncService).
         """
         try:
-            state = await self.state_manager.get_or_create_session(self.session_id)
-            
-            # 1. Resolve to Internal Versioned ID
-            # The frontend sends 'mermaid_diagram' (wire ID).
-            # We assume this visual corresponds to the latest generated version.
-            artifact_type = doc_id
-            current_version = state.artifact_counters.get(artifact_type, 0)
-            
-            if current_version == 0:
-                logger.warning(f"⚠️ Received visual sync for unknown artifact: {doc_id}")
-                return
-
-            internal_id = f"{artifact_type}-v{current_version}"
-            
-            # 2. Store
-            state.visual_artifacts[internal_id] = visual_data
-            
-            # 3. Persist
-            await self.state_manager.save_session(state)
-            
-            logger.info(f"🖼️ Saved visual artifact ({fmt}) for {internal_id} (Size: {len(visual_data)} chars)")
+            status = await self.visual_sync.upload(self.session_id, doc_id, visual_data, digest)
+            logger.info(f"🖼️ Visual sync ({fmt}) for {doc_id}: {status} (Size: {len(visual_data)} chars)")
+            if digest:
+                await self.emit_mapped(DomainMapper.to_visual_ack(doc_id, digest, status), emit)
 
         except Exception as e:
             logger.error(f"🔥 Visual Sync Failed: {e}")
             traceback.print_exc()
 
+    async def handle_visual_offer(self, doc_id: str, digest: str, emit: Optional[Callable] = None):
+        """
+        Hash-first handshake. Replies (to the sender only) whether the blob must be uploaded.
+        """
+        try:
+            status = await self.visual_sync.offer(self.session_id, doc_id, digest)
+            logger.info(f"🖼️ Visual offer for {doc_id} ({digest[:12]}): {status}")
+            chunk_size = AppConfig.VISUAL_CHUNK_SIZE if status == "upload_required" else None
+            await self.emit_mapped(DomainMapper.to_visual_ack(doc_id, digest, status, chunk_size), emit)
+
+        except Exception as e:
+            logger.error(f"🔥 Visual Offer Failed: {e}")
+            traceback.print_exc()
+
+    async def handle_visual_chunk(
+        self, doc_id: str, digest: str, index: int, total: int, data: str,
+        emit: Optional[Callable] = None
+    ):
+        try:
+            status = await self.visual_sync.receive_chunk(self.session_id, doc_id, digest, index, total, data)
+            if status is not None:
+                logger.info(f"🖼️ Visual upload for {doc_id} ({digest[:12]}, {total} chunks): {status}")
+                await self.emit_mapped(DomainMapper.to_visual_ack(doc_id, digest, status), emit)
+
+        except Exception as e:
+            logger.error(f"🔥 Visual Chunk Failed: {e}")
+            traceback.print_exc()
+
     
+    async def request_publish(self, target: str):
+        """
+        FAST-lane entry point for PROJECT_PUBLISH. Starting from the lane keeps the ordering
+        (every edit received before it is applied); the upload itself runs as a supervised
+        task, so edits queued behind it are not blocked by a slow publish target.
+        """
+        if self._publish_task and not self._publish_task.done():
+            logger.info(f"⏭️ Publish already in progress for {self.session_id}")
+            await self.emit_mapped(DomainMapper.to_status_update("working", "Publishing is already in progress..."))
+            return
+
+        if not self.supervisor.accepting:
+            logger.info(f"🚦 Shutting down: not publishing to {target}")
+            return
+
+        self._publish_task = self.supervisor.spawn(
+            self.session_id, TaskKind.PUBLISH, f"publish:{target}", self.handle_publish(target)
+        )
+
     async def handle_publish(self, target: str):
         """
         Orchestrates the publishing workflow.
@@ -441,7 +694,7 @@ class Orchestrator:
             success_msg = f"I have successfully published the requirements to {target.title()}.\n\n[View Documentation]({doc_url})"
             
             state.chat_history.append({"role": "assistant", "content": success_msg})
-            await self.state_manager.save_session(state)
+            await self.state_manager.save_session(state, CHAT_HISTORY)
             await self.emit_mapped(DomainMapper.to_chat_delta(success_msg))
 
         except Exception as e:
@@ -0,0 +1,138 @@
+# app/core/services/completion_cache.py
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from app.core.interfaces.completion_store import ICompletionStore
+from app.core.services.fingerprint import content_hash, digest
+from app.utils.logger import setup_logger
+
+logger = setup_logger("CompletionCache")
+
+# Set by callers that need a fresh completion (the result is still stored for later hits)
+_bypass: ContextVar[bool] = ContextVar("completion_cache_bypass", default=False)
+
+@contextmanager
+def bypass_completion_cache() -> Iterator[None]:
+    """Every structured completion inside the block goes to the provider."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+def cache_bypassed() -> bool:
+    return _bypass.get()
+
+@dataclass
+class _CacheCounters:
+    memory_hits: int = 0
+    store_hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    evictions: int = 0
+    store_errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        hits = self.memory_hits + self.store_hits
+        lookups = hits + self.misses
+        return hits / lookups if lookups else 0.0
+
+class CompletionCache:
+    """
+    Two-tier cache for structured completions.
+    1. Memory: LRU bounded by 'max_entries', entries expire after 'ttl' seconds.
+    2. Store (optional ICompletionStore, e.g. SQLite): survives restarts, promoted into memory on hit.
+    Keys are canonical hashes of (provider, model, temperature, messages, response JSON schema),
+    so any byte of prompt or schema change is a different entry.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, store: Optional[ICompletionStore] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.store = store
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._schemas: Dict[Type[BaseModel], str] = {}
+        self.counters = _CacheCounters()
+
+    def key(
+        self,
+        provider: str,
+        model: str,
+        temperature: Optional[float],
+        messages: List[Dict[str, Any]],
+        response_model: Type[BaseModel]
+    ) -> str:
+        schema = self._schemas.get(response_model)
+        if schema is None:
+            schema = self._schemas[response_model] = content_hash(response_model.model_json_schema())
+        return digest(provider, model, repr(temperature), content_hash(messages), schema)
+
+    async def get(self, key: str) -> Optional[str]:
+        # 1. Memory tier
+        entry = self._memory.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._memory.move_to_end(key)
+                self.counters.memory_hits += 1
+                return value
+            del self._memory[key]
+
+        # 2. Durable tier (a failing store degrades to a miss, never to an error)
+        if self.store is not None:
+            try:
+                value = await self.store.get(key)
+            except Exception as e:
+                self.counters.store_errors += 1
+                logger.warning(f"⚠️ Completion store read failed: {e}")
+                value = None
+            if value is not None:
+                self.counters.store_hits += 1
+                self._remember(key, value)
+                return value
+
+        self.counters.misses += 1
+        return None
+
+    async def put(self, key: str, value: str):
+        self._remember(key, value)
+        if self.store is not None:
+            try:
+                await self.store.put(key, value, self.ttl)
+            except Exception as e:
+                self.counters.store_errors += 1
+                logger.warning(f"⚠️ Completion store write failed: {e}")
+
+    async def close(self):
+        if self.store is not None:
+            await self.store.close()
+
+    def _remember(self, key: str, value: str):
+        self._memory[key] = (time.monotonic() + self.ttl, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.counters.evictions += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        c = self.counters
+        return {
+            "entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "ttl_s": self.ttl,
+            "durable": self.store is not None,
+            "memory_hits": c.memory_hits,
+            "store_hits": c.store_hits,
+            "misses": c.misses,
+            "bypassed": c.bypassed,
+            "evictions": c.evictions,
+            "store_errors": c.store_errors,
+            "hit_rate": round(c.hit_rate, 4),
+        }
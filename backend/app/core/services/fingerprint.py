@@ -0,0 +1,26 @@
+# app/core/services/fingerprint.py
+import hashlib
+import json
+from typing import Any, Optional
+
+def digest(*parts: str) -> str:
+    """SHA-256 over length-delimited parts (no ambiguity between ('ab','c') and ('a','bc'))."""
+    h = hashlib.sha256()
+    for part in parts:
+        data = part.encode("utf-8")
+        h.update(len(data).to_bytes(8, "big"))
+        h.update(data)
+    return h.hexdigest()
+
+def content_hash(content: Any) -> str:
+    """Canonical hash of a JSON-like value (key order independent)."""
+    return digest(json.dumps(content, sort_keys=True, separators=(",", ":"), default=str))
+
+def artifact_fingerprint(input_key: str, draft: Optional[Any]) -> str:
+    """
+    Identity of one generator run: its inputs (prompt version, model, context block;
+    see the agents' input_key) plus the draft it starts from.
+    Stored with each generated version as input_key + hash(generated content), i.e.
+    what the NEXT run would see if neither the ledger nor the artifact changes.
+    """
+    return digest(input_key, content_hash(draft) if draft is not None else "-")
@@ -0,0 +1,109 @@
+# app/core/services/history_window.py
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import AgentConfig
+from app.core.llm.tokens import TokenCounter
+from app.core.services.state_manager import StateManager, CHAT_HISTORY
+from app.agents.summarizer import HistorySummarizerAgent, render_transcript
+from app.domain.models.state import SessionState
+from app.utils.logger import setup_logger
+
+logger = setup_logger("HistoryWindow")
+
+# Compaction shrinks the verbatim tail to this share of the budget, so the next
+# few turns fit again without another summarization call (hysteresis)
+COMPACT_TARGET = 0.5
+SUMMARY_HEADER = "CONVERSATION SUMMARY (earlier turns, condensed):"
+
+class HistoryWindow:
+    """
+    Token-budgeted view of the chat history for the manager LLM.
+
+    The prompt history is [summary] + chat_history[cursor:]. While it fits the
+    model's budget nothing changes between turns (stable prefix, no extra calls).
+    Once it overflows, everything except the last K exchanges (an exchange starts
+    at a user message, so tool calls are never split from their results) is folded
+    into the rolling summary and the cursor jumps forward.
+
+    state.chat_history itself is never trimmed: the UI restore still shows every message.
+    """
+
+    def __init__(self, summarizer: HistorySummarizerAgent, state_manager: StateManager):
+        self.summarizer = summarizer
+        self.state_manager = state_manager
+        self._counters: Dict[str, TokenCounter] = {}
+
+    def budget_for(self, model: str) -> int:
+        return AgentConfig.HISTORY_TOKEN_BUDGETS.get(model, AgentConfig.DEFAULT_HISTORY_TOKEN_BUDGET)
+
+    def counter_for(self, model: str) -> TokenCounter:
+        if model not in self._counters:
+            self._counters[model] = TokenCounter(model)
+        return self._counters[model]
+
+    async def build(self, state: SessionState, model: str) -> List[Dict[str, Any]]:
+        """
+        Returns the history messages to send (a new list, safe to append to).
+        May compact: updates the summary on 'state' and saves the CHAT_HISTORY section.
+        """
+        history = state.chat_history
+        counter = self.counter_for(model)
+        budget = self.budget_for(model)
+
+        # 1. Validate the cursor (history can be replaced wholesale, e.g. by a restore)
+        cursor = state.history_summary_cursor
+        if cursor > len(history):
+            cursor, state.history_summary = 0, None
+
+        tail = history[cursor:]
+        if self._cost(counter, state.history_summary, tail) <= budget:
+            return self._assemble(state.history_summary, tail)
+
+        # 2. Over budget: keep the last K exchanges verbatim (fewer if they exceed the compaction target)
+        starts = [i for i in range(cursor, len(history)) if history[i].get("role") == "user"]
+        keep = min(AgentConfig.HISTORY_KEEP_EXCHANGES, len(starts))
+        while keep > 1 and counter.count_messages(history[starts[-keep]:]) > budget * COMPACT_TARGET:
+            keep -= 1
+        split = starts[-keep] if keep else cursor
+
+        if split <= cursor:
+            logger.warning(f"⚠️ Current exchange alone exceeds the {budget} token budget ({model}). Sending as-is.")
+            return self._assemble(state.history_summary, tail)
+
+        # 3. Fold [cursor:split] into the rolling summary
+        before = self._cost(counter, state.history_summary, tail)
+        state.history_summary = await self._summarize(state.history_summary, history[cursor:split])
+        state.history_summary_cursor = split
+        await self.state_manager.save_session(state, CHAT_HISTORY)
+
+        window = history[split:]
+        after = self._cost(counter, state.history_summary, window)
+        logger.info(
+            f"🗜️ Compacted {split - cursor} messages into summary "
+            f"({before} -> {after} tokens, budget {budget}, {keep} exchange(s) verbatim)"
+        )
+        return self._assemble(state.history_summary, window)
+
+    # --- Internals ---
+
+    async def _summarize(self, previous: Optional[str], messages: List[Dict[str, Any]]) -> str:
+        try:
+            summary = await self.summarizer.summarize(previous, messages)
+            if summary:
+                return summary
+        except Exception as e:
+            logger.error(f"❌ Summarization failed: {e}. Using extractive fallback.")
+
+        # Fallback: keep the most recent part of the compact transcript
+        limit = AgentConfig.HISTORY_SUMMARY_MAX_WORDS * 8
+        text = "\n".join(filter(None, [previous, render_transcript(messages)]))
+        return text[-limit:]
+
+    def _cost(self, counter: TokenCounter, summary: Optional[str], tail: List[Dict[str, Any]]) -> int:
+        return counter.count_messages(self._assemble(summary, tail))
+
+    @staticmethod
+    def _assemble(summary: Optional[str], tail: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not summary:
+            return list(tail)
+        return [{"role": "system", "content": f"{SUMMARY_HEADER}\n{summary}"}] + list(tail)
@@ -0,0 +1,232 @@
+# app/core/services/incremental.py
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from app.config.settings import AgentConfig
+from app.core.services.fingerprint import content_hash
+from app.core.services.requirements import ARTIFACT_DEPENDENCIES, LEDGER_FIELDS
+from app.domain.models.state import SessionState
+from app.utils.logger import setup_logger
+
+logger = setup_logger("IncrementalGen")
+
+# Ledger sections diffed item by item; any other dependency change means a full regeneration
+ITEM_FIELDS = ("actors", "process_steps")
+
+def ledger_basis(state: SessionState, artifact_type: str) -> Dict[str, Any]:
+    """
+    What a generator read from the ledger, stored next to the version it produced
+    (see Orchestrator._run_artifact_generator) so the next run can diff against it.
+    """
+    deps = ARTIFACT_DEPENDENCIES.get(artifact_type, LEDGER_FIELDS)
+    rest = {f: state.model_dump(include={f}).get(f) for f in deps if f not in ITEM_FIELDS}
+    return {
+        "actors": [a.model_dump() for a in state.actors],
+        "process_steps": [s.model_dump() for s in state.process_steps],
+        "rest": content_hash(rest),
+    }
+
+def _norm(name: Any) -> str:
+    return str(name or "").strip().lower()
+
+def _tokens(name: Any) -> Set[str]:
+    return set(re.findall(r"\w+", _norm(name)))
+
+def _mentions(item_actor: Any, role_name: str) -> bool:
+    """Token containment: 'Loan Officer' is the actor of a 'Bank loan officer' story."""
+    role = _tokens(role_name)
+    return bool(role) and role <= _tokens(item_actor)
+
+def _step_line(step: Dict[str, Any]) -> str:
+    return f"{step['step_id']}. {step['actor']} -> {step['description']}"
+
+@dataclass
+class LedgerDelta:
+    """Actor / process-step changes between a draft's basis and the current ledger."""
+    added_actors: List[Dict[str, Any]] = field(default_factory=list)
+    removed_actors: List[Dict[str, Any]] = field(default_factory=list)
+    changed_actors: List[Dict[str, Any]] = field(default_factory=list)
+    added_steps: List[Dict[str, Any]] = field(default_factory=list)
+    removed_steps: List[Dict[str, Any]] = field(default_factory=list)
+    # (old, new) pairs
+    changed_steps: List[tuple] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not any((
+            self.added_actors, self.removed_actors, self.changed_actors,
+            self.added_steps, self.removed_steps, self.changed_steps,
+        ))
+
+    def touched_actors(self) -> Set[str]:
+        """Normalized role names whose items must be revisited."""
+        names = {_norm(a["role_name"]) for a in self.added_actors + self.removed_actors + self.changed_actors}
+        names.update(_norm(s["actor"]) for s in self.added_steps + self.removed_steps)
+        for old, new in self.changed_steps:
+            names.update((_norm(old["actor"]), _norm(new["actor"])))
+        return names
+
+    def summary(self) -> str:
+        return (
+            f"actors +{len(self.added_actors)}/-{len(self.removed_actors)}/~{len(self.changed_actors)}, "
+            f"steps +{len(self.added_steps)}/-{len(self.removed_steps)}/~{len(self.changed_steps)}"
+        )
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for a in self.added_actors:
+            lines.append(f"+ ACTOR ADDED: [{a['role_name']}]: {a.get('responsibilities') or 'No specific role defined'}")
+        for a in self.removed_actors:
+            lines.append(f"- ACTOR REMOVED: [{a['role_name']}]")
+        for a in self.changed_actors:
+            lines.append(f"~ ACTOR CHANGED: [{a['role_name']}]: {a.get('responsibilities') or 'No specific role defined'}")
+        for s in self.added_steps:
+            lines.append(f"+ STEP ADDED: {_step_line(s)}")
+        for s in self.removed_steps:
+            lines.append(f"- STEP REMOVED: {_step_line(s)}")
+        for old, new in self.changed_steps:
+            lines.append(f"~ STEP CHANGED: {_step_line(new)} (was: {_step_line(old)})")
+        return "\n".join(lines)
+
+def diff_ledger(basis: Dict[str, Any], current: Dict[str, Any]) -> LedgerDelta:
+    delta = LedgerDelta()
+
+    old_actors = {_norm(a["role_name"]): a for a in basis.get("actors", [])}
+    new_actors = {_norm(a["role_name"]): a for a in current.get("actors", [])}
+    for key, actor in new_actors.items():
+        if key not in old_actors:
+            delta.added_actors.append(actor)
+        elif actor != old_actors[key]:
+            delta.changed_actors.append(actor)
+    delta.removed_actors = [a for key, a in old_actors.items() if key not in new_actors]
+
+    old_steps = {s["step_id"]: s for s in basis.get("process_steps", [])}
+    new_steps = {s["step_id"]: s for s in current.get("process_steps", [])}
+    for step_id, step in new_steps.items():
+        if step_id not in old_steps:
+            delta.added_steps.append(step)
+        elif step != old_steps[step_id]:
+            delta.changed_steps.append((old_steps[step_id], step))
+    delta.removed_steps = [s for step_id, s in old_steps.items() if step_id not in new_steps]
+
+    return delta
+
+@dataclass
+class IncrementalPlan:
+    """
+    A partial regeneration: the LLM only sees (and returns) the items tied to
+    changed actors/steps; everything else is carried over from the draft verbatim.
+    """
+    artifact_type: str
+    delta: LedgerDelta
+    previous: List[Dict[str, Any]]
+    affected: List[Dict[str, Any]]
+
+    @property
+    def affected_ids(self) -> Set[str]:
+        return {item["id"] for item in self.affected}
+
+    def untouched(self) -> List[Dict[str, Any]]:
+        ids = self.affected_ids
+        return [item for item in self.previous if item["id"] not in ids]
+
+    def index(self, label: Callable[[Dict[str, Any]], str]) -> str:
+        """One line per carried-over item, so new items don't duplicate them."""
+        lines = [f"- {item['id']} | {label(item)}" for item in self.untouched()]
+        return "\n".join(lines) or "None."
+
+    def merge(self, upserts: List[Dict[str, Any]], removed_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Deterministic merge by item id, in draft order:
+        1. Affected items are replaced by their upsert; any draft item listed in removed_ids is dropped
+           (the LLM may also retire a carried-over item it recognizes as stale from the index).
+        2. Upserts that collide with a carried-over item get a fresh id (carried-over items are never overwritten).
+        3. Remaining upserts (new items) are appended in the order returned.
+        """
+        affected_ids = self.affected_ids
+        removable = set(removed_ids) & _ids(self.previous)
+        taken = _ids(self.previous)
+
+        replacements: Dict[str, Dict[str, Any]] = {}
+        additions: List[Dict[str, Any]] = []
+        for item in upserts:
+            item_id = item.get("id")
+            if item_id in affected_ids:
+                replacements[item_id] = item
+                continue
+            if not item_id or item_id in taken:
+                item = {**item, "id": _fresh_id(item_id or self.artifact_type, taken)}
+            taken.add(item["id"])
+            additions.append(item)
+
+        merged: List[Dict[str, Any]] = []
+        for item in self.previous:
+            item_id = item["id"]
+            if item_id in replacements:
+                merged.append(replacements[item_id])
+            elif item_id in removable:
+                continue
+            else:
+                # Affected but neither replaced nor removed: the LLM kept it as is
+                merged.append(item)
+        return merged + additions
+
+def _ids(items: List[Dict[str, Any]]) -> Set[str]:
+    return {item["id"] for item in items}
+
+def _fresh_id(base: str, taken: Set[str]) -> str:
+    n = 2
+    while f"{base}-{n}" in taken:
+        n += 1
+    return f"{base}-{n}"
+
+def plan_incremental(
+    state: SessionState,
+    artifact_type: str,
+    draft_id: str,
+    items: List[Dict[str, Any]],
+    actor_field: str,
+) -> Optional[IncrementalPlan]:
+    """
+    Returns a plan when the draft can be patched, None when a full regeneration is needed:
+    no recorded basis, a non-item ledger section changed, nothing to diff, a removed / changed actor
+    or a removed step that no item can be traced to, or too many items affected.
+    """
+    if not AgentConfig.INCREMENTAL_ARTIFACTS or not items:
+        return None
+
+    basis = state.artifact_bases.get(draft_id)
+    if not basis:
+        return None
+
+    current = ledger_basis(state, artifact_type)
+    if basis.get("rest") != current["rest"]:
+        logger.info(f"🔁 {artifact_type}: scope/goal/NFRs changed since {draft_id} -> full regeneration")
+        return None
+
+    delta = diff_ledger(basis, current)
+    if delta.is_empty():
+        # Same actors & steps: the input change is elsewhere (prompt, model, manual edit)
+        return None
+
+    # A removed / changed actor whose items we cannot find would leave them in the artifact for good
+    for actor in delta.removed_actors + delta.changed_actors:
+        if not any(_mentions(item.get(actor_field), actor["role_name"]) for item in items):
+            logger.info(f"🔁 {artifact_type}: no item traced to actor '{actor['role_name']}' -> full regeneration")
+            return None
+    for step in delta.removed_steps:
+        if not any(_mentions(item.get(actor_field), step["actor"]) for item in items):
+            logger.info(f"🔁 {artifact_type}: no item traced to removed step {step['step_id']} -> full regeneration")
+            return None
+
+    touched = delta.touched_actors()
+    affected = [
+        item for item in items
+        if any(_mentions(item.get(actor_field), name) for name in touched)
+    ]
+    if len(affected) > len(items) * AgentConfig.INCREMENTAL_MAX_AFFECTED_SHARE:
+        logger.info(f"🔁 {artifact_type}: {len(affected)}/{len(items)} items affected -> full regeneration")
+        return None
+
+    logger.info(f"🧩 {artifact_type}: incremental from {draft_id} ({delta.summary()}), {len(affected)}/{len(items)} items affected")
+    return IncrementalPlan(artifact_type=artifact_type, delta=delta, previous=items, affected=affected)
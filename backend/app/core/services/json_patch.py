@@ -0,0 +1,137 @@
+# app/core/services/json_patch.py
+"""
+Minimal RFC 6902 (JSON Patch) support.
+Diffing favors small patches for our typical edits (append a story,
+change a field); anything structurally ambiguous falls back to 'replace'.
+"""
+import copy
+from typing import Any, Dict, List
+
+def _escape(token: Any) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+def make_patch(old: Any, new: Any) -> List[Dict[str, Any]]:
+    """Returns the list of operations transforming 'old' into 'new'."""
+    ops: List[Dict[str, Any]] = []
+    _diff(old, new, "", ops)
+    return ops
+
+def _diff(old: Any, new: Any, path: str, ops: List[Dict[str, Any]]):
+    if type(old) is not type(new):
+        ops.append({"op": "replace", "path": path, "value": new})
+        return
+
+    if isinstance(old, dict):
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                _diff(old[key], value, child, ops)
+        return
+
+    if isinstance(old, list):
+        _diff_list(old, new, path, ops)
+        return
+
+    if old != new:
+        ops.append({"op": "replace", "path": path, "value": new})
+
+def _diff_list(old: List[Any], new: List[Any], path: str, ops: List[Dict[str, Any]]):
+    # Trim common prefix / suffix, then diff the middle index by index.
+    prefix = 0
+    while prefix < len(old) and prefix < len(new) and old[prefix] == new[prefix]:
+        prefix += 1
+
+    suffix = 0
+    while (
+        suffix < len(old) - prefix
+        and suffix < len(new) - prefix
+        and old[len(old) - 1 - suffix] == new[len(new) - 1 - suffix]
+    ):
+        suffix += 1
+
+    old_mid = old[prefix:len(old) - suffix]
+    new_mid = new[prefix:len(new) - suffix]
+    shared = min(len(old_mid), len(new_mid))
+
+    for i in range(shared):
+        _diff(old_mid[i], new_mid[i], f"{path}/{prefix + i}", ops)
+
+    # Removals go from the back so earlier indices stay valid.
+    for i in range(len(old_mid) - 1, shared - 1, -1):
+        ops.append({"op": "remove", "path": f"{path}/{prefix + i}"})
+
+    for i in range(shared, len(new_mid)):
+        ops.append({"op": "add", "path": f"{path}/{prefix + i}", "value": new_mid[i]})
+
+def apply_patch(doc: Any, ops: List[Dict[str, Any]]) -> Any:
+    """Applies operations to a deep copy of 'doc' and returns the result."""
+    result = copy.deepcopy(doc)
+    for op in ops:
+        result = _apply_op(result, op)
+    return result
+
+def _resolve(doc: Any, path: str):
+    """Returns (parent, last_token) for a JSON Pointer."""
+    tokens = [_unescape(t) for t in path.split("/")[1:]]
+    parent = doc
+    for token in tokens[:-1]:
+        parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+    return parent, tokens[-1]
+
+def _apply_op(doc: Any, op: Dict[str, Any]) -> Any:
+    kind, path = op["op"], op["path"]
+
+    if kind == "test":
+        current = _get(doc, path)
+        if current != op.get("value"):
+            raise ValueError(f"JSON Patch test failed at '{path}'")
+        return doc
+
+    if kind in ("move", "copy"):
+        value = copy.deepcopy(_get(doc, op["from"]))
+        if kind == "move":
+            doc = _apply_op(doc, {"op": "remove", "path": op["from"]})
+        return _apply_op(doc, {"op": "add", "path": path, "value": value})
+
+    if path == "":
+        if kind == "remove":
+            return None
+        return copy.deepcopy(op.get("value"))
+
+    parent, token = _resolve(doc, path)
+
+    if isinstance(parent, list):
+        index = len(parent) if token == "-" else int(token)
+        if kind == "add":
+            parent.insert(index, copy.deepcopy(op.get("value")))
+        elif kind == "remove":
+            del parent[index]
+        elif kind == "replace":
+            parent[index] = copy.deepcopy(op.get("value"))
+        else:
+            raise ValueError(f"Unsupported JSON Patch op: {kind}")
+        return doc
+
+    if kind in ("add", "replace"):
+        if kind == "replace" and token not in parent:
+            raise ValueError(f"JSON Patch replace on missing key '{path}'")
+        parent[token] = copy.deepcopy(op.get("value"))
+    elif kind == "remove":
+        del parent[token]
+    else:
+        raise ValueError(f"Unsupported JSON Patch op: {kind}")
+    return doc
+
+def _get(doc: Any, path: str) -> Any:
+    if path == "":
+        return doc
+    parent, token = _resolve(doc, path)
+    return parent[int(token)] if isinstance(parent, list) else parent[token]
@@ -1,6 +1,6 @@
 # app/core/services/mapper.py
 import json
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 # Strategies
 from app.core.services.artifact_strategies import ArtifactStrategyFactory
@@ -11,7 +11,10 @@ from app.schemas.contract import (
     MsgChatDelta, MsgStatusUpdate, MsgArtifactOpen, 
     MsgStateUpdate, MsgValidationWarn, MsgArtifactUpdate,
     StatusUpdatePayload, SystemStatus, ContractStateSnapshot,
-    ValidationWarnPayload, ValidationIssue, MsgArtifactUpdatePayload, MsgArtifactSync, ArtifactSyncPayload,MsgChatHistory, ChatMessage, ChatHistoryPayload, MsgSessionEstablished, SessionEstablishedPayload
+    ValidationWarnPayload, ValidationIssue, MsgArtifactUpdatePayload, MsgArtifactSync, ArtifactSyncPayload,MsgChatHistory, ChatMessage, ChatHistoryPayload, MsgSessionEstablished, SessionEstablishedPayload,
+    MsgJsonPatch, JsonPatchPayload, JsonPatchOperation, JsonPatchTarget,
+    MsgArtifactVisualAck, ArtifactVisualAckPayload, VisualAckStatus,
+    MsgUserMessage, UserMessagePayload
 )
 
 
@@ -162,13 +165,65 @@ class DomainMapper:
             type='CHAT_HISTORY',
             payload=ChatHistoryPayload(messages=ui_messages)
         ).model_dump(by_alias=True)
+
+    @staticmethod
+    def to_user_message(content: str, message_id: Optional[str] = None) -> Dict[str, Any]:
+        """Echo of a chat message to every tab of the session."""
+        return MsgUserMessage(
+            type='USER_MESSAGE',
+            payload=UserMessagePayload(content=content, id=message_id)
+        ).model_dump(by_alias=True)
     
     @staticmethod
-    def to_session_established(session_id: str, is_new: bool) -> Dict[str, Any]:
+    def to_session_established(
+        session_id: str,
+        is_new: bool,
+        epoch: Optional[str] = None,
+        seq: Optional[int] = None,
+        resumed: bool = False
+    ) -> Dict[str, Any]:
         return MsgSessionEstablished(
             type='SESSION_ESTABLISHED',
             payload=SessionEstablishedPayload(
                 session_id=session_id,
-                is_new=is_new
+                is_new=is_new,
+                epoch=epoch,
+                seq=seq,
+                resumed=resumed
+            )
+        ).model_dump(by_alias=True)
+
+    @staticmethod
+    def to_json_patch(
+        target: str,
+        doc_id: str,
+        ops: List[Dict[str, Any]],
+        version: int,
+        base_version: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Maps RFC 6902 operations -> JSON_PATCH message.
+        A full payload is expressed as a single root 'replace' with no base version.
+        """
+        return MsgJsonPatch(
+            type='JSON_PATCH',
+            payload=JsonPatchPayload(
+                target=JsonPatchTarget(target),
+                id=doc_id,
+                base_version=base_version,
+                version=version,
+                ops=[JsonPatchOperation.model_validate(op) for op in ops]
+            )
+        ).model_dump(by_alias=True, exclude_unset=True)
+
+    @staticmethod
+    def to_visual_ack(doc_id: str, digest: str, status: str, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        return MsgArtifactVisualAck(
+            type='ARTIFACT_VISUAL_ACK',
+            payload=ArtifactVisualAckPayload(
+                id=doc_id,
+                digest=digest,
+                status=VisualAckStatus(status),
+                chunk_size=chunk_size
             )
-        ).model_dump(by_alias=True)
\ No newline at end of file
+        ).model_dump(by_alias=True, exclude_none=True)
@@ -0,0 +1,63 @@
+# app/core/services/progress.py
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger("Progress")
+
+class ProgressThrottle:
+    """
+    Rate-limits progress frames of one running job (e.g. a partially generated artifact).
+    1. push() is synchronous and never blocks the producer (an LLM stream callback).
+    2. At most one send per 'interval'; only the latest value is kept in between,
+       and it is sent once the interval is over (trailing edge), so the last progress is never lost.
+    3. close() drops anything pending: the final result supersedes it.
+    'sent' / 'last' tell the caller whether (and what) the client may be showing
+    if the job ends without a final result.
+    """
+
+    def __init__(self, interval: float, send: Callable[[Any], Awaitable[None]], name: str = "progress"):
+        self.interval = interval
+        self.send = send
+        self.name = name
+        self._pending: Any = None
+        self._has_pending = False
+        self._last_sent = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self.sent = 0
+        self.last: Any = None
+
+    def push(self, value: Any):
+        if self._closed:
+            return
+        self._pending = value
+        self._has_pending = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush())
+
+    async def _flush(self):
+        while self._has_pending and not self._closed:
+            delay = self._last_sent + self.interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            value, self._pending, self._has_pending = self._pending, None, False
+            self._last_sent = time.monotonic()
+            # Counted before the send: a cancelled send may still have reached the client
+            self.sent += 1
+            self.last = value
+            try:
+                await self.send(value)
+            except Exception as e:
+                # Progress is best effort: the final result is sent regardless
+                logger.warning(f"⚠️ [{self.name}] progress frame dropped: {e}")
+
+    def close(self):
+        self._closed = True
+        self._pending, self._has_pending = None, False
+        if self._task and not self._task.done():
+            self._task.cancel()
@@ -8,6 +8,7 @@ from typing import Optional, Dict, Any, List
 
 from app.config.settings import AppConfig
 from app.domain.models.state import SessionState
+from app.core.services.visual_sync import VisualSyncService
 from app.core.services.markdown_generator import MarkdownGenerator
 from app.core.services.confluence_service.confluence_service import ConfluenceService
 from app.utils.logger import setup_logger
@@ -19,8 +20,9 @@ class PublishService:
     Acts as an Adapter between the Domain (SessionState) and the Infrastructure (ConfluenceService).
     """
         
-    def __init__(self):
+    def __init__(self, visual_sync: VisualSyncService):
         self.md_generator = MarkdownGenerator()
+        self.visual_sync = visual_sync
         self.confluence: Optional[ConfluenceService] = None
         self._init_client()
 
@@ -89,7 +91,7 @@ class PublishService:
             workbook_data = self._extract_workbook(state)
             
             # C. Visuals (SVG)
-            svg_content = self._extract_visual(state, "mermaid_diagram")
+            svg_content = await self._extract_visual(state, "mermaid_diagram")
             if not svg_content:
                 svg_content = '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 200 50"><text y="20" font-family="Arial">No Diagram Generated</text></svg>'
                 logger.warning("⚠️ No SVG found for 'mermaid_diagram'. Using placeholder.")
@@ -196,13 +198,13 @@ class PublishService:
         internal_id = f"workbook-v{version}"
         return state.artifacts.get(internal_id)
 
-    def _extract_visual(self, state: SessionState, artifact_type: str) -> Optional[str]:
+    async def _extract_visual(self, state: SessionState, artifact_type: str) -> Optional[str]:
         version = state.artifact_counters.get(artifact_type, 0)
         if version == 0:
             return None
             
         internal_id = f"{artifact_type}-v{version}"
-        svg_data = state.visual_artifacts.get(internal_id)
+        svg_data = await self.visual_sync.resolve(state, internal_id)
         
         if svg_data:
             logger.debug(f"   - Found Visual Artifact {internal_id} ({len(svg_data)} chars)")
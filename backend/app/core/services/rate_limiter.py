@@ -0,0 +1,170 @@
+# app/core/services/rate_limiter.py
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from app.core.services.work_scheduler import WorkScheduler, SchedulerPool
+from app.utils.logger import setup_logger
+
+logger = setup_logger("RateLimiter")
+
+# Cooldown when a 429 carries no Retry-After: 1s, 2s, 4s ... (per consecutive 429)
+FALLBACK_COOLDOWN = 1.0
+MAX_FALLBACK_COOLDOWN = 30.0
+
+class TokenBucket:
+    """Refills 'per_minute' units evenly over a minute; holds at most one minute's worth."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until 'amount' is available (requests larger than the bucket wait for a full one)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+class ProviderLimiter:
+    """
+    Client-side limits for one 'provider/model' (the same key as its WorkScheduler pool).
+    1. Pacing: requests- and tokens-per-minute buckets (optional), plus a shared cooldown
+       set by the provider's Retry-After, so every caller waits locally instead of hitting 429s.
+    2. AIMD concurrency: the pool limit is halved (at most once per cooldown) on a 429 and
+       grows by ~1 per 'limit' successes, up to the configured pool limit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        pool: SchedulerPool,
+        rpm: Optional[float],
+        tpm: Optional[float],
+        increase: float,
+        decrease: float
+    ):
+        self.name = name
+        self.pool = pool
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.increase = increase
+        self.decrease = decrease
+        self.limit = float(pool.max_limit)
+
+        self.cooldown_until = 0.0
+        self._last_decrease = 0.0
+        self._consecutive_429 = 0
+        # One pacer at a time: waiters are released in arrival order
+        self._lock = asyncio.Lock()
+
+        self.throttled = 0
+        self.rate_limited = 0
+        self.successes = 0
+
+    async def acquire(self, tokens: int):
+        async with self._lock:
+            waited = False
+            while True:
+                delay = max(
+                    self.cooldown_until - time.monotonic(),
+                    self.requests.wait_time(1) if self.requests else 0.0,
+                    self.tokens.wait_time(tokens) if self.tokens else 0.0,
+                )
+                if delay <= 0:
+                    break
+                if not waited:
+                    waited = True
+                    self.throttled += 1
+                await asyncio.sleep(delay)
+
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens:
+                self.tokens.take(tokens)
+
+    def on_success(self):
+        self.successes += 1
+        self._consecutive_429 = 0
+        if self.limit < self.pool.max_limit:
+            # Additive increase: about +1 slot per 'limit' successful calls
+            self.limit = min(float(self.pool.max_limit), self.limit + self.increase / self.limit)
+            self._apply_limit()
+
+    def on_rate_limited(self, retry_after: Optional[float]):
+        now = time.monotonic()
+        self.rate_limited += 1
+        self._consecutive_429 += 1
+
+        if retry_after is None:
+            retry_after = min(MAX_FALLBACK_COOLDOWN, FALLBACK_COOLDOWN * 2 ** (self._consecutive_429 - 1))
+        self.cooldown_until = max(self.cooldown_until, now + retry_after)
+
+        # Multiplicative decrease, once per cooldown window: a burst of parallel 429s
+        # is one congestion signal, not twenty
+        if now - self._last_decrease >= max(1.0, retry_after):
+            self._last_decrease = now
+            self.limit = max(1.0, self.limit * self.decrease)
+            self._apply_limit()
+            logger.warning(
+                f"🚥 [{self.name}] 429: cooling down {retry_after:.1f}s, "
+                f"concurrency -> {self.pool.limit}/{self.pool.max_limit}"
+            )
+
+    def _apply_limit(self):
+        limit = max(1, int(self.limit))
+        if limit != self.pool.limit:
+            self.pool.set_limit(limit)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.pool.limit,
+            "max_concurrency": self.pool.max_limit,
+            "cooldown_s": round(max(0.0, self.cooldown_until - time.monotonic()), 2),
+            "rpm_available": round(self.requests.level) if self.requests else None,
+            "tpm_available": round(self.tokens.level) if self.tokens else None,
+            "throttled": self.throttled,
+            "rate_limited": self.rate_limited,
+            "successes": self.successes,
+        }
+
+class RateLimiter:
+    """
+    Process-wide registry of ProviderLimiters, sharing pools with the WorkScheduler.
+    limits: {"provider" or "provider/model": {"rpm": .., "tpm": ..}}; exact key wins.
+    """
+
+    def __init__(
+        self,
+        scheduler: WorkScheduler,
+        limits: Dict[str, Dict[str, float]],
+        increase: float,
+        decrease: float
+    ):
+        self.scheduler = scheduler
+        self.limits = limits
+        self.increase = increase
+        self.decrease = decrease
+        self._limiters: Dict[str, ProviderLimiter] = {}
+
+    def limiter(self, name: str) -> ProviderLimiter:
+        if name not in self._limiters:
+            provider = name.split("/", 1)[0]
+            cfg = self.limits.get(name, self.limits.get(provider, {}))
+            self._limiters[name] = ProviderLimiter(
+                name, self.scheduler.pool(name), cfg.get("rpm"), cfg.get("tpm"), self.increase, self.decrease
+            )
+        return self._limiters[name]
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {name: limiter.snapshot() for name, limiter in sorted(self._limiters.items())}
@@ -1,10 +1,23 @@
 # app/core/services/requirements.py
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, List, Optional
+from app.config.settings import AppConfig
 from app.core.services.state_manager import StateManager
 from app.core.gap_engine import GapEngine
 from app.agents.checker import CheckerAgent
 from app.domain.models.state import SessionState, BusinessGoal, Persona, ProcessStep, DataEntity, NonFunctionalRequirement
 from app.domain.models.validation import ComplianceReport
+from app.utils.logger import setup_logger
+
+logger = setup_logger("RequirementsService")
+
+# Ledger sections each generator reads (speculative generation only reruns affected artifacts)
+ARTIFACT_DEPENDENCIES: Dict[str, tuple] = {
+    "mermaid_diagram": ("project_scope", "actors", "process_steps", "data_entities"),
+    "user_story": ("project_scope", "goal", "actors", "process_steps", "nfrs"),
+    "workbook": ("project_scope", "goal", "actors", "process_steps", "data_entities", "nfrs"),
+    "use_case": ("goal", "actors", "process_steps", "nfrs"),
+}
+LEDGER_FIELDS = ("project_scope", "goal", "actors", "process_steps", "data_entities", "nfrs")
 
 class RequirementsService:
     """
@@ -21,45 +34,70 @@ class RequirementsService:
         self.gap_engine = gap_engine
         self.checker_agent = checker_agent
 
-    async def process_update(self, session_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
+    async def process_update(
+        self,
+        session_id: str,
+        updates: Dict[str, Any],
+        scheduler: Optional[Callable[..., bool]] = None
+    ) -> Dict[str, Any]:
         """
         Applies updates (Add/Remove) and runs the full audit suite.
         Returns a dict containing the snapshot and RAW issue objects.
+        'scheduler' (the session's artifact scheduler) enables speculative generation
+        when AppConfig.SPECULATIVE_ARTIFACTS is on.
         """
         
-        # --- 1. Apply Removals FIRST ---
-        if updates.get("actors_to_remove"):
-            await self.state_manager.remove_actors(session_id, updates["actors_to_remove"])
+        # Up to eight ledger mutations below: one write at the end of the unit of work
+        async with self.state_manager.unit_of_work(session_id):
+            before = _ledger_snapshot(await self.state_manager.get_or_create_session(session_id))
+
+            # --- 1. Apply Removals FIRST ---
+            if updates.get("actors_to_remove"):
+                await self.state_manager.remove_actors(session_id, updates["actors_to_remove"])
+
+            if updates.get("steps_to_remove"):
+                await self.state_manager.remove_steps(session_id, updates["steps_to_remove"])
 
-        if updates.get("steps_to_remove"):
-            await self.state_manager.remove_steps(session_id, updates["steps_to_remove"])
+            # --- 2. Apply Adds / Updates ---
+            if updates.get("project_scope"):
+                await self.state_manager.update_project_scope(session_id, updates["project_scope"])
 
-        # --- 2. Apply Adds / Updates ---
-        if updates.get("project_scope"):
-            await self.state_manager.update_project_scope(session_id, updates["project_scope"])
+            if updates.get("goal"):
+                goal_model = BusinessGoal(**updates["goal"])
+                await self.state_manager.update_goal(session_id, goal_model)
 
-        if updates.get("goal"):
-            goal_model = BusinessGoal(**updates["goal"])
-            await self.state_manager.update_goal(session_id, goal_model)
+            if updates.get("actors_to_add"):
+                actors_models = [Persona(**a) for a in updates["actors_to_add"]]
+                await self.state_manager.add_actors(session_id, actors_models)
 
-        if updates.get("actors_to_add"):
-            actors_models = [Persona(**a) for a in updates["actors_to_add"]]
-            await self.state_manager.add_actors(session_id, actors_models)
+            if updates.get("process_steps"):
+                steps_models = [ProcessStep(**s) for s in updates["process_steps"]]
+                await self.state_manager.update_steps(session_id, steps_models)
 
-        if updates.get("process_steps"):
-            steps_models = [ProcessStep(**s) for s in updates["process_steps"]]
-            await self.state_manager.update_steps(session_id, steps_models)
+            if updates.get("data_entities"):
+                entities = [DataEntity(**d) for d in updates["data_entities"]]
+                await self.state_manager.update_data_entities(session_id, entities)
 
-        if updates.get("data_entities"):
-            entities = [DataEntity(**d) for d in updates["data_entities"]]
-            await self.state_manager.update_data_entities(session_id, entities)
+            if updates.get("nfrs"):
+                reqs = [NonFunctionalRequirement(**n) for n in updates["nfrs"]]
+                await self.state_manager.update_nfrs(session_id, reqs)
 
-        if updates.get("nfrs"):
-            reqs = [NonFunctionalRequirement(**n) for n in updates["nfrs"]]
-            await self.state_manager.update_nfrs(session_id, reqs)
+            # --- 3. Fetch Fresh State (Read-Your-Writes) ---
+            current_state = await self.state_manager.get_or_create_session(session_id)
+            changed = _changed_sections(before, current_state)
 
-        # --- 3. Fetch Fresh State (Read-Your-Writes) ---
-        current_state = await self.state_manager.get_or_create_session(session_id)
+        # --- 3b. Speculative Generation (opt-in) ---
+        # Starts the affected generators now, overlapping the audit below and saving
+        # the extra LLM round trip to 'trigger_visualization'.
+        speculative: List[str] = []
+        if scheduler and AppConfig.SPECULATIVE_ARTIFACTS and changed:
+            speculative = [
+                artifact for artifact, deps in ARTIFACT_DEPENDENCIES.items()
+                if changed.intersection(deps)
+            ]
+            for artifact in speculative:
+                scheduler(artifact, speculative=True)
+            logger.info(f"🔮 Ledger changed {sorted(changed)} -> speculative generation: {speculative}")
 
         # --- 4. Run Logic Audits (Gap Engine - Deterministic) ---
         gap_result = self.gap_engine.analyze(current_state)
@@ -81,7 +119,7 @@ class RequirementsService:
             # For strictness, let's leave it empty so we don't break the object contract.
 
         # --- 6. Return Structured Feedback ---
-        return {
+        result = {
             "status": "success",
             "current_state_snapshot": {
                 "scope": current_state.project_scope,
@@ -95,4 +133,16 @@ class RequirementsService:
             
             # Pass the full object for event emission
             "_internal_state": current_state 
-        }
\ No newline at end of file
+        }
+
+        if speculative:
+            # Already regenerating: the LLM does not need to call 'trigger_visualization' for these
+            result["artifacts_regenerating"] = speculative
+        return result
+
+def _ledger_snapshot(state: SessionState) -> Dict[str, Any]:
+    return state.model_dump(include=set(LEDGER_FIELDS))
+
+def _changed_sections(before: Dict[str, Any], state: SessionState) -> set:
+    after = _ledger_snapshot(state)
+    return {field for field in LEDGER_FIELDS if before.get(field) != after.get(field)}
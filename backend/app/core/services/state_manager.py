@@ -1,44 +1,161 @@
 # app/core/services/state_manager.py
-from typing import List
+import contextvars
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Set
 from app.domain.models.state import SessionState, Persona, BusinessGoal, ProcessStep, DataEntity, NonFunctionalRequirement
 from app.core.interfaces.repository import ISessionRepository
 from app.utils.logger import setup_logger
 
 logger = setup_logger("StateManager")
 
+# Dirty-tracking sections (passed to ISessionRepository.save_partial)
+LEDGER = "ledger"
+CHAT_HISTORY = "chat_history"
+ARTIFACTS = "artifacts"
+VISUALS = "visuals"
+ALL_SECTIONS = "all"
+
+@dataclass
+class _Unit:
+    session_id: str
+    open: bool = True
+
+# The unit of work the current task runs in (inherited by the tasks it spawns, e.g. parallel tool calls)
+_open_unit: ContextVar[Optional[_Unit]] = ContextVar("state_unit_of_work", default=None)
+
+def _in_unit(session_id: str) -> bool:
+    unit = _open_unit.get()
+    return unit is not None and unit.open and unit.session_id == session_id
+
+def detached_context() -> contextvars.Context:
+    """Copy of the current context outside any unit of work (for independent background tasks)."""
+    ctx = contextvars.copy_context()
+    ctx.run(_open_unit.set, None)
+    return ctx
+
 class StateManager:
     """
     Domain Service for managing Session State.
     Coordinates business logic for state updates (merging, deduping).
     Delegates storage to ISessionRepository.
+
+    Write-behind Unit of Work:
+    A unit is scoped to the caller's context (a ContextVar, inherited by tasks it spawns
+    such as parallel tool calls). Inside 'unit_of_work(session_id)' saves only mark
+    sections dirty, and the outermost unit flushes once on exit.
+    Saves from any other context (FAST-lane edits, supervised generators, see
+    detached_context) are written through immediately, with whatever is dirty for the session.
+    While any unit of a session is open, every task reads the same state object (identity map).
+    'flush' / 'flush_all' are the explicit durability points.
     """
     
     def __init__(self, repository: ISessionRepository):
         self.repo = repository
+        self._identity: Dict[str, SessionState] = {}
+        self._dirty: Dict[str, Set[str]] = {}
+        self._open_units: Dict[str, int] = {}
+
+    # --- Unit of Work ---
+
+    @asynccontextmanager
+    async def unit_of_work(self, session_id: str) -> AsyncIterator[None]:
+        """Coalesces the calling task's saves for the session into one flush on exit."""
+        if _in_unit(session_id):
+            # Nested: the enclosing unit of this task flushes
+            yield
+            return
+
+        unit = _Unit(session_id)
+        token = _open_unit.set(unit)
+        self._open_units[session_id] = self._open_units.get(session_id, 0) + 1
+        try:
+            yield
+        finally:
+            # Tasks that outlive the unit still hold it in their context: they write through from now on
+            unit.open = False
+            _open_unit.reset(token)
+            remaining = self._open_units[session_id] - 1
+            if remaining:
+                self._open_units[session_id] = remaining
+            else:
+                del self._open_units[session_id]
+            try:
+                await self.flush(session_id)
+            finally:
+                if not remaining:
+                    self._identity.pop(session_id, None)
+
+    async def flush(self, session_id: str) -> bool:
+        """Durability point: writes the session if anything is dirty. Returns True if it wrote."""
+        sections = self._dirty.pop(session_id, None)
+        if not sections:
+            return False
+
+        state = self._identity.get(session_id)
+        if state is None:
+            logger.warning(f"⚠️ Dirty session {session_id} is no longer loaded. Nothing to flush.")
+            return False
+
+        try:
+            await self.repo.save_partial(state, sections)
+        except Exception:
+            # Keep it dirty so the next durability point retries
+            self._dirty.setdefault(session_id, set()).update(sections)
+            raise
+        logger.debug(f"💾 Flushed {session_id}: {sorted(sections)}")
+        return True
+
+    async def flush_all(self):
+        """Durability point for shutdown."""
+        for session_id in list(self._dirty):
+            await self.flush(session_id)
+
+    async def _mark_dirty(self, state: SessionState, *sections: str):
+        session_id = state.session_id
+        self._dirty.setdefault(session_id, set()).update(sections or (ALL_SECTIONS,))
+        self._identity[session_id] = state
+        if not _in_unit(session_id):
+            # Write-through outside the caller's unit of work
+            try:
+                await self.flush(session_id)
+            finally:
+                if session_id not in self._open_units:
+                    self._identity.pop(session_id, None)
+
+    # --- Access ---
 
     async def get_or_create_session(self, session_id: str) -> SessionState:
-        """Loads state from Repo or creates a new one if missing."""
+        """Loads state from Repo (or the unit of work's identity map) or creates a new one if missing."""
+        state = self._identity.get(session_id)
+        if state is not None:
+            return state
+
         state = await self.repo.get(session_id)
         if not state:
             logger.info(f"✨ Creating new session: {session_id}")
             state = SessionState(session_id=session_id)
-            await self.repo.save(state)
+            await self._mark_dirty(state, ALL_SECTIONS)
+
+        if session_id in self._open_units:
+            self._identity[session_id] = state
         return state
 
-    async def save_session(self, state: SessionState):
-        """Pass-through to repository for generic saves."""
-        await self.repo.save(state)
+    async def save_session(self, state: SessionState, *sections: str):
+        """Marks sections dirty; written now, or at the end of the enclosing unit of work."""
+        await self._mark_dirty(state, *sections)
 
     async def update_project_scope(self, session_id: str, scope: str) -> SessionState:
         state = await self.get_or_create_session(session_id)
         state.project_scope = scope
-        await self.repo.save(state)
+        await self._mark_dirty(state, LEDGER)
         return state
 
     async def update_goal(self, session_id: str, goal: BusinessGoal) -> SessionState:
         state = await self.get_or_create_session(session_id)
         state.goal = goal
-        await self.repo.save(state)
+        await self._mark_dirty(state, LEDGER)
         return state
 
     async def add_actors(self, session_id: str, new_actors: List[Persona]) -> SessionState:
@@ -56,7 +173,7 @@ class StateManager:
                 logger.info(f"➕ Added Actor: {actor.role_name}")
         
         if changed:
-            await self.repo.save(state)
+            await self._mark_dirty(state, LEDGER)
             
         return state
 
@@ -72,7 +189,7 @@ class StateManager:
         state.actors = [a for a in state.actors if a.role_name.lower() not in targets]
         
         if len(state.actors) < original_count:
-            await self.repo.save(state)
+            await self._mark_dirty(state, LEDGER)
             logger.info(f"🗑️ Removed actors: {role_names}")
             
         return state
@@ -85,7 +202,7 @@ class StateManager:
         state.process_steps = [s for s in state.process_steps if s.step_id not in step_ids]
         
         if len(state.process_steps) < original_count:
-            await self.repo.save(state)
+            await self._mark_dirty(state, LEDGER)
             logger.info(f"🗑️ Removed steps: {step_ids}")
             
         return state
@@ -94,7 +211,7 @@ class StateManager:
     async def update_steps(self, session_id: str, steps: List[ProcessStep]) -> SessionState:
         state = await self.get_or_create_session(session_id)
         state.process_steps = steps
-        await self.repo.save(state)
+        await self._mark_dirty(state, LEDGER)
         return state
     
     async def update_data_entities(self, session_id: str, new_entities: List[DataEntity]) -> SessionState:
@@ -113,7 +230,7 @@ class StateManager:
                 state.data_entities.append(entity)
                 existing_map[key] = entity
                 
-        await self.repo.save(state)
+        await self._mark_dirty(state, LEDGER)
         return state
 
     async def update_nfrs(self, session_id: str, new_nfrs: List[NonFunctionalRequirement]) -> SessionState:
@@ -128,5 +245,5 @@ class StateManager:
                 state.nfrs.append(nfr)
                 existing_reqs.add(nfr.requirement.lower())
                 
-        await self.repo.save(state)
+        await self._mark_dirty(state, LEDGER)
         return state
\ No newline at end of file
@@ -0,0 +1,203 @@
+# app/core/services/task_supervisor.py
+import asyncio
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Coroutine, Dict, Optional, Set
+
+from app.core.services.state_manager import detached_context
+from app.utils.logger import setup_logger
+
+logger = setup_logger("TaskSupervisor")
+
+class TaskKind(str, Enum):
+    TURN = "turn"          # a chat turn (ReAct loop + tools)
+    ARTIFACT = "artifact"  # an artifact generator
+    PUBLISH = "publish"    # a documentation upload (e.g. Confluence)
+
+class DisconnectPolicy(str, Enum):
+    CANCEL = "cancel"   # stop the work when the last socket of the session leaves
+    DETACH = "detach"   # keep running; results land in the event log for the next reconnect
+
+@dataclass(eq=False)
+class _Supervised:
+    task: asyncio.Task
+    session_id: str
+    kind: TaskKind
+    name: str
+    started: float = field(default_factory=time.monotonic)
+    detached: bool = False
+
+class TaskSupervisor:
+    """
+    Owns every background task of every session (chat turns, artifact generators, publishes).
+
+    Lifecycle: spawn -> running -> (detached on disconnect) -> done / cancelled / failed.
+    1. Disconnect: each task kind follows its DisconnectPolicy. Detached tasks are
+       cancelled after 'detach_timeout' unless the session reconnects first.
+    2. Shutdown: 'drain' stops new work, waits for live tasks up to a deadline, then
+       cancels the rest and gives their cancellation handlers time to clean up: a turn records
+       the interruption in chat history, an artifact generator stores nothing (versions are
+       atomic) and only puts the stored version back in place of any partial items shown.
+    3. Telemetry: live counts per kind / session and lifetime totals (see snapshot).
+    """
+
+    def __init__(
+        self,
+        policies: Dict[str, str],
+        default_policy: str,
+        detach_timeout: float,
+        cancel_grace: float = 5.0
+    ):
+        self.policies = {kind: DisconnectPolicy(policies.get(kind.value, default_policy)) for kind in TaskKind}
+        self.detach_timeout = detach_timeout
+        self.cancel_grace = cancel_grace
+        self.accepting = True
+
+        self._live: Dict[str, Set[_Supervised]] = {}
+        self._detach_timers: Dict[str, asyncio.TimerHandle] = {}
+        self._totals = {"started": 0, "completed": 0, "cancelled": 0, "failed": 0}
+        self._peak_live = 0
+
+    # --- Spawning ---
+
+    def spawn(self, session_id: str, kind: TaskKind, name: str, coro: Coroutine) -> asyncio.Task:
+        """
+        Starts 'coro' as a supervised task (context vars are copied from the caller,
+        except its unit of work: supervised work persists on its own, see StateManager).
+        Raises RuntimeError while draining.
+        """
+        if not self.accepting:
+            coro.close()
+            raise RuntimeError(f"Server is shutting down: not starting {kind.value} '{name}'")
+
+        task = asyncio.create_task(coro, name=f"{kind.value}:{session_id}:{name}", context=detached_context())
+        entry = _Supervised(task=task, session_id=session_id, kind=kind, name=name)
+        self._live.setdefault(session_id, set()).add(entry)
+        self._totals["started"] += 1
+        self._peak_live = max(self._peak_live, self.live_count)
+        task.add_done_callback(lambda t, e=entry: self._on_done(e))
+        return task
+
+    def _on_done(self, entry: _Supervised):
+        entries = self._live.get(entry.session_id)
+        if entries is not None:
+            entries.discard(entry)
+            if not entries:
+                del self._live[entry.session_id]
+                self._clear_detach_timer(entry.session_id)
+
+        task = entry.task
+        if task.cancelled():
+            self._totals["cancelled"] += 1
+        elif task.exception() is not None:
+            self._totals["failed"] += 1
+            logger.error(f"🔥 Supervised {entry.kind.value} '{entry.name}' ({entry.session_id}) failed: {task.exception()}")
+        else:
+            self._totals["completed"] += 1
+
+    # --- Session Lifecycle ---
+
+    def session_disconnected(self, session_id: str):
+        """Last subscriber left: apply the disconnect policy to the session's tasks."""
+        entries = self._live.get(session_id)
+        if not entries:
+            return
+
+        cancelled = detached = 0
+        for entry in list(entries):
+            if self.policies[entry.kind] is DisconnectPolicy.CANCEL:
+                entry.task.cancel()
+                cancelled += 1
+            else:
+                entry.detached = True
+                detached += 1
+
+        if detached and self.detach_timeout > 0:
+            self._clear_detach_timer(session_id)
+            loop = asyncio.get_running_loop()
+            self._detach_timers[session_id] = loop.call_later(
+                self.detach_timeout, self._expire_detached, session_id
+            )
+        logger.info(f"🔌 {session_id} disconnected: cancelled {cancelled}, detached {detached} task(s)")
+
+    def session_reattached(self, session_id: str):
+        """A socket joined again: detached tasks report to it from now on."""
+        self._clear_detach_timer(session_id)
+        for entry in self._live.get(session_id, ()):
+            entry.detached = False
+
+    def cancel_session(self, session_id: str, reason: str = "session closed") -> int:
+        entries = list(self._live.get(session_id, ()))
+        for entry in entries:
+            entry.task.cancel()
+        if entries:
+            logger.info(f"🛑 Cancelled {len(entries)} task(s) of {session_id} ({reason})")
+        return len(entries)
+
+    def _expire_detached(self, session_id: str):
+        self._detach_timers.pop(session_id, None)
+        expired = [e for e in self._live.get(session_id, ()) if e.detached]
+        for entry in expired:
+            entry.task.cancel()
+        if expired:
+            logger.info(f"⌛ Cancelled {len(expired)} detached task(s) of {session_id} after {self.detach_timeout:.0f}s")
+
+    def _clear_detach_timer(self, session_id: str):
+        timer = self._detach_timers.pop(session_id, None)
+        if timer:
+            timer.cancel()
+
+    # --- Shutdown ---
+
+    async def drain(self, deadline: float):
+        """
+        Graceful shutdown: refuse new work, let live tasks finish for up to 'deadline'
+        seconds, then cancel the stragglers and wait 'cancel_grace' for their
+        cancellation handlers (see class docstring).
+        """
+        self.accepting = False
+        for session_id in list(self._detach_timers):
+            self._clear_detach_timer(session_id)
+
+        tasks = self._tasks()
+        if not tasks:
+            logger.info("🚦 Drain: no live tasks")
+            return
+
+        logger.info(f"🚦 Draining {len(tasks)} task(s) (deadline {deadline:.0f}s)")
+        _, pending = await asyncio.wait(tasks, timeout=deadline)
+        if not pending:
+            logger.info("✅ Drain complete")
+            return
+
+        logger.warning(f"⚠️ Drain deadline reached: cancelling {len(pending)} task(s)")
+        for task in pending:
+            task.cancel()
+        _, stuck = await asyncio.wait(pending, timeout=self.cancel_grace)
+        if stuck:
+            logger.error(f"🔥 {len(stuck)} task(s) ignored cancellation: {[t.get_name() for t in stuck]}")
+
+    # --- Telemetry ---
+
+    @property
+    def live_count(self) -> int:
+        return sum(len(entries) for entries in self._live.values())
+
+    def _tasks(self) -> Set[asyncio.Task]:
+        return {entry.task for entries in self._live.values() for entry in entries}
+
+    def snapshot(self) -> Dict:
+        entries = [entry for entries in self._live.values() for entry in entries]
+        now = time.monotonic()
+        oldest: Optional[float] = min((e.started for e in entries), default=None)
+        return {
+            "accepting": self.accepting,
+            "live": {kind.value: sum(1 for e in entries if e.kind is kind) for kind in TaskKind},
+            "detached": sum(1 for e in entries if e.detached),
+            "sessions": len(self._live),
+            "peak_live": self._peak_live,
+            "oldest_age_s": round(now - oldest, 1) if oldest is not None else 0.0,
+            "totals": dict(self._totals),
+            "policies": {kind.value: policy.value for kind, policy in self.policies.items()},
+        }
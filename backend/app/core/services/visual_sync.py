@@ -0,0 +1,151 @@
+# app/core/services/visual_sync.py
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple, Union
+
+from app.config.settings import AppConfig
+from app.core.interfaces.blob_store import IBlobStore, blob_digest
+from app.core.services.state_manager import StateManager, VISUALS
+from app.domain.models.state import SessionState
+from app.utils.logger import setup_logger
+
+logger = setup_logger("VisualSync")
+
+STORED = "stored"
+UPLOAD_REQUIRED = "upload_required"
+REJECTED = "rejected"
+
+@dataclass
+class _PendingUpload:
+    total: int
+    chunks: Dict[int, bytes] = field(default_factory=dict)
+    size: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+class VisualSyncService:
+    """
+    Hash-first visual sync.
+    The client offers a digest; the blob is only transferred (whole or chunked)
+    if the Blob Store does not hold it yet. SessionState keeps digests only
+    (state.visual_artifacts: versioned id -> digest), so identical renders across
+    versions share one stored copy and unchanged renders cost no session save.
+
+    Digest = SHA-256 hex of the UTF-8 encoded visual data (SVG markup or PNG base64).
+    """
+
+    def __init__(self, blob_store: IBlobStore, state_manager: StateManager):
+        self.blob_store = blob_store
+        self.state_manager = state_manager
+        # Key: (session_id, digest). Chunks for one upload arrive in order on the FAST lane.
+        self._uploads: Dict[Tuple[str, str], _PendingUpload] = {}
+
+    # --- 1. Handshake ---
+
+    async def offer(self, session_id: str, doc_id: str, digest: str) -> str:
+        """Returns 'stored' if the blob is already known (and attaches it), else 'upload_required'."""
+        if await self.blob_store.has(digest):
+            await self._attach(session_id, doc_id, digest)
+            return STORED
+        return UPLOAD_REQUIRED
+
+    # --- 2. Transfer ---
+
+    async def receive_chunk(
+        self,
+        session_id: str,
+        doc_id: str,
+        digest: str,
+        index: int,
+        total: int,
+        data: Union[str, bytes]
+    ) -> Optional[str]:
+        """
+        Buffers one chunk. Returns None while the upload is incomplete,
+        then the final status ('stored' / 'rejected').
+        """
+        self._expire_uploads()
+        key = (session_id, digest)
+
+        if total <= 0 or not 0 <= index < total:
+            self._uploads.pop(key, None)
+            return REJECTED
+
+        upload = self._uploads.get(key)
+        if upload is None or upload.total != total:
+            upload = _PendingUpload(total=total)
+            self._uploads[key] = upload
+
+        chunk = data.encode("utf-8") if isinstance(data, str) else bytes(data)
+        upload.size += len(chunk) - len(upload.chunks.get(index, b""))
+        upload.chunks[index] = chunk
+
+        if upload.size > AppConfig.VISUAL_MAX_BYTES:
+            logger.warning(f"⚠️ Visual upload {digest[:12]} exceeds {AppConfig.VISUAL_MAX_BYTES} bytes. Dropped.")
+            del self._uploads[key]
+            return REJECTED
+
+        if len(upload.chunks) < total:
+            return None
+
+        del self._uploads[key]
+        blob = b"".join(upload.chunks[i] for i in range(total))
+        return await self._store(session_id, doc_id, blob, digest)
+
+    async def upload(self, session_id: str, doc_id: str, visual_data: str, digest: Optional[str] = None) -> str:
+        """Single-message upload (ARTIFACT_VISUAL_SYNC). 'digest' is verified when provided."""
+        blob = visual_data.encode("utf-8")
+        if len(blob) > AppConfig.VISUAL_MAX_BYTES:
+            logger.warning(f"⚠️ Visual upload for {doc_id} exceeds {AppConfig.VISUAL_MAX_BYTES} bytes. Dropped.")
+            return REJECTED
+        return await self._store(session_id, doc_id, blob, digest or blob_digest(blob))
+
+    # --- 3. Read Side ---
+
+    async def resolve(self, state: SessionState, internal_id: str) -> Optional[str]:
+        """Returns the visual data (text) stored for a versioned artifact id."""
+        digest = state.visual_artifacts.get(internal_id)
+        if not digest:
+            return None
+        blob = await self.blob_store.get(digest)
+        return blob.decode("utf-8") if blob is not None else None
+
+    # --- Internals ---
+
+    async def _store(self, session_id: str, doc_id: str, blob: bytes, digest: str) -> str:
+        actual = blob_digest(blob)
+        if actual != digest:
+            logger.warning(f"⚠️ Visual digest mismatch for {doc_id}: expected {digest[:12]}, got {actual[:12]}")
+            return REJECTED
+
+        await self.blob_store.put(blob)
+        await self._attach(session_id, doc_id, digest)
+        return STORED
+
+    async def _attach(self, session_id: str, doc_id: str, digest: str) -> bool:
+        """
+        Points the CURRENT version of the artifact at the digest.
+        Saves the session only if the reference actually changed.
+        """
+        state = await self.state_manager.get_or_create_session(session_id)
+
+        # The frontend sends the wire id ('mermaid_diagram'); the visual belongs to the latest version.
+        current_version = state.artifact_counters.get(doc_id, 0)
+        if current_version == 0:
+            logger.warning(f"⚠️ Received visual sync for unknown artifact: {doc_id}")
+            return False
+
+        internal_id = f"{doc_id}-v{current_version}"
+        if state.visual_artifacts.get(internal_id) == digest:
+            logger.debug(f"⏭️ Visual for {internal_id} unchanged ({digest[:12]})")
+            return False
+
+        state.visual_artifacts[internal_id] = digest
+        await self.state_manager.save_session(state, VISUALS)
+        logger.info(f"🖼️ Linked visual {digest[:12]} to {internal_id}")
+        return True
+
+    def _expire_uploads(self):
+        cutoff = time.monotonic() - AppConfig.VISUAL_UPLOAD_TTL
+        for key in [k for k, u in self._uploads.items() if u.started < cutoff]:
+            logger.warning(f"⌛ Abandoned visual upload {key[1][:12]} for session {key[0]}")
+            del self._uploads[key]
@@ -0,0 +1,185 @@
+# app/core/services/work_scheduler.py
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import AsyncIterator, Deque, Dict, Iterator, Tuple
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger("WorkScheduler")
+
+WAIT_SAMPLES = 1024
+SLOW_WAIT_SECONDS = 1.0
+
+class WorkPriority(IntEnum):
+    # Lower value = served first
+    INTERACTIVE = 0   # chat turns (incl. the tools / audits they run)
+    BACKGROUND = 1    # artifact generation
+
+# Who the current LLM work belongs to. Tasks copy it when created (see Orchestrator).
+_work_context: ContextVar[Tuple[str, WorkPriority]] = ContextVar(
+    "work_context", default=("-", WorkPriority.INTERACTIVE)
+)
+
+@contextmanager
+def work_context(session_id: str, priority: WorkPriority) -> Iterator[None]:
+    token = _work_context.set((session_id, priority))
+    try:
+        yield
+    finally:
+        _work_context.reset(token)
+
+@dataclass
+class _Waiter:
+    future: asyncio.Future
+    session_id: str
+    priority: WorkPriority
+    enqueued: float = field(default_factory=time.monotonic)
+
+class SchedulerPool:
+    """
+    Bounded slots for one provider/model.
+    Waiters are queued per priority class, and per session inside a class;
+    sessions are served round-robin so one session's burst cannot starve the others.
+    """
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        # Configured ceiling; 'limit' may be lowered below it at runtime (see RateLimiter)
+        self.max_limit = limit
+        self.active = 0
+        self.granted = 0
+        self.waits: Deque[float] = deque(maxlen=WAIT_SAMPLES)
+        self.queues: Dict[WorkPriority, "OrderedDict[str, Deque[_Waiter]]"] = {p: OrderedDict() for p in WorkPriority}
+
+    def depth(self, priority: WorkPriority) -> int:
+        return sum(len(q) for q in self.queues[priority].values())
+
+    def enqueue(self, waiter: _Waiter):
+        self.queues[waiter.priority].setdefault(waiter.session_id, deque()).append(waiter)
+
+    def remove(self, waiter: _Waiter):
+        sessions = self.queues[waiter.priority]
+        queue = sessions.get(waiter.session_id)
+        if queue and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del sessions[waiter.session_id]
+
+    def set_limit(self, limit: int):
+        """Adaptive concurrency: shrinking lets in-flight calls finish, growing admits waiters now."""
+        self.limit = max(1, min(limit, self.max_limit))
+        self.dispatch()
+
+    def grant(self, waited: float):
+        self.active += 1
+        self.granted += 1
+        self.waits.append(waited)
+
+    def dispatch(self):
+        """Hands free slots to the next waiters (highest priority first, sessions round-robin)."""
+        while self.active < self.limit:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            if waiter.future.done():
+                continue
+            waited = time.monotonic() - waiter.enqueued
+            self.grant(waited)
+            waiter.future.set_result(None)
+            if waited > SLOW_WAIT_SECONDS:
+                logger.info(
+                    f"⏳ [{self.name}] {waiter.priority.name.lower()} work for {waiter.session_id} "
+                    f"waited {waited:.1f}s (active {self.active}/{self.limit})"
+                )
+
+    def _next_waiter(self):
+        for priority in WorkPriority:
+            sessions = self.queues[priority]
+            if not sessions:
+                continue
+            session_id, queue = next(iter(sessions.items()))
+            waiter = queue.popleft()
+            if queue:
+                sessions.move_to_end(session_id)   # round-robin: this session goes to the back
+            else:
+                del sessions[session_id]
+            return waiter
+        return None
+
+class WorkScheduler:
+    """
+    Process-wide admission control for LLM work.
+    Every provider/model pool has a bounded number of concurrent calls
+    (instead of one unbounded asyncio task per artifact per session);
+    interactive chat work is admitted before background generation.
+    """
+
+    def __init__(self, limits: Dict[str, int], default_limit: int):
+        self.limits = limits
+        self.default_limit = default_limit
+        self._pools: Dict[str, SchedulerPool] = {}
+
+    def pool(self, name: str) -> SchedulerPool:
+        """Limit lookup: exact 'provider/model', then 'provider', then the default."""
+        if name not in self._pools:
+            provider = name.split("/", 1)[0]
+            limit = self.limits.get(name, self.limits.get(provider, self.default_limit))
+            self._pools[name] = SchedulerPool(name, max(1, limit))
+        return self._pools[name]
+
+    @asynccontextmanager
+    async def slot(self, pool_name: str) -> AsyncIterator[None]:
+        """Holds one slot of 'pool_name' for the duration of the block."""
+        session_id, priority = _work_context.get()
+        pool = self.pool(pool_name)
+        await self._acquire(pool, session_id, priority)
+        try:
+            yield
+        finally:
+            pool.active -= 1
+            pool.dispatch()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {name: _pool_stats(pool) for name, pool in sorted(self._pools.items())}
+
+    # --- Internals ---
+
+    async def _acquire(self, pool: SchedulerPool, session_id: str, priority: WorkPriority):
+        queued = any(pool.queues[p] for p in WorkPriority)
+        if pool.active < pool.limit and not queued:
+            pool.grant(0.0)
+            return
+
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), session_id, priority)
+        pool.enqueue(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted and cancelled in the same tick: give the slot back
+                pool.active -= 1
+                pool.dispatch()
+            else:
+                pool.remove(waiter)
+            raise
+
+def _pool_stats(pool: SchedulerPool) -> Dict:
+    waits = sorted(pool.waits)
+
+    def pct(p: float) -> float:
+        return round(waits[min(len(waits) - 1, int(len(waits) * p))] * 1000, 1) if waits else 0.0
+
+    return {
+        "limit": pool.limit,
+        "max_limit": pool.max_limit,
+        "active": pool.active,
+        "queued": {p.name.lower(): pool.depth(p) for p in WorkPriority},
+        "granted": pool.granted,
+        "wait_ms": {"p50": pct(0.5), "p95": pct(0.95), "max": pct(1.0)},
+    }
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, Type
+from typing import Any, Callable, Dict, Tuple, Type
 from pydantic import BaseModel
 from app.domain.models.state import SessionState
 
@@ -19,6 +19,12 @@ class BaseTool(ABC):
     description: str
     input_model: Type[BaseModel]
 
+    # Ordering constraints within one LLM response (see ToolExecutor).
+    # Tools named here must finish first when they appear earlier in the batch.
+    runs_after: Tuple[str, ...] = ()
+    # True = calls of this tool in one batch run one after another, in order.
+    serial: bool = False
+
     @property
     def openai_schema(self) -> Dict[str, Any]:
         """Auto-generates the schema for the LLM Provider"""
@@ -16,6 +16,8 @@ class UpdateRequirementsTool(BaseTool):
     name = "update_requirements"
     description = "Saves requirements to the Ledger (Scope, Actors, Goals, Steps, Data, NFRs). ALWAYS runs a Compliance Audit immediately after saving. Returns audit results."
     input_model = UpdateRequirementsInput
+    # Read-merge-save on the ledger: concurrent calls would lose updates
+    serial = True
 
     async def execute(self, args: dict, ctx: ToolContext) -> str:
         try:
@@ -25,7 +27,9 @@ class UpdateRequirementsTool(BaseTool):
                  return json.dumps({"error": "Requirements Service not available"})
 
             # 2. Delegate to Service
-            result = await req_service.process_update(ctx.state.session_id, args)
+            result = await req_service.process_update(
+                ctx.state.session_id, args, scheduler=ctx.services.get("scheduler")
+            )
 
             # 3. Handle Side Effects
             updated_state = result.pop("_internal_state", None)
@@ -80,6 +84,8 @@ class TriggerVisualizationTool(BaseTool):
     name = "trigger_visualization"
     description = "Queues artifact generation (Diagrams, Stories, Workbook, Use Cases). ONLY call this if 'update_requirements' returns no blocking compliance errors."
     input_model = TriggerVisualizationInput
+    # Generators must see the ledger / artifacts written earlier in the same response
+    runs_after = ("update_requirements", "patch_artifact")
 
     async def execute(self, args: dict, ctx: ToolContext) -> str:
         try:
@@ -88,6 +94,7 @@ class TriggerVisualizationTool(BaseTool):
                 return json.dumps({"error": "Scheduler service not available"})
 
             artifact_types = args.get("artifact_types", [])
+            regenerate = bool(args.get("regenerate", False))
             
             # Simple heuristic check
             if not ctx.state.project_scope and not ctx.state.actors:
@@ -96,14 +103,20 @@ class TriggerVisualizationTool(BaseTool):
                     "reason": "State is empty. Cannot visualize yet."
                 })
 
-            triggered = []
+            triggered, skipped = [], []
             for artifact in artifact_types:
-                scheduler_func(artifact)
-                triggered.append(artifact)
+                # False = already generating from the latest ledger update (speculative run)
+                if scheduler_func(artifact, regenerate=regenerate):
+                    triggered.append(artifact)
+                else:
+                    skipped.append(artifact)
 
+            message = f"Background jobs started for: {triggered}."
+            if skipped:
+                message += f" Already generating from the latest ledger update: {skipped}."
             return json.dumps({
                 "status": "queued",
-                "message": f"Background jobs started for: {triggered}."
+                "message": message
             })
             
         except Exception as e:
@@ -114,6 +127,7 @@ class InspectArtifactTool(BaseTool):
     name = "inspect_artifact"
     description = "Read details from an existing artifact. Use this before answering questions about specific estimates, criteria, or steps."
     input_model = InspectArtifactInput
+    runs_after = ("patch_artifact",)
 
     async def execute(self, args: dict, ctx: ToolContext) -> str:
         a_type = args.get("artifact_type")
@@ -149,6 +163,7 @@ class PatchArtifactTool(BaseTool):
     name = "patch_artifact"
     description = "Surgically update a specific item (User Story, Use Case) without regenerating the whole list. Use for estimates, priorities, or minor text fixes."
     input_model = PatchArtifactInput
+    serial = True
 
     async def execute(self, args: dict, ctx: ToolContext) -> str:
         a_type = args.get("artifact_type")
@@ -0,0 +1,93 @@
+# app/core/tools/executor.py
+import asyncio
+import json
+from typing import Dict, List, Optional
+
+from app.core.llm.types import ToolCallRequest
+from app.core.tools.base import BaseTool, ToolContext
+from app.core.tools.registry import ToolRegistry
+from app.utils.logger import setup_logger
+
+logger = setup_logger("ToolExecutor")
+
+class ToolExecutor:
+    """
+    Runs the tool calls of one LLM response concurrently where it is safe.
+
+    A call waits for an EARLIER call in the same batch when:
+    - the earlier call's tool is listed in its 'runs_after'
+      (e.g. trigger_visualization waits for update_requirements), or
+    - both call the same tool and the tool is 'serial'
+      (e.g. two update_requirements must merge in order).
+    Everything else starts immediately. Outputs are returned in call order,
+    so tool messages keep the order the model emitted them in.
+    """
+
+    def __init__(self, registry: ToolRegistry):
+        self.registry = registry
+
+    async def run(self, tool_calls: List[ToolCallRequest], ctx: ToolContext) -> List[str]:
+        tasks: List[asyncio.Task] = []
+        tools: List[Optional[BaseTool]] = [self.registry.get_tool(tc.function_name) for tc in tool_calls]
+
+        for i, tool_call in enumerate(tool_calls):
+            deps = [tasks[j] for j in range(i) if self._must_wait(tools[i], tools[j])]
+            tasks.append(asyncio.create_task(self._run_after(deps, tool_call, tools[i], ctx)))
+
+        if len(tasks) > 1:
+            logger.info(f"⚡ Executing {len(tasks)} tool calls ({self._describe(tool_calls, tools)})")
+
+        try:
+            return list(await asyncio.gather(*tasks))
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    # --- Internals ---
+
+    @staticmethod
+    def _must_wait(tool: Optional[BaseTool], earlier: Optional[BaseTool]) -> bool:
+        if tool is None or earlier is None:
+            return False
+        if earlier.name in tool.runs_after:
+            return True
+        return tool.name == earlier.name and tool.serial
+
+    async def _run_after(
+        self,
+        deps: List[asyncio.Task],
+        tool_call: ToolCallRequest,
+        tool: Optional[BaseTool],
+        ctx: ToolContext
+    ) -> str:
+        if deps:
+            await asyncio.wait(deps)
+        return await self._execute(tool_call, tool, ctx)
+
+    async def _execute(self, tool_call: ToolCallRequest, tool: Optional[BaseTool], ctx: ToolContext) -> str:
+        tool_name = tool_call.function_name
+
+        if not tool:
+            error_msg = f"Unknown tool: {tool_name}"
+            logger.error(f"❌ {error_msg}")
+            return json.dumps({"error": error_msg})
+
+        try:
+            args = json.loads(tool_call.arguments)
+            logger.info(f"🛠️ Tool Execution: {tool_name}")
+            # Tools handle their own Mapper logic for Side Effects
+            return await tool.execute(args, ctx)
+        except Exception as e:
+            error_msg = f"Tool execution failed: {str(e)}"
+            logger.error(f"❌ {error_msg}")
+            return json.dumps({"error": error_msg})
+
+    def _describe(self, tool_calls: List[ToolCallRequest], tools: List[Optional[BaseTool]]) -> str:
+        waits: Dict[int, List[int]] = {
+            i: [j for j in range(i) if self._must_wait(tools[i], tools[j])] for i in range(len(tool_calls))
+        }
+        return ", ".join(
+            f"{tc.function_name}" + (f"<-{waits[i]}" if waits[i] else "")
+            for i, tc in enumerate(tool_calls)
+        )
@@ -43,6 +43,10 @@ class TriggerVisualizationInput(BaseModel):
         ..., 
         description="Artifacts to generate. Recommended to request all: ['mermaid_diagram', 'user_story', 'workbook', 'use_case'] for full analysis."
     )
+    regenerate: bool = Field(
+        False,
+        description="True ONLY when the user explicitly asks to regenerate / try again: produces a fresh version even if nothing changed."
+    )
 
 class InspectArtifactInput(BaseModel):
     model_config = ConfigDict(extra='forbid')
@@ -1,15 +1,20 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 from app.core.tools.base import BaseTool
 
 class ToolRegistry:
     def __init__(self):
         self._tools: Dict[str, BaseTool] = {}
+        # Schemas are static per tool set; computed once, invalidated on register
+        self._schemas: Optional[List[Dict]] = None
 
     def register(self, tool: BaseTool):
         self._tools[tool.name] = tool
+        self._schemas = None
 
     def get_tool(self, name: str) -> BaseTool:
         return self._tools.get(name)
 
     def get_schemas(self) -> List[Dict]:
-        return [t.openai_schema for t in self._tools.values()]
\ No newline at end of file
+        if self._schemas is None:
+            self._schemas = [t.openai_schema for t in self._tools.values()]
+        return self._schemas
\ No newline at end of file
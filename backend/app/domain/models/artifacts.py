@@ -26,6 +26,11 @@ class UserStory(BaseModel):
 class StoryArtifact(BaseModel):
     stories: List[UserStory]
 
+class StoryPatch(BaseModel):
+    """Incremental update: only new and affected stories (merged by id)."""
+    stories: List[UserStory] = Field(..., description="New stories, plus the full updated version of each AFFECTED story (same id)")
+    removed_ids: List[str] = Field(default_factory=list, description="Ids of AFFECTED or UNCHANGED stories that no longer apply")
+
 
 class WorkbookItem(BaseModel):
     id: str = Field(description="Unique ID") 
@@ -56,4 +61,9 @@ class UseCase(BaseModel):
     main_flow: List[UseCaseStep]
 
 class UseCaseArtifact(BaseModel):
-    use_cases: List[UseCase]
\ No newline at end of file
+    use_cases: List[UseCase]
+
+class UseCasePatch(BaseModel):
+    """Incremental update: only new and affected use cases (merged by id)."""
+    use_cases: List[UseCase] = Field(..., description="New use cases, plus the full updated version of each AFFECTED use case (same id)")
+    removed_ids: List[str] = Field(default_factory=list, description="Ids of AFFECTED or UNCHANGED use cases that no longer apply")
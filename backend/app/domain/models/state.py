@@ -51,6 +51,11 @@ class ExtractionResult(BaseModel):
 class SessionState(BaseModel):
     session_id: str
     chat_history: List[Dict[str, Any]] = []
+
+    # Rolling summary of chat_history[:history_summary_cursor] (see HistoryWindow).
+    # The LLM sees [summary] + chat_history[cursor:]; the UI still gets the full history.
+    history_summary: Optional[str] = None
+    history_summary_cursor: int = 0
     
     # The Ledger
     project_scope: Optional[str] = None
@@ -66,12 +71,25 @@ class SessionState(BaseModel):
     artifacts: Dict[str, Any] = {}
 
     # Visual Storage (Rendered Content)
-    # Key: 'mermaid_diagram-v1', Value: "<svg>...</svg>"
-    # We store it against the specific version so we have history.
+    # Key: 'mermaid_diagram-v1', Value: SHA-256 digest of the SVG in the Blob Store
+    # We store it against the specific version so we have history;
+    # identical renders across versions share one blob (see VisualSyncService).
     visual_artifacts: Dict[str, str] = {}
 
     # Sequence Counters (For Versioning)
     # Key: Artifact Type (e.g., 'mermaid_diagram')
     # Value: Latest Version Integer (e.g., 1)
     # This guarantees we never reuse an ID or overwrite history.
-    artifact_counters: Dict[str, int] = {}
\ No newline at end of file
+    artifact_counters: Dict[str, int] = {}
+
+    # Input Fingerprints (Regeneration Skip)
+    # Key: Versioned ID, Value: fingerprint of the generator inputs that would
+    # reproduce it (see artifact_fingerprint). Unchanged ledger + unedited
+    # artifact = same fingerprint = no LLM call.
+    artifact_fingerprints: Dict[str, str] = {}
+
+    # Ledger Basis (Incremental Regeneration)
+    # Key: Versioned ID, Value: the actors / process steps the generator read
+    # (see ledger_basis). The next run diffs against it and only regenerates
+    # the affected stories / use cases.
+    artifact_bases: Dict[str, Dict[str, Any]] = {}
@@ -0,0 +1,29 @@
+# app/infrastructure/messaging/in_process.py
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from app.core.interfaces.event_bus import IEventBus, EventHandler
+
+class InProcessEventBus(IEventBus):
+    """
+    Single-worker implementation.
+    Delivery is a direct, synchronous handler call: no serialization and no
+    suspension point between publish and fan-out.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, List[EventHandler]] = defaultdict(list)
+
+    async def publish(self, session_id: str, event_type: str, payload: Any) -> None:
+        for handler in list(self._handlers.get(session_id, ())):
+            handler(event_type, payload)
+
+    def subscribe(self, session_id: str, handler: EventHandler) -> None:
+        self._handlers[session_id].append(handler)
+
+    def unsubscribe(self, session_id: str, handler: EventHandler) -> None:
+        handlers = self._handlers.get(session_id)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+            if not handlers:
+                del self._handlers[session_id]
@@ -0,0 +1,229 @@
+# app/infrastructure/messaging/socket_broker.py
+"""
+Local broker stand-in for multi-worker deployments (no Redis required).
+
+SocketBroker is a tiny pub/sub server; SocketEventBus is the IEventBus client
+each uvicorn worker uses. Frames are length-prefixed JSON:
+
+    [4-byte big-endian length][{"op": "sub" | "unsub" | "pub", "session": ..., ...}]
+
+Run the broker next to the workers:
+    python -m app.infrastructure.messaging.socket_broker --port 7400
+"""
+import argparse
+import asyncio
+import json
+import struct
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set
+
+from app.core.interfaces.event_bus import IEventBus, EventHandler
+from app.utils.logger import setup_logger
+
+logger = setup_logger("SocketBroker")
+
+_HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 32 * 1024 * 1024
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    body = json.dumps(message).encode("utf-8")
+    return _HEADER.pack(len(body)) + body
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes:
+    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    if size > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame too large: {size} bytes")
+    return await reader.readexactly(size)
+
+# --- 1. Broker (server) ---
+
+class SocketBroker:
+    """
+    Routes 'pub' frames to every connection subscribed to the session.
+    Frames are forwarded as-is (never re-encoded), in arrival order per publisher.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 7400):
+        self.host = host
+        self.port = port
+        self._subscribers: Dict[str, Set[asyncio.StreamWriter]] = defaultdict(set)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        # Port 0 = pick a free one (tests / benchmarks)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"📮 Broker listening on {self.host}:{self.port}")
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        sessions: Set[str] = set()
+        try:
+            while True:
+                raw = await read_frame(reader)
+                frame = json.loads(raw)
+                op, session_id = frame.get("op"), frame.get("session")
+
+                if op == "pub":
+                    await self._route(session_id, _HEADER.pack(len(raw)) + raw)
+                elif op == "sub":
+                    self._subscribers[session_id].add(writer)
+                    sessions.add(session_id)
+                elif op == "unsub":
+                    self._drop(session_id, writer)
+                    sessions.discard(session_id)
+
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            logger.warning(f"⚠️ Broker connection error: {e}")
+        finally:
+            for session_id in sessions:
+                self._drop(session_id, writer)
+            writer.close()
+
+    async def _route(self, session_id: str, data: bytes):
+        targets = list(self._subscribers.get(session_id, ()))
+        for target in targets:
+            target.write(data)
+        # Backpressure: only waits when a subscriber's buffer is above the high-water mark
+        for target in targets:
+            try:
+                await target.drain()
+            except ConnectionError:
+                self._drop(session_id, target)
+
+    def _drop(self, session_id: str, writer: asyncio.StreamWriter):
+        subscribers = self._subscribers.get(session_id)
+        if subscribers is not None:
+            subscribers.discard(writer)
+            if not subscribers:
+                del self._subscribers[session_id]
+
+# --- 2. Worker-side client ---
+
+class SocketEventBus(IEventBus):
+    """
+    IEventBus backed by SocketBroker. Every event (including this worker's own)
+    goes through the broker, so all workers observe the same per-session order.
+    Reconnects with backoff and re-subscribes; events published while the broker
+    is unreachable are dropped (clients recover through the full-state restore).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 7400):
+        self.host = host
+        self.port = port
+        self._handlers: Dict[str, List[EventHandler]] = defaultdict(list)
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def start(self) -> None:
+        self._closed = False
+        await self._connect()
+        self._reader_task = asyncio.create_task(self._read_loop())
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._reader_task:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+
+    async def publish(self, session_id: str, event_type: str, payload: Any) -> None:
+        writer = self._writer
+        if writer is None:
+            logger.warning(f"⚠️ Broker unavailable. Dropped {event_type} for {session_id}")
+            return
+        try:
+            writer.write(encode_frame({"op": "pub", "session": session_id, "type": event_type, "payload": payload}))
+            await writer.drain()
+        except OSError as e:
+            # Incl. ConnectionError: the connection dropped under us. Same as unavailable, never raise into emit()
+            logger.warning(f"⚠️ Broker write failed ({e!r}). Dropped {event_type} for {session_id}")
+            self._connection_lost(writer)
+
+    def subscribe(self, session_id: str, handler: EventHandler) -> None:
+        handlers = self._handlers[session_id]
+        handlers.append(handler)
+        if len(handlers) == 1:
+            self._send_control("sub", session_id)
+
+    def unsubscribe(self, session_id: str, handler: EventHandler) -> None:
+        handlers = self._handlers.get(session_id)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+            if not handlers:
+                del self._handlers[session_id]
+                self._send_control("unsub", session_id)
+
+    # --- Internals ---
+
+    def _send_control(self, op: str, session_id: str):
+        if self._writer is not None:
+            self._writer.write(encode_frame({"op": op, "session": session_id}))
+
+    def _connection_lost(self, writer: asyncio.StreamWriter):
+        """Drops a broken connection; closing it wakes the read loop, which reconnects."""
+        if self._writer is writer:
+            self._writer = None
+        writer.close()
+
+    async def _connect(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        self._reader, self._writer = reader, writer
+        for session_id in self._handlers:
+            self._send_control("sub", session_id)
+        logger.info(f"🔗 Connected to broker {self.host}:{self.port} ({len(self._handlers)} sessions)")
+
+    def _dispatch(self, frame: Dict[str, Any]):
+        for handler in list(self._handlers.get(frame.get("session"), ())):
+            try:
+                handler(frame["type"], frame.get("payload"))
+            except Exception as e:
+                logger.error(f"❌ Event handler failed for {frame.get('type')}: {e}")
+
+    async def _read_loop(self):
+        delay = 0.5
+        while not self._closed:
+            try:
+                while True:
+                    frame = json.loads(await read_frame(self._reader))
+                    delay = 0.5
+                    self._dispatch(frame)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Lost broker connection: {e}. Retrying in {delay:.1f}s")
+                self._writer = None
+
+            while not self._closed and self._writer is None:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 10.0)
+                try:
+                    await self._connect()
+                except OSError:
+                    continue
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local session event broker")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7400)
+    args = parser.parse_args()
+    asyncio.run(SocketBroker(args.host, args.port).serve_forever())
@@ -0,0 +1,49 @@
+# app/infrastructure/persistence/jsonl_cassette.py
+import asyncio
+import json
+import os
+import threading
+from typing import Any, Dict, List
+
+from app.core.interfaces.cassette_store import ICassetteStore
+from app.utils.logger import setup_logger
+
+logger = setup_logger("JsonlCassette")
+
+class JsonlCassetteStore(ICassetteStore):
+    """
+    One JSON record per line (stdlib only): easy to diff, ship to an offline box and concatenate.
+    Each record is written with a single append, so several workers can record into the same file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+
+    def load(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return []
+
+        records: List[Dict[str, Any]] = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # A torn last line (killed while recording) must not lose the rest
+                    logger.warning(f"⚠️ Skipping unreadable cassette line {number} in {self.path}")
+        logger.info(f"📼 Loaded {len(records)} recorded exchanges from {self.path}")
+        return records
+
+    async def append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        await asyncio.to_thread(self._append, line)
+
+    def _append(self, line: str):
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
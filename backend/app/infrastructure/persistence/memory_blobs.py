@@ -0,0 +1,48 @@
+# app/infrastructure/persistence/memory_blobs.py
+from collections import OrderedDict
+from typing import Optional
+from app.core.interfaces.blob_store import IBlobStore, blob_digest
+from app.utils.logger import setup_logger
+
+logger = setup_logger("MemoryBlobs")
+
+class MemoryBlobStore(IBlobStore):
+    """
+    In-Memory implementation of the content-addressed Blob Store.
+    Non-persistent (data lost on restart), like MemorySessionRepository.
+    LRU bounded by the total size of the stored blobs ('max_bytes'): an evicted
+    visual resolves to None and the next offer asks the client to upload it again.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._blobs: "OrderedDict[str, bytes]" = OrderedDict()
+
+    async def has(self, digest: str) -> bool:
+        if digest not in self._blobs:
+            return False
+        self._blobs.move_to_end(digest)
+        return True
+
+    async def get(self, digest: str) -> Optional[bytes]:
+        data = self._blobs.get(digest)
+        if data is not None:
+            self._blobs.move_to_end(digest)
+        return data
+
+    async def put(self, data: bytes) -> str:
+        digest = blob_digest(data)
+        if digest in self._blobs:
+            self._blobs.move_to_end(digest)
+            return digest
+
+        self._blobs[digest] = data
+        self.size += len(data)
+        logger.debug(f"💾 Stored blob {digest[:12]} ({len(data)} bytes, {len(self._blobs)} total)")
+
+        # The newest blob is always kept (a single upload is capped by VISUAL_MAX_BYTES)
+        while len(self._blobs) > 1 and self.size > self.max_bytes:
+            evicted, evicted_data = self._blobs.popitem(last=False)
+            self.size -= len(evicted_data)
+            logger.debug(f"🗑️ Evicted blob {evicted[:12]} ({len(evicted_data)} bytes)")
+        return digest
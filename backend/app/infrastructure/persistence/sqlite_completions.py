@@ -0,0 +1,64 @@
+# app/infrastructure/persistence/sqlite_completions.py
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from app.core.interfaces.completion_store import ICompletionStore
+from app.utils.logger import setup_logger
+
+logger = setup_logger("SQLiteCompletions")
+
+# Expired rows are purged every N writes
+PURGE_EVERY = 256
+
+class SQLiteCompletionStore(ICompletionStore):
+    """
+    SQLite implementation of the completion cache's durable tier (stdlib only).
+    Survives restarts and is shared by every worker on the host (WAL mode).
+    Blocking sqlite calls run in a worker thread so the event loop never waits on disk.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._writes = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+        logger.info(f"🗄️ Completion cache store at {path}")
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def put(self, key: str, value: str, ttl: float) -> None:
+        await asyncio.to_thread(self._put, key, value, time.time() + ttl)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM completions WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def _put(self, key: str, value: str, expires_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+            self._writes += 1
+            if self._writes % PURGE_EVERY == 0:
+                purged = self._conn.execute("DELETE FROM completions WHERE expires_at <= ?", (time.time(),)).rowcount
+                if purged:
+                    logger.debug(f"🗑️ Purged {purged} expired completion(s)")
@@ -1,7 +1,18 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.api.websockets import router as websocket_router
+from app.api.metrics import router as metrics_router
+from app.service_container import get_service_container, shutdown_service_container
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the process-wide container once, instead of on the first connection
+    await get_service_container().start()
+    yield
+    await shutdown_service_container()
 
+app = FastAPI(lifespan=lifespan)
 
-app.include_router(websocket_router)
\ No newline at end of file
+
+app.include_router(websocket_router)
+app.include_router(metrics_router)
\ No newline at end of file
@@ -1,6 +1,6 @@
 # app/schemas/contract.py
 from enum import Enum
-from typing import List, Literal, Optional, Union
+from typing import Any, List, Literal, Optional, Union
 from pydantic import BaseModel, ConfigDict, Field, RootModel
 from pydantic.alias_generators import to_camel
 
@@ -216,10 +216,24 @@ class MsgChatHistory(CamelModel):
     model_config = ConfigDict(title="MsgChatHistory")
     type: Literal['CHAT_HISTORY']
     payload: ChatHistoryPayload
+class UserMessagePayload(CamelModel):
+    model_config = ConfigDict(title="UserMessagePayload")
+    content: str
+    id: Optional[str] = Field(None, description="Client-generated message id; the sending tab skips its own echo")
+class MsgUserMessage(CamelModel):
+    """Client -> Server: a chat message. Server -> every tab of the session: its echo, before the turn starts."""
+    model_config = ConfigDict(title="MsgUserMessage")
+    type: Literal['USER_MESSAGE']
+    payload: UserMessagePayload
 class SessionEstablishedPayload(CamelModel):
     model_config = ConfigDict(title="SessionEstablishedPayload")
     session_id: str
     is_new: bool
+    # Reconnect replay: every broadcast message carries a top-level 'seq'.
+    # Reconnect with ?session_id=..&last_seq=..&epoch=.. to receive only missed events.
+    epoch: Optional[str] = None
+    seq: Optional[int] = Field(None, description="Last sequence number covered by this connection's restore")
+    resumed: bool = Field(False, description="True if missed events are replayed instead of a full restore")
 
 class MsgSessionEstablished(CamelModel):
     model_config = ConfigDict(title="MsgSessionEstablished")
@@ -247,11 +261,110 @@ class ArtifactVisualSyncPayload(CamelModel):
     id: str = Field(..., description="The artifact ID (e.g. 'mermaid_diagram')")
     visual_data: str = Field(..., description="Raw SVG string or base64 data")
     format: Literal['svg', 'png'] = 'svg'
+    digest: Optional[str] = Field(None, description="SHA-256 hex of visual_data (UTF-8). Verified when present.")
 
 class MsgArtifactVisualSync(CamelModel):
     model_config = ConfigDict(title="MsgArtifactVisualSync")
     type: Literal['ARTIFACT_VISUAL_SYNC']
     payload: ArtifactVisualSyncPayload
+
+# --- HASH-FIRST VISUAL SYNC ---
+# 1. Client -> ARTIFACT_VISUAL_OFFER (digest only)
+# 2. Server -> ARTIFACT_VISUAL_ACK ('stored' = done, 'upload_required' = send the blob)
+# 3. Client -> ARTIFACT_VISUAL_CHUNK x total (or a single ARTIFACT_VISUAL_SYNC)
+# 4. Server -> ARTIFACT_VISUAL_ACK ('stored' or 'rejected' on digest mismatch)
+
+class ArtifactVisualOfferPayload(CamelModel):
+    model_config = ConfigDict(title="ArtifactVisualOfferPayload")
+    id: str = Field(..., description="The artifact ID (e.g. 'mermaid_diagram')")
+    digest: str = Field(..., description="SHA-256 hex of the visual data (UTF-8)")
+    format: Literal['svg', 'png'] = 'svg'
+    size: int = Field(0, description="Byte length of the visual data")
+
+class MsgArtifactVisualOffer(CamelModel):
+    model_config = ConfigDict(title="MsgArtifactVisualOffer")
+    type: Literal['ARTIFACT_VISUAL_OFFER']
+    payload: ArtifactVisualOfferPayload
+
+class ArtifactVisualChunkPayload(CamelModel):
+    model_config = ConfigDict(title="ArtifactVisualChunkPayload")
+    id: str
+    digest: str
+    index: int = Field(..., description="0-based chunk index")
+    total: int = Field(..., description="Total number of chunks")
+    data: str = Field(..., description="Slice of the visual data")
+    format: Literal['svg', 'png'] = 'svg'
+
+class MsgArtifactVisualChunk(CamelModel):
+    model_config = ConfigDict(title="MsgArtifactVisualChunk")
+    type: Literal['ARTIFACT_VISUAL_CHUNK']
+    payload: ArtifactVisualChunkPayload
+
+class VisualAckStatus(str, Enum):
+    STORED = 'stored'
+    UPLOAD_REQUIRED = 'upload_required'
+    REJECTED = 'rejected'
+
+class ArtifactVisualAckPayload(CamelModel):
+    model_config = ConfigDict(title="ArtifactVisualAckPayload")
+    id: str
+    digest: str
+    status: VisualAckStatus
+    # Suggested chunk size for 'upload_required'
+    chunk_size: Optional[int] = None
+
+class MsgArtifactVisualAck(CamelModel):
+    """Server -> Client (sender only). Answers an offer or a completed upload."""
+    model_config = ConfigDict(title="MsgArtifactVisualAck")
+    type: Literal['ARTIFACT_VISUAL_ACK']
+    payload: ArtifactVisualAckPayload
+# --- DELTA ENCODING (RFC 6902 JSON Patch) ---
+
+class JsonPatchTarget(str, Enum):
+    ARTIFACT = 'artifact'
+    STATE = 'state'
+
+class JsonPatchOperation(CamelModel):
+    model_config = ConfigDict(title="JsonPatchOperation")
+    op: Literal['add', 'remove', 'replace', 'move', 'copy', 'test']
+    path: str
+    value: Optional[Any] = None
+    from_: Optional[str] = Field(None, alias='from')
+
+class JsonPatchPayload(CamelModel):
+    model_config = ConfigDict(title="JsonPatchPayload")
+    target: JsonPatchTarget
+    # Artifact wire id (e.g. 'user_story') or the session id for 'state'
+    id: str
+    # Version the ops apply to. None = unconditional full replace (path "").
+    base_version: Optional[int] = None
+    version: int
+    # Artifact documents: parsed JSON of the artifact 'content' string,
+    # or a plain string for non-JSON content (e.g. Mermaid code).
+    ops: List[JsonPatchOperation]
+
+class MsgJsonPatch(CamelModel):
+    model_config = ConfigDict(title="MsgJsonPatch")
+    type: Literal['JSON_PATCH']
+    payload: JsonPatchPayload
+
+class PatchAckStatus(str, Enum):
+    APPLIED = 'applied'
+    MISMATCH = 'mismatch'
+
+class PatchAckPayload(CamelModel):
+    model_config = ConfigDict(title="PatchAckPayload")
+    target: JsonPatchTarget
+    id: str
+    version: int
+    status: PatchAckStatus = PatchAckStatus.APPLIED
+
+class MsgPatchAck(CamelModel):
+    """Client -> Server. Confirms a version, or reports a base mismatch (forces a full payload)."""
+    model_config = ConfigDict(title="MsgPatchAck")
+    type: Literal['PATCH_ACK']
+    payload: PatchAckPayload
+
 # --- ROOT UNION (Exported as WebSocketMessage) ---
 
 class WebSocketMessage(RootModel):
@@ -267,7 +380,13 @@ class WebSocketMessage(RootModel):
         MsgArtifactSync,
         MsgChatHistory,
         MsgSessionEstablished,
-        MsgArtifactVisualSync
+        MsgArtifactVisualSync,
+        MsgArtifactVisualOffer,
+        MsgArtifactVisualChunk,
+        MsgArtifactVisualAck,
+        MsgJsonPatch,
+        MsgPatchAck,
+        MsgUserMessage
     ]
 
 
@@ -0,0 +1,219 @@
+# app/service_container.py
+from typing import Callable, Optional
+
+import httpx
+import openai
+import groq
+
+from app.config.settings import AppConfig
+from app.core.interfaces.repository import ISessionRepository
+from app.core.interfaces.event_bus import IEventBus
+from app.core.llm.interface import ILLMClient
+from app.core.llm.openai_client import OpenAIClient
+from app.core.llm.groq_client import GroqClient
+from app.core.llm.scheduled_client import ScheduledLLMClient
+from app.core.llm.gateway import LLMGateway
+from app.core.llm.cached_client import CachedLLMClient
+from app.core.llm.rate_limited_client import RateLimitedLLMClient
+from app.core.llm.cassette import Cassette, CassetteLLMClient, CassetteMode
+from app.core.interfaces.completion_store import ICompletionStore
+from app.core.services.state_manager import StateManager
+from app.core.services.requirements import RequirementsService
+from app.core.services.publisher import PublishService
+from app.core.services.visual_sync import VisualSyncService
+from app.core.services.history_window import HistoryWindow
+from app.core.services.work_scheduler import WorkScheduler
+from app.core.services.rate_limiter import RateLimiter
+from app.core.services.task_supervisor import TaskSupervisor
+from app.core.services.completion_cache import CompletionCache
+from app.core.gap_engine import GapEngine
+from app.core.tools.registry import ToolRegistry
+from app.core.tools.executor import ToolExecutor
+from app.core.tools.definitions import UpdateRequirementsTool, TriggerVisualizationTool, InspectArtifactTool, PatchArtifactTool
+from app.agents.checker import CheckerAgent
+from app.agents.mermaid import MermaidAgent
+from app.agents.analyst import AnalystAgent
+from app.agents.workbook import WorkbookAgent
+from app.agents.use_case import UseCaseAgent
+from app.agents.summarizer import HistorySummarizerAgent
+from app.infrastructure.knowledge.local_store import LocalPolicyStore
+from app.infrastructure.persistence.memory_blobs import MemoryBlobStore
+from app.infrastructure.persistence.sqlite_completions import SQLiteCompletionStore
+from app.infrastructure.persistence.jsonl_cassette import JsonlCassetteStore
+from app.infrastructure.messaging.in_process import InProcessEventBus
+from app.infrastructure.messaging.socket_broker import SocketEventBus
+from app.state_container import session_repository
+from app.utils.logger import setup_logger
+
+logger = setup_logger("ServiceContainer")
+
+class ServiceContainer:
+    """
+    Composition Root for process-lifetime singletons.
+    Everything here is stateless per session (or safely shared), so a WebSocket
+    connection only has to build its own Orchestrator shell around it.
+    LLM clients share pooled keep-alive HTTP transports across all sessions.
+    """
+
+    def __init__(self, repository: ISessionRepository):
+        self.repository = repository
+
+        # 1. Infrastructure (pooled transports, one per provider)
+        limits = httpx.Limits(
+            max_connections=AppConfig.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=AppConfig.HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=AppConfig.HTTP_KEEPALIVE_EXPIRY,
+        )
+        self._openai_http = openai.DefaultAsyncHttpxClient(limits=limits)
+        self._groq_http = groq.DefaultAsyncHttpxClient(limits=limits)
+
+        # Bounded concurrency per provider/model, shared by every session
+        self.work_scheduler = WorkScheduler(AppConfig.LLM_POOL_LIMITS, AppConfig.LLM_POOL_DEFAULT_LIMIT)
+        # Shared per provider/model: RPM / TPM pacing, Retry-After cooldown, AIMD on the pool limits
+        self.rate_limiter = RateLimiter(
+            self.work_scheduler, AppConfig.LLM_RATE_LIMITS, AppConfig.LLM_AIMD_INCREASE, AppConfig.LLM_AIMD_DECREASE
+        )
+        # Recorded provider exchanges (LLM_CASSETTE_MODE), replayed offline with injected latency
+        self.cassette = create_cassette()
+        self.openai_client: ILLMClient = ScheduledLLMClient(
+            self._rate_limited(
+                self._provider("openai", lambda: OpenAIClient(http_client=self._openai_http), AppConfig.LLM.SMART_MODEL),
+                "openai"
+            ),
+            self.work_scheduler, "openai"
+        )
+        self.groq_client: ILLMClient = ScheduledLLMClient(
+            self._rate_limited(
+                self._provider("groq", lambda: GroqClient(http_client=self._groq_http), AppConfig.LLM.GROQ_MODEL),
+                "groq"
+            ),
+            self.work_scheduler, "groq"
+        )
+
+        # Identical structured requests are answered from the cache (before taking a pool slot)
+        self.completion_cache: Optional[CompletionCache] = None
+        if AppConfig.COMPLETION_CACHE_ENABLED:
+            self.completion_cache = CompletionCache(
+                AppConfig.COMPLETION_CACHE_SIZE, AppConfig.COMPLETION_CACHE_TTL, create_completion_store()
+            )
+            self.openai_client = CachedLLMClient(self.openai_client, self.completion_cache, "openai")
+            self.groq_client = CachedLLMClient(self.groq_client, self.completion_cache, "groq")
+        # Every agent talks to the gateway: per-task-type routing, failover, hedging
+        self.llm_gateway: ILLMClient = LLMGateway(
+            {"openai": self.openai_client, "groq": self.groq_client},
+            AppConfig.LLM_ROUTES,
+            AppConfig.LLM_DEFAULT_ROUTE,
+        )
+        # Owns every session's background tasks (disconnect policy, shutdown drain)
+        self.task_supervisor = TaskSupervisor(
+            AppConfig.TASK_DISCONNECT_POLICY, AppConfig.TASK_DISCONNECT_DEFAULT, AppConfig.TASK_DETACH_TIMEOUT
+        )
+        self.policy_store = LocalPolicyStore()
+        self.blob_store = MemoryBlobStore(AppConfig.VISUAL_STORE_MAX_BYTES)
+        self.event_bus = create_event_bus()
+
+        # 2. Domain Services
+        self.state_manager = StateManager(repository)
+        self.gap_engine = GapEngine()
+        self.checker_agent = CheckerAgent(self.llm_gateway, self.policy_store)
+        self.requirements_service = RequirementsService(
+            self.state_manager,
+            self.gap_engine,
+            self.checker_agent
+        )
+        self.visual_sync = VisualSyncService(self.blob_store, self.state_manager)
+        self.publish_service = PublishService(self.visual_sync)
+        self.history_window = HistoryWindow(HistorySummarizerAgent(self.llm_gateway), self.state_manager)
+
+        # 3. Artifact Agents
+        self.mermaid_agent = MermaidAgent(self.llm_gateway)
+        self.analyst_agent = AnalystAgent(self.llm_gateway)
+        self.workbook_agent = WorkbookAgent(self.llm_gateway)
+        self.use_case_agent = UseCaseAgent(self.llm_gateway)
+
+        # 4. Tool Registry (schemas are computed once and cached)
+        self.tool_registry = ToolRegistry()
+        self.tool_registry.register(UpdateRequirementsTool())
+        self.tool_registry.register(TriggerVisualizationTool())
+        self.tool_registry.register(InspectArtifactTool())
+        self.tool_registry.register(PatchArtifactTool())
+        self.tool_executor = ToolExecutor(self.tool_registry)
+
+        logger.info("📦 Service container initialized")
+
+    def _provider(self, name: str, create: Callable[[], ILLMClient], default_model: str) -> ILLMClient:
+        """The real provider client, or its cassette stand-in (replay never builds the real one: no API key needed)."""
+        if self.cassette is None:
+            return create()
+        inner = None if self.cassette.mode == CassetteMode.REPLAY else create()
+        return CassetteLLMClient(inner, self.cassette, name, default_model)
+
+    def _rate_limited(self, client: ILLMClient, provider: str) -> ILLMClient:
+        return RateLimitedLLMClient(
+            client, self.rate_limiter, provider,
+            AppConfig.LLM_RATE_LIMIT_ATTEMPTS, AppConfig.LLM_OUTPUT_TOKEN_ESTIMATE
+        )
+
+    async def start(self):
+        """Opens long-lived connections (called on application startup)."""
+        await self.event_bus.start()
+
+    async def aclose(self):
+        """Releases pooled connections (called on application shutdown)."""
+        # 1. Let in-flight turns / generators finish (or clean up after cancellation)
+        #    while the event bus and LLM transports are still open
+        await self.task_supervisor.drain(AppConfig.SHUTDOWN_DRAIN_SECONDS)
+        await self.event_bus.close()
+        # Durability point: nothing dirty is left behind on shutdown
+        await self.state_manager.flush_all()
+        if self.completion_cache:
+            await self.completion_cache.close()
+        if self.cassette:
+            await self.cassette.close()
+        await self._openai_http.aclose()
+        await self._groq_http.aclose()
+        logger.info("📦 Service container closed")
+
+
+def create_event_bus() -> IEventBus:
+    """EVENT_BUS=socket lets several uvicorn workers share sessions through the local broker."""
+    if AppConfig.EVENT_BUS == "socket":
+        return SocketEventBus(AppConfig.EVENT_BUS_HOST, AppConfig.EVENT_BUS_PORT)
+    return InProcessEventBus()
+
+
+def create_completion_store() -> Optional[ICompletionStore]:
+    """COMPLETION_CACHE_DB=<path> adds a durable SQLite tier behind the in-memory LRU."""
+    if AppConfig.COMPLETION_CACHE_DB:
+        return SQLiteCompletionStore(AppConfig.COMPLETION_CACHE_DB)
+    return None
+
+
+def create_cassette() -> Optional[Cassette]:
+    """LLM_CASSETTE_MODE=record|replay|auto puts a cassette under every provider client (empty = off)."""
+    if not AppConfig.LLM_CASSETTE_MODE:
+        return None
+    cassette = Cassette(
+        JsonlCassetteStore(AppConfig.LLM_CASSETTE_PATH),
+        CassetteMode(AppConfig.LLM_CASSETTE_MODE),
+        AppConfig.LLM_CASSETTE_LATENCY,
+        AppConfig.LLM_CASSETTE_SEED,
+    )
+    logger.info(f"📼 LLM cassette in '{cassette.mode.value}' mode: {AppConfig.LLM_CASSETTE_PATH}")
+    return cassette
+
+
+_container: Optional[ServiceContainer] = None
+
+def get_service_container() -> ServiceContainer:
+    """Lazily builds the process-wide container on first use."""
+    global _container
+    if _container is None:
+        _container = ServiceContainer(session_repository)
+    return _container
+
+async def shutdown_service_container():
+    global _container
+    if _container is not None:
+        await _container.aclose()
+        _container = None
@@ -0,0 +1,146 @@
+# benchmarks/event_bus_bench.py
+"""
+Session event bus throughput across N worker processes.
+
+Starts a SocketBroker, then N workers (separate processes, like uvicorn workers).
+Sessions are partitioned: session s is "held" (subscribed) by worker s % N.
+Every worker publishes M events round-robin over all sessions, so most events
+cross a process boundary. Reports delivered events/s and end-to-end latency.
+The InProcessEventBus (single worker) is measured as the baseline.
+
+Usage (from backend/):
+    python -m benchmarks.event_bus_bench [--workers 1 2 4 8] [--events 5000] [--sessions 64] [--payload 512]
+"""
+import argparse
+import asyncio
+import multiprocessing as mp
+import statistics
+import time
+from typing import Dict, List
+
+from app.infrastructure.messaging.in_process import InProcessEventBus
+from app.infrastructure.messaging.socket_broker import SocketBroker, SocketEventBus
+
+# --- 1. Processes ---
+
+def _run_broker(port_queue: "mp.Queue"):
+    async def main():
+        broker = SocketBroker("127.0.0.1", 0)
+        await broker.start()
+        port_queue.put(broker.port)
+        await asyncio.Event().wait()
+    asyncio.run(main())
+
+def _expected_for(worker: int, workers: int, events: int, sessions: int) -> int:
+    total = 0
+    for publisher in range(workers):
+        for k in range(events):
+            if ((publisher + k) % sessions) % workers == worker:
+                total += 1
+    return total
+
+def _run_worker(worker: int, workers: int, port: int, events: int, sessions: int, payload_size: int,
+                barrier: "mp.Barrier", results: "mp.Queue"):
+    async def main():
+        bus = SocketEventBus("127.0.0.1", port)
+        await bus.start()
+
+        expected = _expected_for(worker, workers, events, sessions)
+        latencies: List[float] = []
+        done = asyncio.Event()
+
+        def on_event(event_type: str, payload: Dict):
+            latencies.append(time.time() - payload["sent"])
+            if len(latencies) >= expected:
+                done.set()
+
+        for session in range(worker, sessions, workers):
+            bus.subscribe(f"s{session}", on_event)
+        await asyncio.sleep(0.2)  # let SUB frames reach the broker
+
+        await asyncio.get_running_loop().run_in_executor(None, barrier.wait)
+        start = time.perf_counter()
+        blob = "x" * payload_size
+        for k in range(events):
+            session = (worker + k) % sessions
+            await bus.publish(f"s{session}", "ARTIFACT_UPDATE", {"sent": time.time(), "content": blob})
+
+        if expected:
+            await asyncio.wait_for(done.wait(), timeout=120)
+        elapsed = time.perf_counter() - start
+        await bus.close()
+        results.put((len(latencies), elapsed, latencies))
+
+    asyncio.run(main())
+
+# --- 2. Scenarios ---
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+def bench_in_process(events: int, sessions: int, payload_size: int):
+    async def main():
+        bus = InProcessEventBus()
+        latencies: List[float] = []
+        for session in range(sessions):
+            bus.subscribe(f"s{session}", lambda t, p: latencies.append(time.time() - p["sent"]))
+        blob = "x" * payload_size
+        start = time.perf_counter()
+        for k in range(events):
+            await bus.publish(f"s{k % sessions}", "ARTIFACT_UPDATE", {"sent": time.time(), "content": blob})
+        return len(latencies), time.perf_counter() - start, latencies
+    return asyncio.run(main())
+
+def bench_socket(port: int, workers: int, events: int, sessions: int, payload_size: int):
+    barrier = mp.Barrier(workers)
+    results: "mp.Queue" = mp.Queue()
+    procs = [
+        mp.Process(target=_run_worker, args=(w, workers, port, events, sessions, payload_size, barrier, results))
+        for w in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    collected = [results.get(timeout=180) for _ in procs]
+    for proc in procs:
+        proc.join()
+
+    delivered = sum(r[0] for r in collected)
+    elapsed = max(r[1] for r in collected)
+    latencies = [lat for r in collected for lat in r[2]]
+    return delivered, elapsed, latencies
+
+def _report(label: str, delivered: int, elapsed: float, latencies: List[float]):
+    rate = delivered / elapsed if elapsed else 0.0
+    print(
+        f"{label:<22} {delivered:>9,} {elapsed:>8.2f}s {rate:>12,.0f}/s "
+        f"{statistics.median(latencies) * 1000 if latencies else 0:>9.2f} {_percentile(latencies, 0.99) * 1000:>9.2f}"
+    )
+
+def run(worker_counts: List[int], events: int, sessions: int, payload_size: int):
+    print(f"{events} events per worker, {sessions} sessions, {payload_size} B payload\n")
+    print(f"{'bus':<22} {'delivered':>9} {'elapsed':>9} {'throughput':>14} {'p50 ms':>9} {'p99 ms':>9}")
+    print("-" * 77)
+
+    _report("in-process (1 worker)", *bench_in_process(events, sessions, payload_size))
+
+    port_queue: "mp.Queue" = mp.Queue()
+    broker = mp.Process(target=_run_broker, args=(port_queue,), daemon=True)
+    broker.start()
+    port = port_queue.get(timeout=10)
+    try:
+        for workers in worker_counts:
+            _report(f"socket ({workers} worker{'s' if workers > 1 else ''})", *bench_socket(port, workers, events, sessions, payload_size))
+    finally:
+        broker.terminate()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Session event bus benchmark")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--events", type=int, default=5000, help="events published per worker")
+    parser.add_argument("--sessions", type=int, default=64)
+    parser.add_argument("--payload", type=int, default=512, help="payload size in bytes")
+    args = parser.parse_args()
+    run(args.workers, args.events, args.sessions, args.payload)
@@ -0,0 +1,196 @@
+# benchmarks/wire_format_bench.py
+"""
+Bytes-on-wire and encode/decode CPU for the WebSocket framings in app/api/wire_format.py.
+
+Builds the messages of a typical session through the real DomainMapper
+(80 user stories, a workbook, use cases, a Mermaid diagram) plus an inbound
+ARTIFACT_VISUAL_SYNC carrying a ~200 KB SVG, and compares:
+
+    json            JSON text frames (current default)
+    json+deflate    JSON text frames with permessage-deflate
+    msgpack         MessagePack binary frames (SVG as raw bytes)
+    msgpack+deflate MessagePack binary frames with permessage-deflate
+
+permessage-deflate is simulated with a raw zlib stream (wbits=-15), which is what
+the extension puts on the wire with context takeover disabled (worst case).
+
+Usage (from backend/):
+    python -m benchmarks.wire_format_bench [--rounds 200]
+"""
+import argparse
+import json
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.core.services.mapper import DomainMapper
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# --- 1. Typical Session Fixture ---
+
+def _stories(n: int) -> Dict[str, Any]:
+    return {"stories": [
+        {
+            "id": f"US-{i:03d}",
+            "priority": ["High", "Medium", "Low"][i % 3],
+            "estimate": f"{(i % 8) + 1} SP",
+            "role": "Кредитный аналитик",
+            "action": f"просматривать заявку №{i} с историей клиента и скорингом",
+            "benefit": "принимать решение без переключения между системами",
+            "description": "Как аналитик, я хочу видеть все данные по заявке на одном экране. " * 2,
+            "goal": "Сократить время рассмотрения заявки",
+            "scope": ["Карточка заявки", "История клиента", "Скоринг"],
+            "out_of_scope": ["Мобильное приложение"],
+            "acceptance_criteria": [
+                f"Given заявка {i} When аналитик открывает карточку Then отображается скоринг",
+                "Given нет истории When открывается карточка Then показывается пустое состояние",
+                "Время загрузки карточки < 2 секунд",
+            ],
+        }
+        for i in range(n)
+    ]}
+
+def _workbook() -> Dict[str, Any]:
+    return {"categories": [
+        {
+            "id": f"cat-{c}",
+            "title": title,
+            "icon": "📌",
+            "items": [{"id": f"cat-{c}-{i}", "text": f"{title}: пункт {i} — уточнить у бизнеса"} for i in range(12)],
+        }
+        for c, title in enumerate(["Цели", "Стейкхолдеры", "Ограничения", "Риски", "Метрики", "Интеграции"])
+    ]}
+
+def _use_cases(n: int) -> Dict[str, Any]:
+    return {"useCases": [
+        {
+            "id": f"UC-{i:02d}",
+            "title": f"Рассмотрение заявки, сценарий {i}",
+            "primaryActor": "Кредитный аналитик",
+            "preconditions": ["Заявка создана", "Аналитик авторизован"],
+            "postconditions": ["Решение сохранено в CRM"],
+            "mainFlow": [
+                {"stepNumber": s + 1, "action": f"Шаг {s + 1}: система выполняет проверку", "alternativeFlow": None}
+                for s in range(8)
+            ],
+        }
+        for i in range(n)
+    ]}
+
+def _mermaid(nodes: int) -> Dict[str, Any]:
+    lines = ["flowchart TD"]
+    for i in range(nodes):
+        lines.append(f'    N{i}["Шаг {i}: проверка данных клиента"] --> N{i + 1}')
+    return {"code": "\n".join(lines)}
+
+def _svg(target_bytes: int) -> str:
+    parts = ['<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 2000 4000">']
+    i = 0
+    while sum(len(p) for p in parts) < target_bytes:
+        parts.append(
+            f'<g class="node" id="flowchart-N{i}" transform="translate(120,{i * 80})">'
+            f'<rect class="basic label-container" style="fill:#ECECFF;stroke:#9370DB" x="-90" y="-25" width="180" height="50"></rect>'
+            f'<text dominant-baseline="central" text-anchor="middle">Шаг {i}: проверка данных клиента</text></g>'
+        )
+        i += 1
+    parts.append("</svg>")
+    return "".join(parts)
+
+def build_session() -> List[Tuple[str, Dict[str, Any]]]:
+    """Returns (label, message) pairs as they would cross the socket."""
+    svg = _svg(200_000)
+    return [
+        ("ARTIFACT_OPEN stories (80)", DomainMapper.to_artifact_open("user_story", _stories(80), "user_story-v1")),
+        ("ARTIFACT_OPEN workbook", DomainMapper.to_artifact_open("workbook", _workbook(), "workbook-v1")),
+        ("ARTIFACT_OPEN use cases (20)", DomainMapper.to_artifact_open("use_case", _use_cases(20), "use_case-v1")),
+        ("ARTIFACT_OPEN mermaid", DomainMapper.to_artifact_open("mermaid_diagram", _mermaid(60), "mermaid_diagram-v1")),
+        ("ARTIFACT_VISUAL_SYNC svg", {
+            "type": "ARTIFACT_VISUAL_SYNC",
+            "payload": {"id": "mermaid_diagram-v1", "visualData": svg, "format": "svg"},
+        }),
+        ("CHAT_DELTA", DomainMapper.to_chat_delta("Понял, добавляю ")),
+    ]
+
+# --- 2. Framings ---
+
+def _deflate(data: bytes) -> bytes:
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+def _inflate(data: bytes) -> bytes:
+    return zlib.decompressobj(-15).decompress(data)
+
+def _json_encode(msg: Dict[str, Any]) -> bytes:
+    return json.dumps(msg).encode("utf-8")
+
+def _json_decode(frame: bytes) -> Dict[str, Any]:
+    return json.loads(frame)
+
+def _msgpack_encode(msg: Dict[str, Any]) -> bytes:
+    payload = msg.get("payload")
+    if msg.get("type") == "ARTIFACT_VISUAL_SYNC":
+        # Binary framing lets the client ship the SVG as raw bytes
+        payload = {**payload, "visualData": payload["visualData"].encode("utf-8")}
+    return msgpack.packb({"type": msg["type"], "payload": payload}, use_bin_type=True)
+
+def _msgpack_decode(frame: bytes) -> Dict[str, Any]:
+    return msgpack.unpackb(frame, raw=False)
+
+Codec = Tuple[Callable[[Dict[str, Any]], bytes], Callable[[bytes], Dict[str, Any]]]
+
+def framings() -> Dict[str, Codec]:
+    result: Dict[str, Codec] = {
+        "json": (_json_encode, _json_decode),
+        "json+deflate": (lambda m: _deflate(_json_encode(m)), lambda f: _json_decode(_inflate(f))),
+    }
+    if msgpack is not None:
+        result["msgpack"] = (_msgpack_encode, _msgpack_decode)
+        result["msgpack+deflate"] = (lambda m: _deflate(_msgpack_encode(m)), lambda f: _msgpack_decode(_inflate(f)))
+    return result
+
+# --- 3. Runner ---
+
+def _time_us(fn: Callable[[], Any], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+def run(rounds: int):
+    session = build_session()
+    codecs = framings()
+    if msgpack is None:
+        print("⚠️ 'msgpack' is not installed: MessagePack framings skipped.\n")
+
+    header = f"{'message':<30} {'framing':<16} {'bytes':>9} {'vs json':>8} {'enc µs':>9} {'dec µs':>9}"
+    print(header)
+    print("-" * len(header))
+
+    totals: Dict[str, List[float]] = {name: [0, 0.0, 0.0] for name in codecs}
+    for label, msg in session:
+        baseline = None
+        for name, (encode, decode) in codecs.items():
+            frame = encode(msg)
+            size = len(frame)
+            baseline = baseline or size
+            enc = _time_us(lambda: encode(msg), rounds)
+            dec = _time_us(lambda: decode(frame), rounds)
+            totals[name][0] += size
+            totals[name][1] += enc
+            totals[name][2] += dec
+            print(f"{label:<30} {name:<16} {size:>9,} {size / baseline:>7.0%} {enc:>9.1f} {dec:>9.1f}")
+        print()
+
+    print("Session total")
+    json_total = totals["json"][0]
+    for name, (size, enc, dec) in totals.items():
+        print(f"{'':<30} {name:<16} {int(size):>9,} {size / json_total:>7.0%} {enc:>9.1f} {dec:>9.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="WebSocket wire format benchmark")
+    parser.add_argument("--rounds", type=int, default=200, help="timing iterations per message")
+    run(parser.parse_args().rounds)
@@ -0,0 +1,97 @@
+# tests/test_turn_interruption.py
+"""
+A superseded chat turn leaves a consistent history: the user message is kept,
+partial text is persisted once, and every issued tool call has a result.
+Run: pytest tests/ (or python tests/test_turn_interruption.py)
+"""
+import asyncio
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("GROQ_API_KEY", "test")
+
+from app.core.llm.types import LLMResponse, LLMStreamChunk, ToolCallRequest
+from app.core.orchestrator import INTERRUPTED_NOTE, Orchestrator
+from app.infrastructure.persistence.memory import MemorySessionRepository
+from app.service_container import ServiceContainer
+
+SESSION = "test-session"
+PARTIAL = "Let me save that."
+
+
+class ToolCallingLLM:
+    """Streams a short text, then asks for one tool call."""
+
+    async def stream_chat_with_tools(self, messages, tools_schema):
+        yield LLMStreamChunk(content_delta=PARTIAL)
+        yield LLMStreamChunk(response=LLMResponse(
+            content=PARTIAL,
+            tool_calls=[ToolCallRequest(call_id="call-1", function_name="update_requirements", arguments="{}")]
+        ))
+
+
+class HangingToolExecutor:
+    """Never finishes, so the turn is still inside the tool call when superseded."""
+
+    def __init__(self):
+        self.started = asyncio.Event()
+
+    async def run(self, tool_calls, context):
+        self.started.set()
+        await asyncio.Event().wait()
+
+
+async def _orchestrator() -> Orchestrator:
+    async def emit(msg_type, payload):
+        pass
+
+    orchestrator = Orchestrator(SESSION, emit, ServiceContainer(MemorySessionRepository()))
+    orchestrator.llm = ToolCallingLLM()
+    orchestrator.tool_executor = HangingToolExecutor()
+    return orchestrator
+
+
+async def _history(orchestrator: Orchestrator):
+    state = await orchestrator.state_manager.get_or_create_session(SESSION)
+    return state.chat_history
+
+
+def test_cancelled_before_first_step_keeps_user_message():
+    async def scenario():
+        orchestrator = await _orchestrator()
+        ticket = orchestrator.supersede_turn()
+        turn = asyncio.create_task(orchestrator.handle_user_message("first", ticket))
+        while orchestrator._turn_task is None:
+            await asyncio.sleep(0)
+        # The newer message supersedes the turn before it took its first step
+        orchestrator.supersede_turn()
+        await turn
+        return await _history(orchestrator)
+
+    history = asyncio.run(scenario())
+    assert history[0] == {"role": "user", "content": "first"}
+    assert sum(1 for m in history if m["role"] == "user") == 1
+
+
+def test_cancelled_during_tool_call_persists_partial_text_once():
+    async def scenario():
+        orchestrator = await _orchestrator()
+        ticket = orchestrator.supersede_turn()
+        turn = asyncio.create_task(orchestrator.handle_user_message("save it", ticket))
+        await asyncio.wait_for(orchestrator.tool_executor.started.wait(), timeout=5)
+        orchestrator.supersede_turn()
+        await turn
+        return await _history(orchestrator)
+
+    history = asyncio.run(scenario())
+    assert [m["role"] for m in history] == ["user", "assistant", "tool", "assistant"]
+    assert history[1]["tool_calls"][0]["id"] == "call-1"
+    assert history[2]["tool_call_id"] == "call-1"
+    assert history[3]["content"] == INTERRUPTED_NOTE
+    assert sum(PARTIAL in (m.get("content") or "") for m in history) == 1
+
+
+if __name__ == "__main__":
+    test_cancelled_before_first_step_keeps_user_message()
+    test_cancelled_during_tool_call_persists_partial_text_once()
+    print("ok")
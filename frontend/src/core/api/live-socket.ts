@@ -7,6 +7,10 @@ export class LiveSocketService implements IChatSocket {
   private listeners: ((msg: WebSocketMessage) => void)[] = [];
   private reconnectTimer: ReturnType<typeof setTimeout> | null = null;
   private isExplicitDisconnect = false;
+  // Reconnect replay: position in the session event log (see SESSION_ESTABLISHED)
+  private sessionId: string | null = null;
+  private epoch: string | null = null;
+  private lastSeq: number | null = null;
 
   public static getInstance(): LiveSocketService {
     if (!LiveSocketService.instance) {
@@ -27,11 +31,17 @@ export class LiveSocketService implements IChatSocket {
         }
     }
 
+    if (this.url !== url) {
+      this.sessionId = null;
+      this.epoch = null;
+      this.lastSeq = null;
+    }
     this.url = url;
     this.isExplicitDisconnect = false;
     
-    console.log(`🔌 Connecting to ${url}...`);
-    this.ws = new WebSocket(url);
+    const socketUrl = this.withResume(url);
+    console.log(`🔌 Connecting to ${socketUrl}...`);
+    this.ws = new WebSocket(socketUrl);
 
     this.ws.onopen = () => {
       console.log("✅ WebSocket Connected");
@@ -49,6 +59,8 @@ export class LiveSocketService implements IChatSocket {
             console.debug("📥 [Socket-Debug] Raw CHAT_HISTORY payload:", data.payload);
         }
 
+        this.trackSequence(data);
+
         this.listeners.forEach(listener => listener(data));
       } catch (err) {
         console.error("❌ Failed to parse WebSocket message:", err);
@@ -68,6 +80,29 @@ export class LiveSocketService implements IChatSocket {
     };
   }
 
+  /** Adds the last seen event position so a reconnect only replays missed events. */
+  private withResume(url: string): string {
+    if (this.sessionId === null || this.epoch === null || this.lastSeq === null) return url;
+    const params = [`last_seq=${this.lastSeq}`, `epoch=${encodeURIComponent(this.epoch)}`];
+    // A socket opened without a session id must rejoin the session it was given
+    if (!url.includes("session_id=")) params.unshift(`session_id=${encodeURIComponent(this.sessionId)}`);
+    return `${url}${url.includes("?") ? "&" : "?"}${params.join("&")}`;
+  }
+
+  private trackSequence(data: any) {
+    if (data.type === 'SESSION_ESTABLISHED') {
+      this.sessionId = data.payload?.sessionId ?? null;
+      this.epoch = data.payload?.epoch ?? null;
+      this.lastSeq = data.payload?.seq ?? null;
+      if (data.payload?.resumed) {
+        console.log(`⏩ Resumed session at seq ${this.lastSeq}`);
+      }
+    }
+    if (typeof data.seq === "number") {
+      this.lastSeq = Math.max(this.lastSeq ?? 0, data.seq);
+    }
+  }
+
   disconnect() {
     this.isExplicitDisconnect = true;
     if (this.ws) {
@@ -76,8 +111,9 @@ export class LiveSocketService implements IChatSocket {
     }
   }
 
-  sendMessage(text: string) {
-    this.send("USER_MESSAGE", text);
+  sendMessage(text: string, id?: string) {
+    // 'id' lets this tab recognize the server's echo of its own message
+    this.send("USER_MESSAGE", { content: text, id });
   }
 
   send(type: string, payload: any) {
@@ -22,7 +22,21 @@ export type {
   UseCaseData,
   UseCase,
   DataEntity,
-  NonFunctionalRequirement
+  NonFunctionalRequirement,
+  MsgJsonPatch,
+  JsonPatchPayload,
+  JsonPatchOperation,
+  MsgPatchAck,
+  PatchAckPayload,
+  MsgArtifactVisualOffer,
+  ArtifactVisualOfferPayload,
+  MsgArtifactVisualChunk,
+  ArtifactVisualChunkPayload,
+  MsgArtifactVisualAck,
+  ArtifactVisualAckPayload,
+  VisualAckStatus,
+  MsgUserMessage,
+  UserMessagePayload
 } from "./schema";
 
 export type { WebSocketMessage } from "./schema";
@@ -30,6 +44,6 @@ export type { WebSocketMessage } from "./schema";
 export interface IChatSocket {
   connect: (url: string) => void;
   disconnect: () => void;
-  sendMessage: (text: string) => void;
+  sendMessage: (text: string, id?: string) => void;
   onMessage: (callback: (msg: Schema.WebSocketMessage) => void) => void;
 }
\ No newline at end of file
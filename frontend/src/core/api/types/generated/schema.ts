@@ -11,7 +11,13 @@ export type WebSocketMessage =
   | MsgArtifactSync
   | MsgChatHistory
   | MsgSessionEstablished
-  | MsgArtifactVisualSync;
+  | MsgArtifactVisualSync
+  | MsgArtifactVisualOffer
+  | MsgArtifactVisualChunk
+  | MsgArtifactVisualAck
+  | MsgJsonPatch
+  | MsgPatchAck
+  | MsgUserMessage;
 export type SystemStatus = "idle" | "thinking" | "working" | "success";
 export type ArtifactType =
   | "code"
@@ -35,7 +41,26 @@ export type Issues = ValidationIssue[];
 export type ArtifactSyncStatus = "saving" | "processing" | "synced" | "error";
 export type Message = string | null;
 export type Messages = ChatMessage[];
+export type Epoch = string | null;
+/**
+ * Last sequence number covered by this connection's restore
+ */
+export type Seq = number | null;
 export type Format = "svg" | "png";
+/**
+ * SHA-256 hex of visual_data (UTF-8). Verified when present.
+ */
+export type Digest = string | null;
+export type Format1 = "svg" | "png";
+export type Format2 = "svg" | "png";
+export type VisualAckStatus = "stored" | "upload_required" | "rejected";
+export type Chunksize = number | null;
+export type JsonPatchTarget = "artifact" | "state";
+export type Baseversion = number | null;
+export type From = string | null;
+export type Id = string | null;
+export type Ops = JsonPatchOperation[];
+export type PatchAckStatus = "applied" | "mismatch";
 export type Priority = "High" | "Medium" | "Low";
 export type Stories = UserStory[];
 export type Icon = string | null;
@@ -168,6 +193,15 @@ export interface MsgSessionEstablished {
 export interface SessionEstablishedPayload {
   sessionId: string;
   isNew: boolean;
+  epoch?: Epoch;
+  /**
+   * Last sequence number covered by this connection's restore
+   */
+  seq?: Seq;
+  /**
+   * True if missed events are replayed instead of a full restore
+   */
+  resumed?: boolean;
 }
 export interface MsgArtifactVisualSync {
   type: "ARTIFACT_VISUAL_SYNC";
@@ -183,6 +217,90 @@ export interface ArtifactVisualSyncPayload {
    */
   visualData: string;
   format?: Format;
+  digest?: Digest;
+}
+export interface MsgArtifactVisualOffer {
+  type: "ARTIFACT_VISUAL_OFFER";
+  payload: ArtifactVisualOfferPayload;
+}
+export interface ArtifactVisualOfferPayload {
+  /**
+   * The artifact ID (e.g. 'mermaid_diagram')
+   */
+  id: string;
+  /**
+   * SHA-256 hex of the visual data (UTF-8)
+   */
+  digest: string;
+  format?: Format1;
+  /**
+   * Byte length of the visual data
+   */
+  size?: number;
+}
+export interface MsgArtifactVisualChunk {
+  type: "ARTIFACT_VISUAL_CHUNK";
+  payload: ArtifactVisualChunkPayload;
+}
+export interface ArtifactVisualChunkPayload {
+  id: string;
+  digest: string;
+  /**
+   * 0-based chunk index
+   */
+  index: number;
+  /**
+   * Total number of chunks
+   */
+  total: number;
+  /**
+   * Slice of the visual data
+   */
+  data: string;
+  format?: Format2;
+}
+/**
+ * Server -> Client (sender only). Answers an offer or a completed upload.
+ */
+export interface MsgArtifactVisualAck {
+  type: "ARTIFACT_VISUAL_ACK";
+  payload: ArtifactVisualAckPayload;
+}
+export interface ArtifactVisualAckPayload {
+  id: string;
+  digest: string;
+  status: VisualAckStatus;
+  chunkSize?: Chunksize;
+}
+export interface MsgJsonPatch {
+  type: "JSON_PATCH";
+  payload: JsonPatchPayload;
+}
+export interface JsonPatchPayload {
+  target: JsonPatchTarget;
+  id: string;
+  baseVersion?: Baseversion;
+  version: number;
+  ops: Ops;
+}
+export interface JsonPatchOperation {
+  op: "add" | "remove" | "replace" | "move" | "copy" | "test";
+  path: string;
+  value?: unknown;
+  from?: From;
+}
+/**
+ * Client -> Server. Confirms a version, or reports a base mismatch (forces a full payload).
+ */
+export interface MsgPatchAck {
+  type: "PATCH_ACK";
+  payload: PatchAckPayload;
+}
+export interface PatchAckPayload {
+  target: JsonPatchTarget;
+  id: string;
+  version: number;
+  status?: PatchAckStatus;
 }
 export interface UserStoryData {
   stories: Stories;
@@ -229,3 +347,14 @@ export interface UseCaseStep {
   action: string;
   alternativeFlow?: Alternativeflow;
 }
+/**
+ * Client -> Server: a chat message. Server -> every tab of the session: its echo, before the turn starts.
+ */
+export interface MsgUserMessage {
+  type: "USER_MESSAGE";
+  payload: UserMessagePayload;
+}
+export interface UserMessagePayload {
+  content: string;
+  id?: Id;
+}
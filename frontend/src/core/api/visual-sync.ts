@@ -0,0 +1,91 @@
+import { socketService } from "@/core/api/live-socket";
+import { type ArtifactVisualAckPayload } from "@/core/api/types/generated";
+
+const DEFAULT_CHUNK_SIZE = 64 * 1024;
+// An offer lost to a reconnect is retried after this long
+const PENDING_TTL_MS = 30_000;
+
+interface PendingVisual {
+  id: string;
+  data: string;
+  sentAt: number;
+}
+
+/**
+ * Hash-first visual sync.
+ * Offers the SHA-256 digest of a rendered SVG and only uploads it (in chunks)
+ * when the server answers 'upload_required'. Re-renders of an unchanged diagram
+ * cost one small offer message (the server still links the digest to the latest version).
+ */
+class VisualSyncClient {
+  private pending = new Map<string, PendingVisual>(); // digest -> blob awaiting ack
+  private subscribed = false;
+
+  async sync(id: string, data: string) {
+    this.subscribe();
+
+    const digest = await sha256Hex(data);
+    const inFlight = this.pending.get(digest);
+    if (inFlight && Date.now() - inFlight.sentAt < PENDING_TTL_MS) return;
+
+    this.pending.set(digest, { id, data, sentAt: Date.now() });
+    socketService.send("ARTIFACT_VISUAL_OFFER", {
+      id,
+      digest,
+      format: "svg",
+      size: new TextEncoder().encode(data).length,
+    });
+  }
+
+  private subscribe() {
+    if (this.subscribed) return;
+    this.subscribed = true;
+
+    socketService.onMessage((msg) => {
+      if (msg.type === "ARTIFACT_VISUAL_ACK") this.handleAck(msg.payload);
+    });
+  }
+
+  private handleAck({ id, digest, status, chunkSize }: ArtifactVisualAckPayload) {
+    const visual = this.pending.get(digest);
+    if (!visual) return;
+
+    if (status === "upload_required") {
+      const chunks = splitChunks(visual.data, chunkSize || DEFAULT_CHUNK_SIZE);
+      chunks.forEach((data, index) => {
+        socketService.send("ARTIFACT_VISUAL_CHUNK", {
+          id, digest, index, total: chunks.length, data, format: "svg",
+        });
+      });
+      return;
+    }
+
+    this.pending.delete(digest);
+    if (status === "rejected") {
+      console.warn(`⚠️ Visual upload for ${id} was rejected (${digest.slice(0, 12)})`);
+    }
+  }
+}
+
+async function sha256Hex(data: string): Promise<string> {
+  const buffer = await crypto.subtle.digest("SHA-256", new TextEncoder().encode(data));
+  return Array.from(new Uint8Array(buffer))
+    .map((b) => b.toString(16).padStart(2, "0"))
+    .join("");
+}
+
+/** Splits without cutting a UTF-16 surrogate pair (the server re-joins chunks as UTF-8). */
+function splitChunks(data: string, size: number): string[] {
+  const chunks: string[] = [];
+  let start = 0;
+  while (start < data.length) {
+    let end = Math.min(start + size, data.length);
+    const code = data.charCodeAt(end - 1);
+    if (end < data.length && code >= 0xd800 && code <= 0xdbff) end -= 1;
+    chunks.push(data.slice(start, end));
+    start = end;
+  }
+  return chunks;
+}
+
+export const visualSync = new VisualSyncClient();
@@ -84,7 +84,11 @@ export const MermaidViewer = ({ artifactId, content, title }: MermaidViewerProps
         }
       });
 
-      const id = `mermaid-${Math.random().toString(36).substr(2, 9)}`;
+      // Stable id per artifact: the id is embedded in the SVG, so a random one
+      // would give every render a new content hash (see visual-sync.ts)
+      const id = artifactId
+        ? `mermaid-${artifactId.replace(/[^a-zA-Z0-9_-]/g, "")}`
+        : `mermaid-${Math.random().toString(36).substr(2, 9)}`;
       const { svg: svgContent } = await mermaid.render(id, content);
       setSvg(svgContent);
       setError(null);
@@ -1,18 +1,20 @@
 import { useCallback } from "react";
 import { useChatStore } from "@/features/chat/stores/chat-store";
 import { socketService } from "@/core/api/live-socket"; 
+import { visualSync } from "@/core/api/visual-sync";
 
 export const useChatSocket = () => {
   const { addMessage } = useChatStore();
 
   const sendMessage = useCallback((content: string, files: File[] = []) => {
+    const id = crypto.randomUUID();
     addMessage({
-      id: Date.now().toString(),
+      id,
       role: "user",
       content,
       timestamp: Date.now(),
     });
-    socketService.sendMessage(content);
+    socketService.sendMessage(content, id);
   }, [addMessage]);
 
   const saveArtifact = useCallback((id: string, content: string) => {
@@ -20,11 +22,8 @@ export const useChatSocket = () => {
   }, []);
 
   const saveArtifactVisual = useCallback((id: string, visualData: string) => {
-    socketService.send("ARTIFACT_VISUAL_SYNC", {
-      id: id,
-      visual_data: visualData,
-      format: 'svg'
-    });
+    // Hash-first: the SVG is only uploaded if the server does not hold it yet
+    visualSync.sync(id, visualData);
   }, []);
 
   const publishProject = useCallback(() => {
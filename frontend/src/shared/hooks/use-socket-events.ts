@@ -58,6 +58,22 @@ export const useSocketEvents = () => {
           setMessages(hydratedMessages);
           break;
 
+        case "USER_MESSAGE": {
+          // Echo of a message sent from any tab of this session (skip our own)
+          const { content, id } = event.payload ?? {};
+          const known = id && useChatStore.getState().messages.some((m) => m.id === id);
+          if (content && !known) {
+            addMessage({
+              id: id || Date.now().toString(),
+              role: 'user',
+              content,
+              timestamp: Date.now(),
+              status: 'complete',
+            });
+          }
+          break;
+        }
+
         case "CHAT_DELTA":
           const currentMessages = useChatStore.getState().messages;
           const lastMsg = currentMessages[currentMessages.length - 1];